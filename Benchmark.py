@@ -0,0 +1,316 @@
+import argparse, csv, json, os, queue, shutil, sys, time
+import multiprocessing as mp
+from prettytable import PrettyTable
+
+from VacancyGenerator import Vacancy_Generator, short_header
+from MemoryProfile import Memory_Profiler, memory_profiler
+from Tracing import tracer
+
+default_rows_counts = [10_000, 1_000_000, 10_000_000]
+synthetic_currency_weights = {"RUR": 16, "USD": 1, "EUR": 1, "KZT": 1, "UAH": 1}
+synthetic_years = list(range(2007, 2023))
+result_poll_timeout = 1.0
+
+
+def write_synthetic_csv(file_name: str, rows_count: int, seed: int = 0, is_shuffled: bool = False) -> None:
+    """Записать синтетический файл вакансий (6 столбцов, по возрастанию даты публикации или вперемешку).
+    Все поля заполнены и корректны, валюты есть в курсах всех вариантов отчета,
+    поэтому строки проходят фильтры всех вариантов.
+    Args:
+        file_name (str): путь до файла.
+        rows_count (int): кол-во вакансий.
+        seed (int): зерно генератора случайных чисел.
+        is_shuffled (bool): перемешать ли даты публикации.
+    """
+    Vacancy_Generator(seed, synthetic_years[0], synthetic_years[-1], short_header, synthetic_currency_weights,
+                      invalid_share=0.0, multiline_share=0.0, is_shuffled=is_shuffled).write_csv(file_name, rows_count)
+
+
+def write_currency_csv(file_name: str) -> None:
+    """Записать файл курсов (Year, Month, CharCode, InRuR) на все года синтетического файла.
+    Args:
+        file_name (str): путь до файла.
+    """
+    rates = {"RUR": 1.0, "USD": 60.66, "EUR": 59.90, "KZT": 0.13, "UAH": 1.64}
+    with open(file_name, "w", encoding="utf-8-sig", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["Year", "Month", "CharCode", "InRuR"])
+        for year in synthetic_years:
+            for month in range(1, 13):
+                writer.writerows([year, month, code, rate] for code, rate in rates.items()
+                                 if code in synthetic_currency_weights)
+
+
+def get_rusage() -> (float, float, float):
+    """Процессорное время текущего процесса и его завершенных дочерних процессов и пиковая память
+    основного процесса (воркеры, которые еще работают, в пик не входят). Без модуля resource
+    (например, в Windows) - только CPU-время основного процесса.
+    Returns:
+        (float, float, float): CPU-время процесса (с), CPU-время дочерних процессов (с),
+            пиковый RSS основного процесса (МБ).
+    """
+    try:
+        import resource
+    except ImportError:
+        return time.process_time(), 0.0, 0.0
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (self_usage.ru_utime + self_usage.ru_stime, children_usage.ru_utime + children_usage.ru_stime,
+            self_usage.ru_maxrss / 1024)
+
+
+class Stage_Meter:
+    """Замер этапов одного варианта отчета: время, CPU-время (вместе с дочерними процессами),
+    пиковый RSS основного процесса и скорость в строках в секунду.
+    Attributes:
+        rows_count (int): кол-во строк во входном файле.
+    """
+    def __init__(self, rows_count: int):
+        """Инициализация класса Stage_Meter.
+        Args:
+            rows_count (int): кол-во строк во входном файле.
+        """
+        self.rows_count = rows_count
+        self.stages = []
+
+    def measure(self, stage_name: str, function, *args):
+        """Выполнить этап и записать его замеры.
+        Args:
+            stage_name (str): название этапа.
+            function (callable): функция этапа.
+            *args: аргументы функции.
+        Returns:
+            Результат функции.
+        """
+        cpu_before, children_cpu_before, _ = get_rusage()
+        start_time = time.perf_counter()
+        result = function(*args)
+        wall = time.perf_counter() - start_time
+        cpu_after, children_cpu_after, peak_rss = get_rusage()
+        self.stages.append({"stage": stage_name, "wall": wall,
+                            "cpu": cpu_after - cpu_before + children_cpu_after - children_cpu_before,
+                            "main_peak_rss_mb": peak_rss,
+                            "rows_per_second": self.rows_count / wall if wall > 0 else 0.0})
+        return result
+
+
+def run_csv_divider(meter: Stage_Meter, file_name: str, prof: str) -> None:
+    """CSVDivider: разделение файла на csv-файлы по годам.
+    Args:
+        meter (Stage_Meter): замер этапов.
+        file_name (str): путь до файла с вакансиями.
+        prof (str): название профессии.
+    """
+    import CSVDivider
+    os.makedirs("csv", exist_ok=True)
+    meter.measure("divide", CSVDivider.DataSet_Divider, CSVDivider.InputCorrect(file_name), "csv")
+
+
+def run_csv_divider_stream(meter: Stage_Meter, file_name: str, prof: str) -> None:
+    """CSVDivider: потоковое разделение файла по годам (LRU открытых файлов, ограниченные буферы).
+    Args:
+        meter (Stage_Meter): замер этапов.
+        file_name (str): путь до файла с вакансиями.
+        prof (str): название профессии.
+    """
+    import CSVDivider
+    os.makedirs("csv", exist_ok=True)
+    meter.measure("divide", CSVDivider.Streaming_Divider, CSVDivider.InputCorrect(file_name), "csv")
+
+
+def run_report_engine(backend: str):
+    """Создать функцию запуска Report_Engine с заданным способом выполнения.
+    Args:
+        backend (str): способ выполнения.
+    Returns:
+        callable: функция запуска.
+    """
+    def run(meter: Stage_Meter, file_name: str, prof: str) -> None:
+        import ReportPDF_New_MProcess_2 as report
+        from ReportEngine import Report_Engine
+        timer = report.Timer("BENCH", 3)
+        values_reader = meter.measure("currencies", report.Currency_Values_Reader, ".", "currency_csv.csv")
+        csv_start = meter.measure("start", report.CSV_Start, report.InputCorrect(file_name, prof, timer),
+                                  values_reader, False)
+        meter.measure("scan", Report_Engine, csv_start, backend)
+    return run
+
+
+def run_cached_scan(module_name: str, class_name: str):
+    """Создать функцию запуска варианта с кэшем (Cached_Scan, Cube_Scan): первый проход строит
+    кэш в пустой папке, второй (повторный отчет) берет данные из него.
+    Args:
+        module_name (str): модуль варианта.
+        class_name (str): класс варианта.
+    Returns:
+        callable: функция запуска.
+    """
+    def run(meter: Stage_Meter, file_name: str, prof: str) -> None:
+        import importlib
+        import ReportPDF_New_MProcess_2 as report
+        scan_class = getattr(importlib.import_module(module_name), class_name)
+        shutil.rmtree("cache", ignore_errors=True)
+        timer = report.Timer("BENCH", 3)
+        values_reader = meter.measure("currencies", report.Currency_Values_Reader, ".", "currency_csv.csv")
+        csv_start = meter.measure("start", report.CSV_Start, report.InputCorrect(file_name, prof, timer),
+                                  values_reader, False)
+        meter.measure("build_cache", scan_class, csv_start, "cache")
+        meter.measure("from_cache", scan_class, csv_start, "cache")
+    return run
+
+
+pipelines = {
+    "csv_divider": run_csv_divider,
+    "csv_divider_stream": run_csv_divider_stream,
+    "engine_serial": run_report_engine("serial"),
+    "engine_thread": run_report_engine("thread"),
+    "engine_process": run_report_engine("process"),
+    "engine_mp_process": run_report_engine("mp_process"),
+    "engine_asyncio": run_report_engine("asyncio"),
+    "cached": run_cached_scan("ColumnCache", "Cached_Scan"),
+    "cube": run_cached_scan("StatsCube", "Cube_Scan"),
+}
+
+
+def run_pipeline(pipeline_name: str, work_dir: str, file_name: str, rows_count: int, prof: str,
+                 start_method: str, result_queue: mp.Queue, is_memory: bool = False) -> None:
+    """Запуск одного варианта отчета в отдельном процессе (чтобы пиковая память не смешивалась).
+    Вывод варианта отчета и его дочерних процессов подавляется, замеры отправляются в очередь.
+    Args:
+        pipeline_name (str): название варианта.
+        work_dir (str): рабочая папка (в ней лежат файл курсов и папка csv).
+        file_name (str): путь до файла с вакансиями.
+        rows_count (int): кол-во строк в файле.
+        prof (str): название профессии.
+        start_method (str): способ запуска процессов внутри варианта (как в обычном запуске).
+        result_queue (Queue): очередь для замеров.
+        is_memory (bool): учитывать ли память по этапам (MemoryProfile), в т.ч. в воркерах.
+    """
+    mp.set_start_method(start_method, force=True)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(work_dir)
+    shutil.rmtree("csv", ignore_errors=True)
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    meter = Stage_Meter(rows_count)
+    result = {"stages": meter.stages}
+    if is_memory:
+        memory_profiler.enable()
+    try:
+        pipelines[pipeline_name](meter, file_name, prof)
+    except BaseException as error:
+        result["error"] = repr(error)
+    if is_memory:
+        result["memory"] = Memory_Profiler.get_rows(tracer.collect())
+    result_queue.put(result)
+
+
+def get_pipeline_result(process: mp.Process, result_queue: mp.Queue) -> dict:
+    """Дождаться замеров варианта отчета. Пока замеров нет, проверяется, жив ли процесс:
+    если он завершился, не отправив замеры (упал, убит по памяти), ждать дальше нечего.
+    Args:
+        process (Process): процесс варианта отчета.
+        result_queue (Queue): очередь для замеров.
+    Returns:
+        dict: замеры (или ошибка с кодом завершения процесса).
+    """
+    is_last_try = False
+    while True:
+        try:
+            result = result_queue.get(timeout=result_poll_timeout)
+            break
+        except queue.Empty:
+            if is_last_try:
+                process.join()
+                return {"stages": [], "error": f"exit code {process.exitcode}"}
+            is_last_try = not process.is_alive()
+    process.join()
+    return result
+
+
+def get_total(stages: list, rows_count: int) -> dict:
+    """Итог по всем этапам варианта отчета.
+    Args:
+        stages (list): замеры этапов.
+        rows_count (int): кол-во строк.
+    Returns:
+        dict: суммарные время и CPU-время, наибольший пиковый RSS основного процесса, строк в секунду.
+    """
+    wall = sum(stage["wall"] for stage in stages)
+    return {"wall": wall, "cpu": sum(stage["cpu"] for stage in stages),
+            "main_peak_rss_mb": max([stage["main_peak_rss_mb"] for stage in stages], default=0.0),
+            "rows_per_second": rows_count / wall if wall > 0 else 0.0}
+
+
+def run_benchmark(rows_counts: list, pipeline_names: list, work_dir: str, prof: str = "Программист",
+                  seed: int = 0, is_memory: bool = False, is_shuffled: bool = False) -> dict:
+    """Прогнать все варианты отчета на синтетических файлах заданных размеров.
+    Args:
+        rows_counts (list): размеры файлов (кол-во строк).
+        pipeline_names (list): названия вариантов отчета.
+        work_dir (str): рабочая папка.
+        prof (str): название профессии.
+        seed (int): зерно генератора.
+        is_memory (bool): учитывать ли память по этапам.
+        is_shuffled (bool): перемешать ли даты публикации во входных файлах (несортированный вход).
+    Returns:
+        dict: сводка замеров.
+    """
+    work_dir = os.path.abspath(work_dir)
+    os.makedirs(work_dir, exist_ok=True)
+    write_currency_csv(os.path.join(work_dir, "currency_csv.csv"))
+    context = mp.get_context("spawn")
+    summary = {"seed": seed, "prof": prof, "is_shuffled": is_shuffled, "cpu_count": os.cpu_count(), "runs": []}
+    for rows_count in rows_counts:
+        file_name = os.path.join(work_dir, f"{'unsorted' if is_shuffled else 'vacancies'}_{rows_count}.csv")
+        if not os.path.exists(file_name):
+            write_synthetic_csv(file_name, rows_count, seed, is_shuffled)
+        for pipeline_name in pipeline_names:
+            result_queue = context.Queue()
+            process = context.Process(target=run_pipeline, args=(pipeline_name, work_dir, file_name, rows_count,
+                                                                 prof, mp.get_start_method(), result_queue,
+                                                                 is_memory))
+            process.start()
+            result = get_pipeline_result(process, result_queue)
+            result.update({"pipeline": pipeline_name, "rows": rows_count,
+                           "total": get_total(result["stages"], rows_count)})
+            summary["runs"].append(result)
+    return summary
+
+
+def get_comparison_table(summary: dict) -> PrettyTable:
+    """Таблица сравнения вариантов отчета по итоговым замерам.
+    Args:
+        summary (dict): сводка замеров.
+    Returns:
+        PrettyTable: таблица.
+    """
+    table = PrettyTable(["Строк", "Вариант", "Время, с", "CPU, с", "Пик RSS осн. процесса, МБ", "Строк/с", "Ошибка"],
+                        align="r")
+    for run in summary["runs"]:
+        total = run["total"]
+        table.add_row([run["rows"], run["pipeline"], f"{total['wall']:.3f}", f"{total['cpu']:.3f}",
+                       f"{total['main_peak_rss_mb']:.1f}", f"{total['rows_per_second']:.0f}", run.get("error", "")])
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Сравнение скорости вариантов отчета на синтетических данных")
+    parser.add_argument("--rows", type=int, nargs="+", default=default_rows_counts)
+    parser.add_argument("--pipelines", nargs="+", default=list(pipelines), choices=list(pipelines))
+    parser.add_argument("--work-dir", default="bench")
+    parser.add_argument("--prof", default="Программист")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shuffle", action="store_true", help="даты публикации вперемешку (несортированный вход)")
+    parser.add_argument("--json", default="bench_summary.json")
+    parser.add_argument("--memory", action="store_true", help="учет памяти по этапам (tracemalloc + RSS)")
+    arguments = parser.parse_args()
+
+    benchmark_summary = run_benchmark(arguments.rows, arguments.pipelines, arguments.work_dir,
+                                      arguments.prof, arguments.seed, arguments.memory, arguments.shuffle)
+    with open(arguments.json, "w", encoding="utf-8") as json_file:
+        json.dump(benchmark_summary, json_file, ensure_ascii=False, indent=2)
+    print(get_comparison_table(benchmark_summary))
+    for run in benchmark_summary["runs"]:
+        if "memory" in run:
+            print(f"{run['pipeline']}, {run['rows']} строк:")
+            print(Memory_Profiler.get_table(run["memory"]))
@@ -0,0 +1,42 @@
+import csv, os, tempfile
+from unittest import TestCase
+from Benchmark import *
+
+
+class BenchmarkUnitTests(TestCase):
+    def test_write_synthetic_csv_is_reproducible(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first, second = os.path.join(temp_dir, "a.csv"), os.path.join(temp_dir, "b.csv")
+            write_synthetic_csv(first, 100, 7)
+            write_synthetic_csv(second, 100, 7)
+            with open(first, encoding="utf-8-sig") as first_file, open(second, encoding="utf-8-sig") as second_file:
+                self.assertEqual(first_file.read(), second_file.read())
+
+    def test_write_synthetic_csv_is_sorted_by_year(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "a.csv")
+            write_synthetic_csv(file_name, 200)
+            with open(file_name, encoding="utf-8-sig", newline="") as csv_file:
+                lines = list(csv.reader(csv_file))
+        years = [line[5][:4] for line in lines[1:]]
+        self.assertEqual(len(years), 200)
+        self.assertEqual(years, sorted(years))
+
+    def test_stage_meter_records_stage(self):
+        meter = Stage_Meter(10)
+        self.assertEqual(meter.measure("sum", sum, [1, 2, 3]), 6)
+        self.assertEqual(meter.stages[0]["stage"], "sum")
+        self.assertGreater(meter.stages[0]["main_peak_rss_mb"], 0)
+
+    def test_get_total(self):
+        stages = [{"wall": 1.0, "cpu": 2.0, "main_peak_rss_mb": 10.0},
+                  {"wall": 3.0, "cpu": 1.0, "main_peak_rss_mb": 5.0}]
+        self.assertEqual(get_total(stages, 100),
+                         {"wall": 4.0, "cpu": 3.0, "main_peak_rss_mb": 10.0, "rows_per_second": 25.0})
+
+    def test_dead_pipeline_process_gives_error(self):
+        context = mp.get_context("spawn")
+        result_queue = context.Queue()
+        process = context.Process(target=os._exit, args=(5,))
+        process.start()
+        self.assertEqual(get_pipeline_result(process, result_queue), {"stages": [], "error": "exit code 5"})
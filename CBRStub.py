@@ -0,0 +1,124 @@
+import threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+stub_currencies = [("R01010", "036", "AUD", 1, "Австралийский доллар", 17.9),
+                   ("R01235", "840", "USD", 1, "Доллар США", 31.8),
+                   ("R01239", "978", "EUR", 1, "Евро", 33.9),
+                   ("R01335", "398", "KZT", 100, "Казахстанских тенге", 20.7),
+                   ("R01090", "974", "BYR", 1000, "Белорусских рублей", 15.0)]
+
+
+def get_stub_xml(day: int, month: int, year: int) -> bytes:
+    """Ответ XML_daily.asp на дату (в том же виде, что и у ЦБ: windows-1251, запятая в курсе).
+    Курсы выдуманные, но постоянные для каждого месяца.
+    Args:
+        day (int): день.
+        month (int): месяц.
+        year (int): год.
+    Returns:
+        bytes: тело ответа.
+    >>> b"<CharCode>USD</CharCode><Nominal>1</Nominal>" in get_stub_xml(1, 2, 2003)
+    True
+    """
+    valutes = []
+    for valute_id, num_code, char_code, nominal, name, value in stub_currencies:
+        value = f"{value * (1 + (year - 2003) * 0.05 + month * 0.001):.4f}".replace(".", ",")
+        valutes.append(f'<Valute ID="{valute_id}"><NumCode>{num_code}</NumCode><CharCode>{char_code}</CharCode>'
+                       f'<Nominal>{nominal}</Nominal><Name>{name}</Name><Value>{value}</Value></Valute>')
+    return (f'<?xml version="1.0" encoding="windows-1251"?><ValCurs Date="{day:02}.{month:02}.{year}" '
+            f'name="Foreign Currency Market">{"".join(valutes)}</ValCurs>').encode("windows-1251")
+
+
+class CBR_Stub_Handler(BaseHTTPRequestHandler):
+    """Обработчик запросов к заглушке: XML_daily.asp?date_req=дд/мм/гггг."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        """Ответить на запрос курсов (с задержкой и ошибками, если они заданы у сервера)."""
+        stub = self.server.stub
+        with stub.lock:
+            stub.requests_count += 1
+            failures = stub.url_to_failures.get(self.path, 0)
+            stub.url_to_failures[self.path] = failures + 1
+        time.sleep(stub.delay)
+        query = parse_qs(urlparse(self.path).query)
+        if failures < stub.failures:
+            self.send_answer(503, b"")
+        elif "date_req" not in query:
+            self.send_answer(404, b"")
+        else:
+            day, month, year = (int(value) for value in query["date_req"][0].split("/"))
+            self.send_answer(200, get_stub_xml(day, month, year))
+
+    def send_answer(self, code: int, body: bytes) -> None:
+        """Отправить ответ (соединение остается открытым для следующих запросов).
+        Args:
+            code (int): HTTP-код.
+            body (bytes): тело ответа.
+        """
+        self.send_response(code)
+        self.send_header("Content-Type", "application/xml; charset=windows-1251")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Без вывода каждого запроса в консоль."""
+
+
+class CBR_Stub:
+    """Локальная заглушка сервера ЦБ для тестов и замеров без сети. Запускается в фоновом потоке.
+    Attributes:
+        delay (float): задержка каждого ответа в секундах (имитация сети).
+        failures (int): сколько первых запросов по каждому адресу отвечают ошибкой 503.
+        requests_count (int): кол-во полученных запросов.
+    """
+    def __init__(self, delay: float = 0.0, failures: int = 0, port: int = 0):
+        """Инициализация класса CBR_Stub.
+        Args:
+            delay (float): задержка каждого ответа в секундах.
+            failures (int): сколько первых запросов по каждому адресу отвечают ошибкой 503.
+            port (int): порт (0 - любой свободный).
+        """
+        self.delay = delay
+        self.failures = failures
+        self.requests_count = 0
+        self.url_to_failures = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), CBR_Stub_Handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """Адрес XML_daily.asp заглушки."""
+        return f"http://127.0.0.1:{self.server.server_address[1]}/scripts/XML_daily.asp"
+
+    def start(self):
+        """Запустить сервер в фоновом потоке.
+        Returns:
+            CBR_Stub: эта же заглушка.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервер."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+if __name__ == '__main__':
+    stub = CBR_Stub(float(input("Задержка ответа в секундах: ") or 0), port=8000)
+    print(stub.url)
+    stub.server.serve_forever()
@@ -1,4 +1,8 @@
 import csv, os
+import concurrent.futures as pool
+from collections import OrderedDict, deque
+
+from CompressedFiles import open_text, check_compression, get_partition_name, compression_to_suffix, zstandard
 
 
 def do_exit(message):
@@ -28,7 +32,7 @@ class InputCorrect:
 
     def check_file(self):
         """Проверка на существование и заполненность файла."""
-        with open(self.in_file_name, "r", encoding='utf-8-sig', newline='') as csv_file:
+        with open_text(self.in_file_name) as csv_file:
             file_iter = iter(csv.reader(csv_file))
             if next(file_iter, "none") == "none": do_exit("Пустой файл")
             if next(file_iter, "none") == "none": do_exit("Нет данных")
@@ -55,7 +59,7 @@ class DataSet_Divider:
 
     def csv_reader(self):
         """Чтение файла и первичная фильтрация (пропуск невалидных строк)."""
-        with open(self.input_values.in_file_name, "r", encoding='utf-8-sig', newline='') as csv_file:
+        with open_text(self.input_values.in_file_name) as csv_file:
             file = csv.reader(csv_file)
             self.start_line = next(file)
             self.other_lines = [line for line in file
@@ -101,17 +105,203 @@ class DataSet_Divider:
         self.save_file(current_year, data_years[current_index])
 
 
+class Partition_Writer:
+    """Запись строк в файлы лет (сжатые или нет). Открытыми держатся только несколько последних
+    файлов (LRU), остальные закрываются и при следующей записи открываются на дозапись.
+    Один объект используется только одним потоком.
+
+    Attributes:
+        csv_dir (str): Папка расположения CSV-файлов.
+        max_open_files (int): Сколько файлов лет держать открытыми.
+        compression (str): Сжатие файлов ("", gzip или zstd).
+    """
+    def __init__(self, csv_dir: str, max_open_files: int, compression: str = ""):
+        """Инициализация класса Partition_Writer.
+
+        Args:
+            csv_dir (str): Папка расположения CSV-файлов.
+            max_open_files (int): Сколько файлов лет держать открытыми.
+            compression (str): Сжатие файлов ("", gzip или zstd).
+        """
+        self.dir = csv_dir
+        self.max_open_files = max_open_files
+        self.compression = compression
+        self.open_files = OrderedDict()
+        self.written_years = set()
+
+    def get_writer(self, year: str):
+        """Писатель csv-файла года: уже открытый (становится самым свежим) или открытый заново.
+        Если открытых файлов больше max_open_files, закрывается самый давно использованный.
+
+        Args:
+            year (str): Год.
+
+        Returns:
+            csv.writer: Писатель файла года.
+        """
+        if year in self.open_files:
+            self.open_files.move_to_end(year)
+            return self.open_files[year][1]
+        mode = "a" if year in self.written_years else "w"
+        csv_file = open_text(f"{self.dir}/{get_partition_name(year, self.compression)}", mode, self.compression)
+        self.written_years.add(year)
+        self.open_files[year] = (csv_file, csv.writer(csv_file))
+        if len(self.open_files) > self.max_open_files:
+            self.open_files.popitem(last=False)[1][0].close()
+        return self.open_files[year][1]
+
+    def write(self, year: str, lines: list):
+        """Дописать строки в файл года.
+
+        Args:
+            year (str): Год.
+            lines (list): Строки этого года.
+        """
+        self.get_writer(year).writerows(lines)
+
+    def close(self):
+        """Закрыть все открытые файлы."""
+        for open_file, _ in self.open_files.values():
+            open_file.close()
+        self.open_files.clear()
+
+
+class Streaming_Divider(DataSet_Divider):
+    """Разделение файла по годам за один проход с ограниченной памятью. Порядок строк во входном
+    файле может быть любым: строки копятся в буфере своего года и дописываются в файл года, когда
+    буфер года заполнен или когда всего в буферах слишком много строк (тогда сбрасываются самые
+    большие буферы). Если заданы потоки записи, буферы пишутся (и сжимаются) в фоне, пока
+    основной поток разбирает файл дальше: каждый год закреплен за одним потоком, поэтому порядок
+    строк внутри года сохраняется.
+
+    Attributes:
+        input_data (InputCorrect): Неразделенный файл.
+        csv_dir (str): Папка расположения CSV-файлов.
+        max_open_files (int): Сколько файлов лет держать открытыми.
+        max_year_rows (int): Сколько строк одного года копить перед записью.
+        max_buffered_rows (int): Сколько строк всего держать в памяти (в буферах и в очереди на запись).
+        compression (str): Сжатие файлов лет ("", gzip или zstd).
+        writer_threads (int): Кол-во фоновых потоков записи (0 - запись в основном потоке).
+    """
+    def __init__(self, input_data: InputCorrect, csv_dir: str, max_open_files: int = 8,
+                 max_year_rows: int = 10000, max_buffered_rows: int = 100000, compression: str = "",
+                 writer_threads: int = 0):
+        """Инициализация класса Streaming_Divider. Разделение на разные файлы.
+
+        Args:
+            input_data (InputCorrect): Неразделенный файл.
+            csv_dir (str): Папка расположения CSV-файлов.
+            max_open_files (int): Сколько файлов лет держать открытыми.
+            max_year_rows (int): Сколько строк одного года копить перед записью.
+            max_buffered_rows (int): Сколько строк всего держать в памяти.
+            compression (str): Сжатие файлов лет ("", gzip или zstd).
+            writer_threads (int): Кол-во фоновых потоков записи (0 - запись в основном потоке).
+        """
+        check_compression(compression)
+        self.input_values = input_data
+        self.dir = csv_dir
+        self.max_year_rows = max_year_rows
+        self.max_buffered_rows = max_buffered_rows
+        self.year_to_lines = {}
+        self.buffered_rows = 0
+        writers_count = max(1, writer_threads)
+        self.writers = [Partition_Writer(csv_dir, max(1, max_open_files // writers_count), compression)
+                        for _ in range(writers_count)]
+        self.executors = [pool.ThreadPoolExecutor(max_workers=1) for _ in range(writer_threads)]
+        self.year_to_writer = {}
+        self.pending = deque()
+        self.pending_rows = 0
+        self.csv_divide()
+
+    def wait_oldest(self):
+        """Дождаться самой старой фоновой записи (и получить ее ошибку, если она была)."""
+        future, rows = self.pending.popleft()
+        future.result()
+        self.pending_rows -= rows
+
+    def flush_year(self, year: str):
+        """Записать буфер года в его файл (сразу или через поток записи этого года).
+
+        Args:
+            year (str): Год.
+        """
+        lines = self.year_to_lines.pop(year)
+        self.buffered_rows -= len(lines)
+        index = self.year_to_writer.setdefault(year, len(self.year_to_writer) % len(self.writers))
+        if not self.executors:
+            self.writers[index].write(year, lines)
+            return
+        self.pending.append((self.executors[index].submit(self.writers[index].write, year, lines), len(lines)))
+        self.pending_rows += len(lines)
+        while self.pending and self.buffered_rows + self.pending_rows > self.max_buffered_rows:
+            self.wait_oldest()
+
+    def flush_largest(self):
+        """Сбросить самые большие буферы, пока в буферах не останется не больше половины лимита."""
+        for year in sorted(self.year_to_lines, key=lambda key: len(self.year_to_lines[key]), reverse=True):
+            if self.buffered_rows <= self.max_buffered_rows // 2:
+                break
+            self.flush_year(year)
+
+    def add_line(self, line: list):
+        """Положить строку в буфер ее года и сбросить буферы, если они переполнены.
+
+        Args:
+            line (list): Валидная строка.
+        """
+        year = DataSet_Divider.get_year_method_3(line[self.year_index])
+        lines = self.year_to_lines.setdefault(year, [])
+        lines.append(line)
+        self.buffered_rows += 1
+        if len(lines) >= self.max_year_rows:
+            self.flush_year(year)
+        elif self.buffered_rows + self.pending_rows > self.max_buffered_rows:
+            self.flush_largest()
+
+    def close(self):
+        """Дождаться фоновых записей, остановить потоки и закрыть файлы."""
+        try:
+            while self.pending:
+                self.wait_oldest()
+        finally:
+            for executor in self.executors:
+                executor.shutdown()
+            for writer in self.writers:
+                writer.close()
+
+    def csv_divide(self):
+        """Разделяет данные на csv-файлы по годам за один проход по файлу"""
+        with open_text(self.input_values.in_file_name) as csv_file:
+            file = csv.reader(csv_file)
+            self.start_line = next(file)
+            self.year_index = self.start_line.index("published_at")
+            line_len = len(self.start_line)
+            try:
+                for line in file:
+                    if not ("" in line) and len(line) == line_len:
+                        self.add_line(line)
+                for year in list(self.year_to_lines):
+                    self.flush_year(year)
+            finally:
+                self.close()
+
+
 def divide_csv_file(csv_dir: str):
     """Проверяет наличие CSV-файла и разделяет его по годам на много файлов
     Args:
         csv_dir (str): папка расположения всех csv-файлов.
     """
     input_data = InputCorrect(input("Введите название файла: "))
+    compression = input("Введите сжатие файлов лет (gzip, zstd или пусто): ")
+    if compression not in compression_to_suffix:
+        do_exit("Неизвестное сжатие. Доступны: " + ", ".join(name or "пусто" for name in compression_to_suffix))
+    if compression == "zstd" and zstandard is None:
+        do_exit("Для сжатия zstd нужен пакет zstandard")
     if os.path.exists(csv_dir):
         import shutil
         shutil.rmtree(csv_dir)
     os.mkdir(csv_dir)
-    data_set = DataSet_Divider(input_data, csv_dir)
+    data_set = Streaming_Divider(input_data, csv_dir, compression=compression, writer_threads=min(4, os.cpu_count() or 1))
     return data_set
 
 
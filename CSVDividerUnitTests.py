@@ -0,0 +1,106 @@
+import contextlib, csv, io, os, random, tempfile
+from unittest.mock import patch
+from unittest import TestCase
+from CSVDivider import *
+from CompressedFiles import open_text
+from VacancyGenerator import Vacancy_Generator, short_header
+
+
+def write_vacancies(file_name: str, years: list) -> None:
+    with open(file_name, "w", encoding="utf-8-sig", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"])
+        for i, year in enumerate(years):
+            writer.writerow([f"Программист {i}", "" if i % 9 == 0 else "10000.0", "20000.0", "RUR",
+                             "Москва\nЦентр" if i % 5 == 0 else "Пермь", f"{year}-05-01T10:00:00+0300"])
+
+
+def read_partitions(csv_dir: str) -> dict:
+    partitions = {}
+    for file_name in sorted(os.listdir(csv_dir)):
+        with open_text(os.path.join(csv_dir, file_name)) as csv_file:
+            partitions[file_name.replace(".gz", "")] = list(csv.reader(csv_file))
+    return partitions
+
+
+class CSVDividerUnitTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temp_dir.name, "vacancies.csv")
+        self.csv_dir = os.path.join(self.temp_dir.name, "csv")
+        os.mkdir(self.csv_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_streaming_matches_divider_on_sorted_input(self):
+        write_vacancies(self.file_name, sorted(2005 + i % 4 for i in range(200)))
+        DataSet_Divider(InputCorrect(self.file_name), self.csv_dir)
+        expected = read_partitions(self.csv_dir)
+        for file_name in os.listdir(self.csv_dir):
+            os.remove(os.path.join(self.csv_dir, file_name))
+        Streaming_Divider(InputCorrect(self.file_name), self.csv_dir, 2, 7, 15)
+        self.assertEqual(read_partitions(self.csv_dir), expected)
+
+    def test_unsorted_input_keeps_row_order_inside_year(self):
+        years = [random.Random(i).choice(range(2003, 2013)) for i in range(500)]
+        write_vacancies(self.file_name, years)
+        divider = Streaming_Divider(InputCorrect(self.file_name), self.csv_dir, 3, 20, 50)
+        partitions = read_partitions(self.csv_dir)
+        self.assertEqual(sorted(partitions), [f"file_{year}.csv" for year in sorted(set(years))])
+        for file_name, lines in partitions.items():
+            expected = [f"Программист {i}" for i, year in enumerate(years)
+                        if f"file_{year}.csv" == file_name and i % 9 != 0]
+            self.assertEqual([line[0] for line in lines], expected)
+        self.assertEqual((divider.buffered_rows, divider.pending_rows), (0, 0))
+        self.assertEqual([len(writer.open_files) for writer in divider.writers], [0])
+
+    def test_shuffled_synthetic_file_is_divided_by_year(self):
+        generator = Vacancy_Generator(1, 2003, 2012, short_header, invalid_share=0.0, is_shuffled=True)
+        generator.write_csv(self.file_name, 2000)
+        rows = list(generator.rows(2000))
+        self.assertNotEqual([row[-1] for row in rows], sorted(row[-1] for row in rows))
+        Streaming_Divider(InputCorrect(self.file_name), self.csv_dir, 3, 50, 200)
+        partitions = read_partitions(self.csv_dir)
+        self.assertEqual(sorted(partitions), [f"file_{year}.csv" for year in range(2003, 2013)])
+        for file_name, lines in partitions.items():
+            self.assertEqual(lines, [row for row in rows if f"file_{row[-1][:4]}.csv" == file_name])
+
+    def test_buffers_and_open_files_are_bounded(self):
+        write_vacancies(self.file_name, [2003 + i % 10 for i in range(300)])
+        max_buffered = [0]
+        max_open = [0]
+
+        class Checked_Divider(Streaming_Divider):
+            def add_line(self, line: list):
+                super().add_line(line)
+                max_buffered[0] = max(max_buffered[0], self.buffered_rows)
+                max_open[0] = max(max_open[0], len(self.writers[0].open_files))
+
+        Checked_Divider(InputCorrect(self.file_name), self.csv_dir, 4, 100, 30)
+        self.assertLessEqual(max_buffered[0], 30)
+        self.assertLessEqual(max_open[0], 4)
+        self.assertEqual(sum(map(len, read_partitions(self.csv_dir).values())), 300 - 34)
+
+    def test_background_writers_with_gzip_output(self):
+        years = [random.Random(i).choice(range(2003, 2013)) for i in range(500)]
+        write_vacancies(self.file_name, years)
+        Streaming_Divider(InputCorrect(self.file_name), self.csv_dir, 3, 20, 50)
+        expected = read_partitions(self.csv_dir)
+        gzip_dir = os.path.join(self.temp_dir.name, "gzip")
+        os.mkdir(gzip_dir)
+        divider = Streaming_Divider(InputCorrect(self.file_name), gzip_dir, 4, 20, 50, "gzip", 2)
+        self.assertTrue(all(file_name.endswith(".csv.gz") for file_name in os.listdir(gzip_dir)))
+        self.assertEqual(read_partitions(gzip_dir), expected)
+        self.assertEqual((len(divider.writers), divider.pending_rows), (2, 0))
+
+    def test_unknown_compression_exits_with_message(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "vacancies.csv")
+            write_vacancies(file_name, [2003, 2004])
+            output = io.StringIO()
+            with patch("builtins.input", side_effect=[file_name, "lz4"]), contextlib.redirect_stdout(output), \
+                    self.assertRaises(SystemExit):
+                divide_csv_file(os.path.join(temp_dir, "csv"))
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, "csv")))
+        self.assertIn("Доступны: пусто, gzip, zstd", output.getvalue())
@@ -0,0 +1,254 @@
+import csv, io, os
+import concurrent.futures as pool
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Fused_Scan, Currency_Histogram, Year_Stats, Area_Stats
+from RateTable import Rate_Table
+from Tracing import tracer
+from MemoryProfile import memory_profiler
+from CompressedFiles import get_compression, read_block_index, read_text_range
+
+read_block_size = 1 << 20
+worker_rate_table = None
+
+
+def count_quotes(file_name: str, start: int, end: int) -> int:
+    """Посчитать кавычки в байтовом диапазоне файла.
+    Args:
+        file_name (str): путь до файла.
+        start (int): начало диапазона.
+        end (int): конец диапазона (не включается).
+    Returns:
+        int: кол-во символов '"' в диапазоне.
+    """
+    count = 0
+    with open(file_name, "rb") as file:
+        file.seek(start)
+        left = end - start
+        while left > 0:
+            block = file.read(min(read_block_size, left))
+            if not block:
+                break
+            count += block.count(b'"')
+            left -= len(block)
+    return count
+
+
+def find_record_start(file_name: str, offset: int, is_in_quotes: bool) -> int:
+    """Найти начало первой записи после offset: позицию сразу за первым переводом строки,
+    который стоит вне кавычек. Многострочные поля в кавычках (key_skills, description) пропускаются.
+    Args:
+        file_name (str): путь до файла.
+        offset (int): позиция, с которой начинается поиск.
+        is_in_quotes (bool): находится ли offset внутри поля в кавычках (нечетное число кавычек до него).
+    Returns:
+        int: позиция начала записи или размер файла, если записей дальше нет.
+    """
+    with open(file_name, "rb") as file:
+        file.seek(offset)
+        position = offset
+        block = file.read(read_block_size)
+        index = 0
+        while block:
+            if is_in_quotes:
+                index = block.find(b'"', index)
+                if index == -1:
+                    position, block, index = position + len(block), file.read(read_block_size), 0
+                    continue
+                is_in_quotes = False
+                index += 1
+            else:
+                quote_index = block.find(b'"', index)
+                newline_index = block.find(b'\n', index)
+                if newline_index != -1 and (quote_index == -1 or newline_index < quote_index):
+                    return position + newline_index + 1
+                if quote_index == -1:
+                    position, block, index = position + len(block), file.read(read_block_size), 0
+                    continue
+                is_in_quotes = True
+                index = quote_index + 1
+        return position
+
+
+def init_worker(rate_table: Rate_Table, trace_queue=None) -> None:
+    """Инициализация процесса-воркера: таблица курсов передается один раз на процесс, а не на каждую задачу.
+    Таблица опубликована в shared memory, поэтому воркер подключается к ней без копирования матрицы.
+    Args:
+        rate_table (Rate_Table): таблица курсов валют.
+        trace_queue (Queue): очередь трассировки основного процесса (None - без трассировки).
+    """
+    global worker_rate_table
+    worker_rate_table = rate_table
+    tracer.attach(trace_queue)
+
+
+def scan_range(file_name: str, start: int, end: int, index_of: dict, line_len: int, prof: str) \
+        -> (Currency_Histogram, Year_Stats, Area_Stats):
+    """Разобрать диапазон файла, начинающийся и заканчивающийся на границах записей.
+    Для сжатого файла диапазон - целые блоки из блочного индекса или весь файл (тогда первая
+    запись - заголовок и пропускается).
+    Args:
+        file_name (str): путь до файла.
+        start (int): начало диапазона.
+        end (int): конец диапазона (не включается).
+        index_of (dict): поле к индексу в строке.
+        line_len (int): длина правильной строки.
+        prof (str): название профессии.
+    Returns:
+        (Currency_Histogram, Year_Stats, Area_Stats): частичные агрегаты, которые можно слить с другими.
+    """
+    aggregators = (Currency_Histogram(), Year_Stats(), Area_Stats())
+    with tracer.span("scan_range", "worker", start=start, end=end) as span_args:
+        text = read_text_range(file_name, start, end)
+        memory_profiler.checkpoint("read")
+        reader = csv.reader(io.StringIO(text, newline=""))
+        if start == 0:
+            next(reader, None)
+        Fused_Scan.add_lines(reader, index_of, line_len, prof, worker_rate_table, *aggregators)
+        span_args["rows"] = reader.line_num
+    memory_profiler.checkpoint("aggregate")
+    tracer.flush()
+    return aggregators
+
+
+class Chunked_Scan(Fused_Scan):
+    """Параллельный вариант Fused_Scan: файл делится на байтовые диапазоны, каждый диапазон
+    выравнивается на границу записи и разбирается в отдельном процессе.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        max_workers (int): кол-во процессов (по умолчанию - кол-во ядер).
+        chunk_size (int): желаемый размер диапазона в байтах.
+        mp_context (BaseContext): способ запуска процессов (по умолчанию - системный).
+    """
+    def __init__(self, csv_start: CSV_Start, max_workers: int = None, chunk_size: int = 64 << 20,
+                 mp_context=None):
+        """Инициализация класса Chunked_Scan. Параллельный проход по файлу и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+            max_workers (int): кол-во процессов (по умолчанию - кол-во ядер).
+            chunk_size (int): желаемый размер диапазона в байтах.
+            mp_context (BaseContext): способ запуска процессов (по умолчанию - системный).
+        """
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+        super().__init__(csv_start)
+
+    def get_raw_offsets(self, header_end: int, file_size: int) -> list:
+        """Разбить файл на равные байтовые диапазоны (еще не выровненные по записям).
+        Args:
+            header_end (int): позиция конца первой строки.
+            file_size (int): размер файла.
+        Returns:
+            list: начала диапазонов + размер файла в конце.
+        """
+        data_size = file_size - header_end
+        chunks_count = max(self.max_workers, -(-data_size // self.chunk_size), 1)
+        step = max(data_size // chunks_count, 1)
+        offsets = list(range(header_end, file_size, step))
+        return offsets + [file_size]
+
+    @staticmethod
+    def can_split(file_name: str) -> bool:
+        """Можно ли разбить файл на диапазоны. Сжатый файл без блочного индекса можно только
+        распаковать целиком, поэтому его читают потоком (Fused_Scan.scan_file), а не одним диапазоном в памяти.
+        Args:
+            file_name (str): путь до файла.
+        Returns:
+            bool: True - несжатый файл или сжатый с действующим блочным индексом.
+        """
+        if not get_compression(file_name):
+            return True
+        block_offsets = read_block_index(file_name)
+        return block_offsets is not None and len(block_offsets) >= 2
+
+    def get_block_offsets(self, file_name: str) -> list:
+        """Границы диапазонов сжатого файла: группы целых блоков из блочного индекса примерно
+        по chunk_size сжатых байт (но не меньше max_workers диапазонов). Индекс должен быть (см. can_split).
+        Args:
+            file_name (str): путь до сжатого файла.
+        Returns:
+            list: границы диапазонов (последняя - размер файла).
+        """
+        file_size = os.path.getsize(file_name)
+        block_offsets = read_block_index(file_name)
+        raw_offsets = self.get_raw_offsets(block_offsets[1], file_size)
+        offsets = [block_offsets[1]]
+        for block_offset in block_offsets[2:]:
+            if block_offset >= raw_offsets[len(offsets)]:
+                offsets.append(block_offset)
+                if len(offsets) == len(raw_offsets) - 1:
+                    break
+        return offsets + [file_size]
+
+    def get_record_offsets(self, executor: pool.Executor) -> list:
+        """Выровнять границы диапазонов по записям. Четность кавычек до каждой границы считается
+        параллельно, поэтому поиск границы точный даже внутри многострочных полей.
+        Args:
+            executor (Executor): пул процессов.
+        Returns:
+            list: границы диапазонов, каждая - начало записи (последняя - размер файла).
+        """
+        file_name = self.csv_start.input_values.file_name
+        if get_compression(file_name):
+            return self.get_block_offsets(file_name)
+        file_size = os.path.getsize(file_name)
+        header_end = find_record_start(file_name, 0, False)
+        raw_offsets = self.get_raw_offsets(header_end, file_size)
+        bounds = [0] + raw_offsets
+        quotes = list(executor.map(count_quotes, [file_name] * (len(bounds) - 1), bounds[:-1], bounds[1:]))
+        record_offsets = [header_end]
+        quotes_before = quotes[0]
+        for i in range(1, len(raw_offsets) - 1):
+            quotes_before += quotes[i]
+            record_start = find_record_start(file_name, raw_offsets[i], quotes_before % 2 == 1)
+            if record_start > record_offsets[-1]:
+                record_offsets.append(record_start)
+        return record_offsets + [file_size] if record_offsets[-1] < file_size else record_offsets
+
+    def scan_file(self) -> None:
+        """Первая фаза: параллельный разбор диапазонов и слияние частичных агрегатов
+        (сжатый файл без блочного индекса читается потоком)."""
+        file_name = self.csv_start.input_values.file_name
+        if not Chunked_Scan.can_split(file_name):
+            Fused_Scan.scan_file(self)
+            return
+        rate_table = self.csv_start.values_reader.rate_table
+        is_published = rate_table.shared_memory is not None
+        rate_table.publish()
+        try:
+            with pool.ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                          initializer=init_worker,
+                                          initargs=(rate_table, tracer.get_queue())) as executor:
+                offsets = self.get_record_offsets(executor)
+                count = len(offsets) - 1
+                self.csv_start.input_values.timer.write_time(f"CHUNKED > Файл разбит на {count} диапазонов")
+                results = executor.map(scan_range, [file_name] * count, offsets[:-1], offsets[1:],
+                                       [self.csv_start.index_of] * count, [self.csv_start.start_line_len] * count,
+                                       [self.csv_start.input_values.prof] * count)
+                for histogram, year_stats, area_stats in results:
+                    self.currency_histogram.merge(histogram)
+                    self.year_stats.merge(year_stats)
+                    self.area_stats.merge(area_stats)
+        finally:
+            if not is_published:
+                rate_table.unpublish()
+        self.csv_start.input_values.timer.write_time("CHUNKED > Все диапазоны разобраны")
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    chunked_scan = Chunked_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_chunked.png", chunked_scan, chunked_scan)
+    report = Report_PDF_MP("report_chunked.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
@@ -0,0 +1,44 @@
+import os, shutil, tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from ChunkedReader import *
+from Benchmark import write_synthetic_csv, write_currency_csv
+
+
+class ChunkedReaderUnitTests(TestCase):
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False)
+        self.file.write(b'name,description\na,"x\ny"\nb,"""q""\nz"\nc,d\n')
+        self.file.close()
+
+    def tearDown(self):
+        os.remove(self.file.name)
+
+    def test_count_quotes(self):
+        self.assertEqual(count_quotes(self.file.name, 0, os.path.getsize(self.file.name)), 8)
+
+    def test_find_record_start_from_header(self):
+        self.assertEqual(find_record_start(self.file.name, 0, False), 17)
+
+    def test_find_record_start_skips_newline_in_quotes(self):
+        self.assertEqual(find_record_start(self.file.name, 21, True), 25)
+
+    def test_find_record_start_with_escaped_quotes(self):
+        self.assertEqual(find_record_start(self.file.name, 28, True), 37)
+
+    def test_find_record_start_at_the_end_of_file(self):
+        self.assertEqual(find_record_start(self.file.name, 38, False), 41)
+
+    def test_rates_are_unpublished_after_error(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(temp_dir, "vacancies.csv")
+            write_synthetic_csv(file_name, 100)
+            write_currency_csv(os.path.join(temp_dir, "currency.csv"))
+            csv_start = CSV_Start(InputCorrect(file_name, "Программист", Timer("TEST", 0)),
+                                  Currency_Values_Reader(temp_dir, "currency.csv"), False)
+            with patch.object(Chunked_Scan, "get_record_offsets", side_effect=OSError):
+                self.assertRaises(OSError, Chunked_Scan, csv_start, 2)
+        finally:
+            shutil.rmtree(temp_dir)
+        self.assertIsNone(csv_start.values_reader.rate_table.shared_memory)
@@ -0,0 +1,262 @@
+import csv, os, shutil, json, hashlib
+import numpy as np
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Fused_Scan, Currency_Histogram, Year_Stats, Area_Stats, get_middle_salary_value
+from CompressedFiles import open_text
+
+fingerprint_block_size = 1 << 20
+
+
+def get_file_fingerprint(file_name: str) -> str:
+    """Отпечаток файла: размер, время изменения, первый и последний мегабайт.
+    Args:
+        file_name (str): путь до файла.
+    Returns:
+        str: sha1 отпечатка в hex-виде.
+    """
+    stat = os.stat(file_name)
+    sha = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(file_name, "rb") as file:
+        sha.update(file.read(fingerprint_block_size))
+        if stat.st_size > fingerprint_block_size:
+            file.seek(max(stat.st_size - fingerprint_block_size, fingerprint_block_size))
+            sha.update(file.read())
+    return sha.hexdigest()
+
+
+class Column_Cache:
+    """Колоночный кэш разобранных вакансий. Лежит в папке cache_dir/<ключ>, где ключ - отпечаток
+    файла с вакансиями и файла с валютами. Каждый столбец - отдельный .npy, который читается через mmap.
+    Строки (название, город, валюта) хранятся словарем + массивом кодов. После построения кэша
+    кэши того же вида для прежних версий этого же файла удаляются.
+    Attributes:
+        cache_dir (str): папка для кэша.
+        file_name (str): csv-файл с вакансиями.
+        currency_file_name (str): csv-файл с валютами.
+    """
+    version = 1
+    column_names = ["name_id", "area_id", "currency_id", "year", "month", "middle_salary", "salary_rur"]
+    column_dtypes = {"name_id": np.int32, "area_id": np.int32, "currency_id": np.int16, "year": np.int16,
+                     "month": np.int8, "middle_salary": np.float64, "salary_rur": np.float64}
+    dict_names = ["names", "areas", "currencies"]
+
+    def __init__(self, cache_dir: str, file_name: str, currency_file_name: str):
+        """Инициализация класса Column_Cache. Вычисление ключа кэша.
+        Args:
+            cache_dir (str): папка для кэша.
+            file_name (str): csv-файл с вакансиями.
+            currency_file_name (str): csv-файл с валютами.
+        """
+        self.cache_dir = cache_dir
+        self.file_name = os.path.abspath(file_name)
+        key = f"{self.version}:{get_file_fingerprint(file_name)}:{get_file_fingerprint(currency_file_name)}"
+        self.path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest()[:20])
+        self.columns = {}
+
+    def is_ready(self) -> bool:
+        """Есть ли уже готовый кэш под этот ключ.
+        Returns:
+            bool: готов ли кэш.
+        """
+        return os.path.exists(os.path.join(self.path, "meta.json"))
+
+    @staticmethod
+    def get_code(value_to_code: dict, value: str) -> int:
+        """Получить код строки в словаре, добавив ее, если ее еще нет.
+        Args:
+            value_to_code (dict): словарь строка/код.
+            value (str): строка.
+        Returns:
+            int: код строки.
+        >>> Column_Cache.get_code({}, "Мск")
+        0
+        >>> Column_Cache.get_code({"Мск": 0}, "Екб")
+        1
+        >>> Column_Cache.get_code({"Мск": 0, "Екб": 1}, "Мск")
+        0
+        """
+        code = value_to_code.get(value)
+        if code is None:
+            code = value_to_code[value] = len(value_to_code)
+        return code
+
+    def build(self, csv_start: CSV_Start) -> None:
+        """Разобрать csv-файл один раз и сохранить проверенные и переведенные в рубли столбцы.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        """
+        index_of = csv_start.index_of
+        rate_table = csv_start.values_reader.rate_table
+        dicts = {name: {} for name in Column_Cache.dict_names}
+        columns = {name: [] for name in Column_Cache.column_names}
+        with open_text(csv_start.input_values.file_name) as csv_file:
+            file = csv.reader(csv_file)
+            next(file)
+            for line in file:
+                if len(line) != csv_start.start_line_len:
+                    continue
+                currency = line[index_of["salary_currency"]]
+                published_at = line[index_of["published_at"]]
+                middle_salary = get_middle_salary_value(line[index_of["salary_from"]], line[index_of["salary_to"]])
+                try:
+                    year, month = int(published_at[:4]), int(published_at[5:7])
+                    rate = rate_table.get_rate(year, month, currency)
+                except ValueError:
+                    year, month, rate = 0, 0, np.nan
+                columns["name_id"].append(Column_Cache.get_code(dicts["names"], line[index_of["name"]]))
+                columns["area_id"].append(Column_Cache.get_code(dicts["areas"], line[index_of["area_name"]]))
+                columns["currency_id"].append(Column_Cache.get_code(dicts["currencies"], currency))
+                columns["year"].append(year)
+                columns["month"].append(month)
+                columns["middle_salary"].append(np.nan if middle_salary is None else middle_salary)
+                columns["salary_rur"].append(np.nan if middle_salary is None or np.isnan(rate)
+                                             else round(rate * middle_salary, 1))
+        self.save(columns, dicts)
+
+    def save(self, columns: dict, dicts: dict) -> None:
+        """Записать столбцы во временную папку и атомарно переименовать ее в папку кэша.
+        Args:
+            columns (dict): название столбца к списку значений.
+            dicts (dict): название словаря к словарю строка/код.
+        """
+        temp_path = self.path + f".tmp{os.getpid()}"
+        os.makedirs(temp_path, exist_ok=True)
+        for name, values in columns.items():
+            np.save(os.path.join(temp_path, name + ".npy"), np.array(values, dtype=self.column_dtypes[name]))
+        for name, value_to_code in dicts.items():
+            np.save(os.path.join(temp_path, name + ".npy"), np.array(list(value_to_code.keys()), dtype=str))
+        with open(os.path.join(temp_path, "meta.json"), "w", encoding="utf-8") as meta_file:
+            json.dump({"version": self.version, "rows": len(columns["year"]), "source": self.file_name}, meta_file)
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.replace(temp_path, self.path)
+        self.remove_stale()
+
+    def remove_stale(self) -> None:
+        """Удалить кэши того же вида (та же версия) для прежних версий того же файла с вакансиями."""
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if path == self.path:
+                continue
+            try:
+                with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as meta_file:
+                    meta = json.load(meta_file)
+            except (OSError, ValueError):
+                continue
+            if meta.get("version") == self.version and meta.get("source") == self.file_name:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def load(self) -> None:
+        """Открыть столбцы кэша через mmap (без чтения в память)."""
+        for name in self.column_names + self.dict_names:
+            self.columns[name] = np.load(os.path.join(self.path, name + ".npy"), mmap_mode="r")
+
+    def get_needed_mask(self, prof: str) -> np.ndarray:
+        """Маска вакансий нужной профессии. Поиск подстроки идет по словарю названий, а не по строкам.
+        Args:
+            prof (str): название профессии.
+        Returns:
+            ndarray: bool-массив по строкам кэша.
+        """
+        names = self.columns["names"]
+        is_needed_name = np.array([str(name).find(prof) > -1 for name in names], dtype=bool)
+        return is_needed_name[self.columns["name_id"]]
+
+    @staticmethod
+    def group_sums(keys: np.ndarray, *weights: np.ndarray) -> (np.ndarray, list):
+        """Сгруппировать значения по ключам: уникальные ключи и суммы весов по каждому ключу.
+        Суммирование идет в порядке строк, как и в построчном проходе.
+        Args:
+            keys (ndarray): ключи групп.
+            *weights (ndarray): суммируемые столбцы.
+        Returns:
+            (ndarray, list): уникальные ключи, список массивов сумм (первый - кол-во).
+        """
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sums = [np.bincount(inverse, minlength=len(unique_keys))]
+        sums += [np.bincount(inverse, weights=weight, minlength=len(unique_keys)) for weight in weights]
+        return unique_keys, sums
+
+    def fill_aggregators(self, prof: str, currency_histogram: Currency_Histogram,
+                         year_stats: Year_Stats, area_stats: Area_Stats) -> None:
+        """Заполнить агрегаторы Fused_Scan по столбцам кэша без разбора csv.
+        Args:
+            prof (str): название профессии.
+            currency_histogram (Currency_Histogram): агрегатор валют.
+            year_stats (Year_Stats): агрегатор по годам.
+            area_stats (Area_Stats): агрегатор по городам.
+        """
+        currencies = [str(currency) for currency in self.columns["currencies"]]
+        currency_id = np.asarray(self.columns["currency_id"], dtype=np.int64)
+        for code, count in enumerate(np.bincount(currency_id, minlength=len(currencies))):
+            if count > 0:
+                currency_histogram.currency_to_count[currencies[code]] = int(count)
+        salary_rur = np.asarray(self.columns["salary_rur"])
+        has_rate = ~np.isnan(salary_rur)
+        is_needed = self.get_needed_mask(prof)[has_rate]
+        salary = salary_rur[has_rate]
+        keys = np.asarray(self.columns["year"], dtype=np.int64)[has_rate] * len(currencies) + currency_id[has_rate]
+        unique_keys, (counts, sums, needed_counts, needed_sums) = \
+            Column_Cache.group_sums(keys, salary, is_needed.astype(np.float64), np.where(is_needed, salary, 0.0))
+        for i, key in enumerate(unique_keys):
+            year, code = divmod(int(key), len(currencies))
+            year_stats.year_cur_to_stats[(year, currencies[code])] = \
+                [int(counts[i]), float(sums[i]), int(needed_counts[i]), float(needed_sums[i])]
+        has_salary = ~np.isnan(np.asarray(self.columns["middle_salary"]))
+        areas = self.columns["areas"]
+        keys = np.asarray(self.columns["area_id"], dtype=np.int64)[has_salary] * len(currencies) \
+            + currency_id[has_salary]
+        has_rate = has_rate[has_salary]
+        unique_keys, (counts, salary_counts, salary_sums) = \
+            Column_Cache.group_sums(keys, has_rate.astype(np.float64), np.where(has_rate, salary_rur[has_salary], 0.0))
+        for i, key in enumerate(unique_keys):
+            area_code, code = divmod(int(key), len(currencies))
+            area_stats.area_cur_to_stats[(str(areas[area_code]), currencies[code])] = \
+                [int(counts[i]), int(salary_counts[i]), float(salary_sums[i])]
+
+
+class Cached_Scan(Fused_Scan):
+    """Вариант Fused_Scan, который берет данные из колоночного кэша. При первом запуске
+    (или если файл/валюты изменились) кэш строится одним проходом по csv.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        cache_dir (str): папка для кэша.
+    """
+    def __init__(self, csv_start: CSV_Start, cache_dir: str = "cache"):
+        """Инициализация класса Cached_Scan. Загрузка (или построение) кэша и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+            cache_dir (str): папка для кэша.
+        """
+        self.cache = Column_Cache(cache_dir, csv_start.input_values.file_name, csv_start.values_reader.csv_path)
+        super().__init__(csv_start)
+
+    def scan_file(self) -> None:
+        """Первая фаза: чтение столбцов из кэша вместо разбора csv."""
+        timer = self.csv_start.input_values.timer
+        if not self.cache.is_ready():
+            self.cache.build(self.csv_start)
+            timer.write_time("CACHE > Кэш построен: \"" + self.cache.path + "\"")
+        self.cache.load()
+        self.cache.fill_aggregators(self.csv_start.input_values.prof,
+                                    self.currency_histogram, self.year_stats, self.area_stats)
+        timer.write_time("CACHE > Данные взяты из кэша")
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    cached_scan = Cached_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_cached.png", cached_scan, cached_scan)
+    report = Report_PDF_MP("report_cached.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
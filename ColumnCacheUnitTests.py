@@ -0,0 +1,59 @@
+import os, shutil, tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from ColumnCache import *
+from StatsCube import Cube_Scan
+from Benchmark import write_synthetic_csv, write_currency_csv
+
+
+class ColumnCacheUnitTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.temp_dir, "vacancies.csv")
+        self.currency_name = os.path.join(self.temp_dir, "currency_csv.csv")
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        write_currency_csv(self.currency_name)
+        write_synthetic_csv(self.file_name, 8000)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def scan(self, scan_class, prof: str = "Программист", **kwargs) -> Fused_Scan:
+        timer = Timer("TEST", 0)
+        csv_start = CSV_Start(InputCorrect(self.file_name, prof, timer),
+                              Currency_Values_Reader(self.temp_dir, "currency_csv.csv"), False)
+        return scan_class(csv_start, **kwargs)
+
+    def assertSameResult(self, first: Fused_Scan, second: Fused_Scan):
+        self.assertEqual(first.get_year_data(), second.get_year_data())
+        self.assertEqual(first.currency_histogram.currency_to_count, second.currency_histogram.currency_to_count)
+        self.assertEqual((first.area_to_middle_salary, first.area_to_piece),
+                         (second.area_to_middle_salary, second.area_to_piece))
+
+    def test_cached_scan_gives_the_same_result_as_fused_scan(self):
+        for prof in "Программист", "Аналитик":
+            fused_scan = self.scan(Fused_Scan, prof)
+            self.assertGreater(len(fused_scan.year_data[0]), 0)
+            self.assertSameResult(self.scan(Cached_Scan, prof, cache_dir=self.cache_dir), fused_scan)
+
+    def test_second_run_is_a_cache_hit(self):
+        first_scan = self.scan(Cached_Scan, cache_dir=self.cache_dir)
+        with patch.object(Column_Cache, "build", side_effect=AssertionError):
+            self.assertSameResult(self.scan(Cached_Scan, cache_dir=self.cache_dir), first_scan)
+
+    def test_changed_file_is_rebuilt_and_old_cache_removed(self):
+        self.scan(Cached_Scan, cache_dir=self.cache_dir)
+        self.scan(Cube_Scan, cache_dir=self.cache_dir)
+        write_synthetic_csv(self.file_name, 7000, seed=1)
+        self.assertSameResult(self.scan(Cached_Scan, cache_dir=self.cache_dir), self.scan(Fused_Scan))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_changed_currencies_are_rebuilt(self):
+        self.scan(Cached_Scan, cache_dir=self.cache_dir)
+        with open(self.currency_name, encoding="utf-8-sig") as currency_file:
+            text = currency_file.read()
+        with open(self.currency_name, "w", encoding="utf-8-sig") as currency_file:
+            currency_file.write(text.replace("60.66", "70.5"))
+        cached_scan = self.scan(Cached_Scan, cache_dir=self.cache_dir)
+        self.assertSameResult(cached_scan, self.scan(Fused_Scan))
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(cached_scan.cache.path)])
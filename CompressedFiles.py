@@ -0,0 +1,233 @@
+import argparse, gzip, io, json, os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+compression_to_suffix = {"": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def get_partition_name(year, compression: str = "") -> str:
+    """Название csv-файла одного года.
+    Args:
+        year: год.
+        compression (str): сжатие ("", gzip или zstd).
+    Returns:
+        str: название файла.
+    >>> get_partition_name(2003), get_partition_name("2004", "gzip")
+    ('file_2003.csv', 'file_2004.csv.gz')
+    """
+    return f"file_{year}.csv{compression_to_suffix[compression]}"
+
+
+def get_partition_year(file_name: str) -> int:
+    """Год по названию csv-файла года (сжатого или нет).
+    Args:
+        file_name (str): название файла.
+    Returns:
+        int: год.
+    >>> get_partition_year("file_2003.csv"), get_partition_year("file_2004.csv.zst")
+    (2003, 2004)
+    """
+    return int(file_name.split(".")[0].replace("file_", ""))
+
+
+def get_compression(file_name: str) -> str:
+    """Сжатие файла по его расширению.
+    Args:
+        file_name (str): название файла.
+    Returns:
+        str: "", gzip или zstd.
+    >>> get_compression("csv/file_2003.csv.gz"), get_compression("file_2003.csv")
+    ('gzip', '')
+    """
+    for compression, suffix in compression_to_suffix.items():
+        if suffix and file_name.endswith(suffix):
+            return compression
+    return ""
+
+
+def check_compression(compression: str) -> None:
+    """Проверить, что сжатие известно и доступно.
+    Args:
+        compression (str): "", gzip или zstd.
+    """
+    if compression not in compression_to_suffix:
+        raise ValueError(f"Неизвестное сжатие \"{compression}\". Доступны: gzip, zstd")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("Для сжатия zstd нужен пакет zstandard")
+
+
+def open_text(file_name: str, mode: str = "r", compression: str = None, compress_level: int = 3,
+              newline: str = ""):
+    """Открыть csv-файл как текст. Сжатие определяется по расширению, сжатый файл распаковывается
+    потоком (без временного файла на диске).
+    Сжатые файлы пишутся без BOM, потому что при дозаписи ("a") BOM оказался бы в середине файла.
+    Дозапись добавляет к файлу новый gzip-член или zstd-фрейм, при чтении они склеиваются.
+    Args:
+        file_name (str): путь до файла.
+        mode (str): "r", "w" или "a".
+        compression (str): сжатие (по умолчанию - по расширению файла).
+        compress_level (int): уровень сжатия.
+        newline (str): как в open (по умолчанию "" - для модуля csv).
+    Returns:
+        Текстовый файловый объект.
+    """
+    compression = get_compression(file_name) if compression is None else compression
+    check_compression(compression)
+    encoding = "utf-8-sig" if mode == "r" or not compression else "utf-8"
+    if compression == "gzip":
+        return gzip.open(file_name, mode + "t", compresslevel=compress_level, encoding=encoding, newline=newline)
+    if compression == "zstd":
+        raw_file = open(file_name, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw_file, read_across_frames=True, closefd=True)
+            return io.TextIOWrapper(io.BufferedReader(stream), encoding=encoding, newline=newline)
+        stream = zstandard.ZstdCompressor(level=compress_level).stream_writer(raw_file, closefd=True)
+        return io.TextIOWrapper(stream, encoding=encoding, newline=newline, write_through=True)
+    return open(file_name, mode, encoding=encoding, newline=newline)
+
+
+def compress_bytes(data: bytes, compression: str, compress_level: int = 3) -> bytes:
+    """Сжать байты в один независимый gzip-член или zstd-фрейм.
+    Args:
+        data (bytes): данные.
+        compression (str): gzip или zstd.
+        compress_level (int): уровень сжатия.
+    Returns:
+        bytes: сжатые данные.
+    """
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=compress_level, mtime=0)
+    return zstandard.ZstdCompressor(level=compress_level).compress(data)
+
+
+def decompress_bytes(data: bytes, compression: str) -> bytes:
+    """Распаковать подряд идущие gzip-члены или zstd-фреймы.
+    Args:
+        data (bytes): сжатые данные.
+        compression (str): "", gzip или zstd.
+    Returns:
+        bytes: распакованные данные.
+    """
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True).read()
+    return data
+
+
+def get_index_name(file_name: str) -> str:
+    """Название файла блочного индекса сжатого файла.
+    Args:
+        file_name (str): путь до сжатого файла.
+    Returns:
+        str: путь до индекса.
+    """
+    return file_name + ".idx"
+
+
+def read_block_index(file_name: str) -> list:
+    """Блочный индекс сжатого файла (см. write_block_indexed).
+    Args:
+        file_name (str): путь до сжатого файла.
+    Returns:
+        list: начала блоков в сжатом файле (первый блок - заголовок) или None, если индекса нет
+            или он от другой версии файла.
+    """
+    index_name = get_index_name(file_name)
+    if not os.path.exists(index_name):
+        return None
+    with open(index_name, "r", encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    if index["size"] != os.path.getsize(file_name):
+        return None
+    return index["offsets"]
+
+
+def read_text_range(file_name: str, start: int, end: int) -> str:
+    """Прочитать байтовый диапазон файла как текст. Для сжатого файла диапазон должен состоять
+    из целых блоков (границы берутся из блочного индекса) или быть всем файлом.
+    Args:
+        file_name (str): путь до файла.
+        start (int): начало диапазона.
+        end (int): конец диапазона (не включается).
+    Returns:
+        str: текст диапазона.
+    """
+    with open(file_name, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    return decompress_bytes(data, get_compression(file_name)).decode("utf-8-sig" if start == 0 else "utf-8")
+
+
+def get_records(text_file):
+    """Поток записей csv-файла в исходном виде: физические строки склеиваются, пока внутри
+    записи нечетное кол-во кавычек (многострочное поле).
+    Args:
+        text_file: текстовый файл, открытый с newline="".
+    Returns:
+        generator: записи вместе с переводом строки.
+    >>> list(get_records(io.StringIO('a,"b\\nc"\\nd,e\\n', newline="")))
+    ['a,"b\\nc"\\n', 'd,e\\n']
+    """
+    record, quotes = [], 0
+    for line in text_file:
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield "".join(record)
+            record, quotes = [], 0
+    if record:
+        yield "".join(record)
+
+
+def write_block_indexed(source_name: str, target_name: str, block_size: int = 4 << 20,
+                        compress_level: int = 3) -> int:
+    """Сжать csv-файл блоками: каждый блок - независимый gzip-член или zstd-фрейм из целых записей
+    (заголовок - отдельным первым блоком). Результат остается обычным .csv.gz / .csv.zst, а рядом
+    сохраняется индекс начал блоков (.idx), по которому диапазоны из целых блоков можно
+    распаковывать параллельно.
+    Args:
+        source_name (str): исходный csv-файл (сжатый или нет).
+        target_name (str): сжатый файл (.csv.gz или .csv.zst).
+        block_size (int): желаемый размер блока до сжатия в байтах.
+        compress_level (int): уровень сжатия.
+    Returns:
+        int: кол-во блоков.
+    """
+    compression = get_compression(target_name)
+    check_compression(compression)
+    if not compression:
+        raise ValueError("Блочный индекс нужен только для сжатого файла (.csv.gz или .csv.zst)")
+    offsets = []
+    with open_text(source_name) as source_file, open(target_name, "wb") as target_file:
+        records = get_records(source_file)
+        offsets.append(target_file.tell())
+        target_file.write(compress_bytes(next(records, "").encode("utf-8"), compression, compress_level))
+        block, block_length = [], 0
+        for record in records:
+            block.append(record)
+            block_length += len(record)
+            if block_length >= block_size:
+                offsets.append(target_file.tell())
+                target_file.write(compress_bytes("".join(block).encode("utf-8"), compression, compress_level))
+                block, block_length = [], 0
+        if block:
+            offsets.append(target_file.tell())
+            target_file.write(compress_bytes("".join(block).encode("utf-8"), compression, compress_level))
+        size = target_file.tell()
+    with open(get_index_name(target_name), "w", encoding="utf-8") as index_file:
+        json.dump({"size": size, "offsets": offsets}, index_file)
+    return len(offsets)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Сжатие csv-файла блоками с индексом для параллельного чтения")
+    parser.add_argument("source_name")
+    parser.add_argument("target_name", help="файл .csv.gz или .csv.zst")
+    parser.add_argument("--block-size", type=int, default=4 << 20)
+    parser.add_argument("--level", type=int, default=3)
+    arguments = parser.parse_args()
+    print(write_block_indexed(arguments.source_name, arguments.target_name, arguments.block_size, arguments.level))
@@ -0,0 +1,67 @@
+import csv, gzip, io, os, tempfile
+from unittest import TestCase
+from CompressedFiles import *
+from ChunkedReader import Chunked_Scan
+
+
+class CompressedFilesUnitTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_gzip_append_keeps_one_bom_free_stream(self):
+        file_name = os.path.join(self.temp_dir.name, get_partition_name(2003, "gzip"))
+        for mode, rows in (("w", [["Программист", "Москва\nЦентр"]]), ("a", [["Аналитик", "Пермь"]])):
+            with open_text(file_name, mode) as csv_file:
+                csv.writer(csv_file).writerows(rows)
+        with open_text(file_name) as csv_file:
+            self.assertEqual(list(csv.reader(csv_file)), [["Программист", "Москва\nЦентр"], ["Аналитик", "Пермь"]])
+        self.assertEqual(get_partition_year(os.path.basename(file_name)), 2003)
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            check_compression("lz4")
+
+    def write_source(self) -> str:
+        source_name = os.path.join(self.temp_dir.name, "vacancies.csv")
+        with open(source_name, "w", encoding="utf-8-sig", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["name", "description"])
+            for i in range(200):
+                writer.writerow([f"Программист {i}", f"Строка 1\n\"Строка\" {i}" if i % 3 == 0 else "Коротко"])
+        return source_name
+
+    def test_block_indexed_file_has_whole_records_in_blocks(self):
+        source_name = self.write_source()
+        target_name = os.path.join(self.temp_dir.name, "vacancies.csv.gz")
+        blocks_count = write_block_indexed(source_name, target_name, 500)
+        offsets = read_block_index(target_name)
+        self.assertEqual(len(offsets), blocks_count)
+        with open(source_name, encoding="utf-8-sig", newline="") as csv_file:
+            expected = list(csv.reader(csv_file))
+        with gzip.open(target_name, "rt", encoding="utf-8-sig", newline="") as csv_file:
+            self.assertEqual(list(csv.reader(csv_file)), expected)
+        bounds = offsets + [os.path.getsize(target_name)]
+        rows = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            rows.extend(csv.reader(io.StringIO(read_text_range(target_name, start, end), newline="")))
+        self.assertEqual(rows, expected)
+
+    def test_block_index_of_other_file_is_ignored(self):
+        target_name = os.path.join(self.temp_dir.name, "vacancies.csv.gz")
+        write_block_indexed(self.write_source(), target_name, 500)
+        with open(target_name, "ab") as target_file:
+            target_file.write(gzip.compress(b"x,y\n"))
+        self.assertIsNone(read_block_index(target_name))
+
+    def test_chunked_scan_groups_whole_blocks(self):
+        target_name = os.path.join(self.temp_dir.name, "vacancies.csv.gz")
+        write_block_indexed(self.write_source(), target_name, 500)
+        chunked_scan = Chunked_Scan.__new__(Chunked_Scan)
+        chunked_scan.max_workers, chunked_scan.chunk_size = 3, 1 << 20
+        offsets = chunked_scan.get_block_offsets(target_name)
+        block_offsets = read_block_index(target_name)
+        self.assertEqual((len(offsets), offsets[0], offsets[-1]), (4, block_offsets[1], os.path.getsize(target_name)))
+        self.assertTrue(set(offsets[:-1]) <= set(block_offsets))
@@ -1,41 +1,282 @@
 import requests
-import pandas as pd
-import os, shutil
+import hashlib, io, json, os, shutil, threading, time
 import csv
+import xml.etree.ElementTree as ET
 from ReportPDF_New_MProcess_2 import Error, Timer
-import multiprocessing as mp
+from RateTable import Rate_Table
+import concurrent.futures as pool
 from datetime import datetime
 
+cbr_url = "http://www.cbr.ru/scripts/XML_daily.asp"
+
+
+class Response_Cache:
+    """Дисковый кэш ответов по адресу запроса. Тела ответов лежат в objects/ под именем sha256
+    своего содержимого (одинаковые ответы хранятся один раз), записи в entries/ (по sha1 адреса)
+    хранят адрес, хэш тела и срок годности. При чтении хэш тела проверяется: испорченная
+    запись удаляется, и адрес загружается заново. Если тела занимают больше max_bytes,
+    удаляются записи, которые дольше всего не читались (время изменения файла записи).
+    Attributes:
+        cache_dir (str): папка кэша.
+        max_bytes (int): предельный размер тел ответов в байтах.
+        validator (function): проверка тела перед сохранением (None - сохранять все).
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 64 << 20, validator=None):
+        """Инициализация класса Response_Cache. Создание папок кэша.
+        Args:
+            cache_dir (str): папка кэша.
+            max_bytes (int): предельный размер тел ответов в байтах.
+            validator (function): проверка тела перед сохранением.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.validator = validator
+        self.lock = threading.Lock()
+        self.total_size = None
+        os.makedirs(os.path.join(cache_dir, "entries"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+
+    def get_entry_path(self, url: str) -> str:
+        """Путь до записи адреса.
+        Args:
+            url (str): адрес.
+        Returns:
+            str: путь до json-файла записи.
+        """
+        return os.path.join(self.cache_dir, "entries", hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def get_object_path(self, sha256: str) -> str:
+        """Путь до тела ответа по его хэшу.
+        Args:
+            sha256 (str): sha256 тела в hex-виде.
+        Returns:
+            str: путь до файла тела.
+        """
+        return os.path.join(self.cache_dir, "objects", sha256)
+
+    @staticmethod
+    def write_atomic(path: str, data: bytes) -> None:
+        """Записать файл через временный файл и переименование (читатели не видят недописанный файл).
+        Args:
+            path (str): путь до файла.
+            data (bytes): содержимое.
+        """
+        temp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, url: str) -> bytes:
+        """Тело ответа из кэша.
+        Args:
+            url (str): адрес.
+        Returns:
+            bytes: тело ответа или None, если записи нет, ее срок вышел или тело испорчено.
+        """
+        entry_path = self.get_entry_path(url)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            with open(self.get_object_path(entry["sha256"]), "rb") as object_file:
+                data = object_file.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        if entry["url"] != url:
+            return None
+        if entry["expires_at"] is not None and entry["expires_at"] < time.time() \
+                or hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            self.remove(entry_path)
+            return None
+        os.utime(entry_path)
+        return data
+
+    def put(self, url: str, data: bytes, ttl: float = None) -> None:
+        """Сохранить тело ответа (если оно проходит проверку) и удалить лишние записи.
+        Args:
+            url (str): адрес.
+            data (bytes): тело ответа.
+            ttl (float): срок годности в секундах (None - бессрочно).
+        """
+        if self.validator is not None and not self.validator(data):
+            return
+        sha256 = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if self.total_size is None:
+                self.total_size = sum(os.path.getsize(self.get_object_path(name))
+                                      for name in os.listdir(os.path.join(self.cache_dir, "objects")))
+            if not os.path.exists(self.get_object_path(sha256)):
+                Response_Cache.write_atomic(self.get_object_path(sha256), data)
+                self.total_size += len(data)
+            entry = {"url": url, "sha256": sha256, "size": len(data),
+                     "expires_at": None if ttl is None else time.time() + ttl}
+            Response_Cache.write_atomic(self.get_entry_path(url), json.dumps(entry).encode())
+            if self.total_size > self.max_bytes:
+                self.evict()
+
+    def remove(self, entry_path: str) -> None:
+        """Удалить запись (тело удаляется при следующей очистке, если на него больше никто не ссылается).
+        Args:
+            entry_path (str): путь до записи.
+        """
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Удалять записи, которые дольше всего не читались, пока тела не поместятся в max_bytes,
+        и удалить тела, на которые не ссылается ни одна запись. Вызывается, только когда размер
+        тел превысил max_bytes."""
+        entries_dir = os.path.join(self.cache_dir, "entries")
+        entries = []
+        for name in os.listdir(entries_dir):
+            if not name.endswith(".json"):
+                continue
+            entry_path = os.path.join(entries_dir, name)
+            try:
+                with open(entry_path, "r", encoding="utf-8") as entry_file:
+                    entries.append((os.path.getmtime(entry_path), entry_path, json.load(entry_file)))
+            except (OSError, ValueError):
+                continue
+        entries.sort(key=lambda item: item[0])
+        sha_to_size = {entry["sha256"]: entry["size"] for _, _, entry in entries}
+        total_size = sum(sha_to_size.values())
+        while entries and total_size > self.max_bytes:
+            _, entry_path, entry = entries.pop(0)
+            self.remove(entry_path)
+            if all(other["sha256"] != entry["sha256"] for _, _, other in entries):
+                total_size -= entry["size"]
+        used = {entry["sha256"] for _, _, entry in entries}
+        for name in os.listdir(os.path.join(self.cache_dir, "objects")):
+            if name not in used and ".tmp" not in name:
+                os.remove(self.get_object_path(name))
+        self.total_size = total_size
+
+
+class Rates_Fetcher:
+    """Параллельная загрузка ответов ЦБ: общий пул keep-alive соединений (requests.Session),
+    ограниченное кол-во одновременных запросов, повтор с экспоненциальной задержкой при ошибках
+    сети и ответах 429/5xx. Ответы отдаются в порядке адресов, а не в порядке их прихода.
+    Attributes:
+        concurrency (int): сколько запросов выполнять одновременно.
+        retries (int): сколько раз повторять неудачный запрос.
+        backoff (float): задержка перед первым повтором в секундах (дальше удваивается).
+        timeout (float): таймаут одного запроса в секундах.
+        cache (Response_Cache): дисковый кэш ответов (None - без кэша).
+    """
+    def __init__(self, concurrency: int = 8, retries: int = 3, backoff: float = 0.5, timeout: float = 30,
+                 cache: Response_Cache = None):
+        """Инициализация класса Rates_Fetcher. Создание сессии.
+        Args:
+            concurrency (int): сколько запросов выполнять одновременно.
+            retries (int): сколько раз повторять неудачный запрос.
+            backoff (float): задержка перед первым повтором в секундах.
+            timeout (float): таймаут одного запроса в секундах.
+            cache (Response_Cache): дисковый кэш ответов.
+        """
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str, ttl: float = None) -> bytes:
+        """Загрузить один адрес с повторами (или взять ответ из кэша).
+        Args:
+            url (str): адрес.
+            ttl (float): срок годности ответа в кэше в секундах (None - бессрочно).
+        Returns:
+            bytes: тело ответа.
+        """
+        if self.cache is not None:
+            data = self.cache.get(url)
+            if data is not None:
+                return data
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    if self.cache is not None:
+                        self.cache.put(url, response.content, ttl)
+                    return response.content
+                error = requests.HTTPError(f"{response.status_code} для адреса {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as exception:
+                error = exception
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise error
+
+    def fetch_all(self, urls: list, ttls: list = None):
+        """Загрузить адреса параллельно (не больше concurrency запросов одновременно).
+        Args:
+            urls (list): адреса.
+            ttls (list): сроки годности ответов в кэше (None - все бессрочно).
+        Returns:
+            generator: тела ответов в порядке адресов (отдаются по мере готовности очередного).
+        """
+        executor = pool.ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            yield from executor.map(self.fetch, urls, ttls or [None] * len(urls))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def close(self) -> None:
+        """Закрыть соединения сессии."""
+        self.session.close()
+
+
 class Currency_Values_Creator:
     """Класс для работы с API Центробанка
     Attributes:
         data_dir (str): имя папки для файлов.
         csv_name (str): название csv_файла, который нужно будет создать.
+        base_url (str): адрес XML_daily.asp (можно подменить локальной заглушкой CBRStub).
+        fetcher (Rates_Fetcher): параллельная загрузка ответов.
+        is_incremental (bool): догружать только месяцы, которых нет в уже созданном csv-файле.
     """
     temp_needed_fields = ["CharCode", "Nominal", "Value"]
     start_basic_row = ["Year", "Month", "CharCode", "InRuR"]
+    cache_dir_name = "http_cache"
+    current_month_ttl = 3600
 
-    def __init__(self, data_dir: str, csv_name: str):
+    def __init__(self, data_dir: str, csv_name: str, base_url: str = cbr_url, fetcher: Rates_Fetcher = None,
+                 is_incremental: bool = False):
         """Инициализация класса Currency_Values. Создание CSV-файла.
         Args:
             data_dir (str): имя папки для файлов.
             csv_name (str): имя будущего файла с данными по валютам.
+            base_url (str): адрес XML_daily.asp.
+            fetcher (Rates_Fetcher): параллельная загрузка ответов (по умолчанию - 8 запросов одновременно
+                и кэш ответов в папке data_dir/http_cache).
+            is_incremental (bool): догружать только недостающие месяцы.
         """
         self.data_dir = data_dir
-        self.temp_xml_name = "temp_xml.xml"
-        self.temp_csv_name = "temp_csv.csv"
+        self.base_url = base_url
+        self.fetcher = fetcher or Rates_Fetcher(cache=Response_Cache(os.path.join(data_dir, self.cache_dir_name),
+                                                                     validator=Currency_Values_Creator.is_valid_xml))
+        self.is_incremental = is_incremental
         self.start_year = 2003
         self.start_month = 1
         self.end_year = datetime.now().year
         self.end_month = datetime.now().month
-        self.index_of = {}
         self.create_csv(csv_name)
 
     def make_dir_if_needed(self) -> None:
-        """Создание нужной дериктории"""
-        if os.path.exists(self.data_dir):
-            shutil.rmtree(self.data_dir)
-        os.mkdir(self.data_dir)
+        """Создание нужной дериктории (старые файлы удаляются, кэш ответов остается)"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        for name in os.listdir(self.data_dir):
+            path = os.path.join(self.data_dir, name)
+            if name == Currency_Values_Creator.cache_dir_name:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
 
     def get_start_and_end_months(self, cur_year: int) -> (int, int):
         """Получение начального и конечного месяца для запросов
@@ -63,70 +304,138 @@ class Currency_Values_Creator:
         str_month = str(month)
         if month < 10:
             str_month = "0" + str(month)
-        return f"http://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{str_month}/{str(year)}"
+        return f"{self.base_url}?date_req=01/{str_month}/{str(year)}"
 
-    def url_to_csv(self, cur_url: str) -> str:
-        """Конвертация полученных их хапроса данных в CSV.
+    def get_months(self) -> list:
+        """Все месяцы, по которым нужны курсы, по порядку.
+        Returns:
+            list: пары (год, месяц).
+        """
+        months = []
+        for cur_year in range(self.start_year, self.end_year+1):
+            start_month_value, end_month_value = self.get_start_and_end_months(cur_year)
+            months += [(cur_year, cur_month) for cur_month in range(start_month_value, end_month_value+1)]
+        return months
+
+    def get_ttl(self, year: int, month: int) -> float:
+        """Срок годности ответа в кэше: курсы прошлых месяцев не меняются, текущий месяц - недолго.
         Args:
-            cur_url (str): адрес данных.
+            year (int): год.
+            month (int): месяц.
         Returns:
-            str: имя полученного CSV-файла."""
-        data = requests.get(cur_url)
-        full_xml_path = self.data_dir + "/" + self.temp_xml_name
-        file = open(file=full_xml_path, mode="w", encoding="utf-8-sig")
-        file.write(data.text)
-        file.close()
-        full_csv_path = self.data_dir + "/" + self.temp_csv_name
-        pd.read_xml(full_xml_path).to_csv(full_csv_path, index=False)
-        return full_csv_path
-
-    def save_data_from_xml(self, cur_year: int, cur_month: int, csv_name: str) -> None:
-        """Преобразует данные из xml и добавляет их к итоговуму csv-файлу.
-        Args:
-            cur_year (int): год, по которому нужно получить данные.
-            cur_month (int): месяц, по которому нужно получить данные.
-            csv_name (str): файл, в который будут добавляться данные.
-        """
-        cur_url = self.get_needed_url(cur_year, cur_month)
-        print(cur_url)
-        full_csv_path = self.url_to_csv(cur_url)
-        with open(file=self.data_dir+"/"+csv_name, mode="a", encoding="utf-8-sig", newline='') as csv_basic_file:
-            csv_base = csv.writer(csv_basic_file)
-            with open(file=full_csv_path, mode="r", encoding="utf-8-sig") as csv_file:
-                temp_file = csv.reader(csv_file)
-                start_temp_line = next(temp_file)
-                if len(self.index_of.items()) == 0:
-                   self.get_indexes(start_temp_line)
-                   csv_base.writerow(Currency_Values_Creator.start_basic_row)
-                for temp_line in temp_file:
-                    print(temp_line)
-                    value = float(temp_line[self.index_of["Value"]].replace(",","."))
-                    delimiter = int(temp_line[self.index_of["Nominal"]])
-                    new_row = [cur_year, cur_month, temp_line[self.index_of["CharCode"]], round(value/delimiter, 10)]
-                    csv_base.writerow(new_row)
-                csv_file.close()
-            csv_basic_file.close()
-
-    def get_indexes(self, temp_start_line: list) -> None:
-        """Получить индексы для нужных столбцов.
-        Args:
-            temp_start_line (list): та строка, из которой получаем индексы.
-        """
-        for field in Currency_Values_Creator.temp_needed_fields:
-            try:
-                field_index = temp_start_line.index(field)
-                self.index_of[field] = field_index
-            except:
-                Error("MISSING_INDEX", "Can't find index of \"" + field + "\"", True, Timer("", 0))
+            float: срок в секундах или None (бессрочно).
+        """
+        return None if (year, month) < (self.end_year, self.end_month) else Currency_Values_Creator.current_month_ttl
+
+    @staticmethod
+    def is_valid_xml(data: bytes) -> bool:
+        """Проверка ответа перед сохранением в кэш: целый xml с курсами (ValCurs).
+        Args:
+            data (bytes): тело ответа.
+        Returns:
+            bool: можно ли сохранить ответ.
+        >>> Currency_Values_Creator.is_valid_xml(b"<ValCurs><Valute/></ValCurs>"), Currency_Values_Creator.is_valid_xml(b"<ValCurs>")
+        (True, False)
+        """
+        try:
+            return ET.fromstring(data).tag == "ValCurs"
+        except ET.ParseError:
+            return False
+
+    @staticmethod
+    def get_xml_rows(data: bytes):
+        """Потоковый разбор ответа ЦБ прямо из памяти (iterparse): каждая валюта разбирается
+        и сразу удаляется из дерева. Кодировка берется из заголовка xml (windows-1251).
+        Args:
+            data (bytes): тело ответа.
+        Returns:
+            generator: (CharCode, Nominal, Value) каждой валюты, Value уже с точкой.
+        >>> list(Currency_Values_Creator.get_xml_rows(b"<ValCurs><Valute><CharCode>KZT</CharCode>"
+        ...                                          b"<Nominal>100</Nominal><Value>20,7</Value></Valute></ValCurs>"))
+        [('KZT', '100', '20.7')]
+        """
+        for _, element in ET.iterparse(io.BytesIO(data), events=("end",)):
+            if element.tag != "Valute":
+                continue
+            values = [element.findtext(field) for field in Currency_Values_Creator.temp_needed_fields]
+            for field, value in zip(Currency_Values_Creator.temp_needed_fields, values):
+                if value is None:
+                    Error("MISSING_INDEX", "Can't find field \"" + field + "\"", True, Timer("", 0))
+            element.clear()
+            yield values[0], values[1], values[2].replace(",", ".")
+
+    def save_data_from_xml(self, cur_year: int, cur_month: int, data: bytes, csv_base) -> None:
+        """Преобразует данные из xml и сразу дописывает их в итоговый csv-файл.
+        Args:
+            cur_year (int): год, по которому получены данные.
+            cur_month (int): месяц, по которому получены данные.
+            data (bytes): тело ответа.
+            csv_base (csv.writer): писатель итогового файла.
+        """
+        print(self.get_needed_url(cur_year, cur_month))
+        for char_code, nominal, value in Currency_Values_Creator.get_xml_rows(data):
+            csv_base.writerow([cur_year, cur_month, char_code, round(float(value) / int(nominal), 10)])
+
+    @staticmethod
+    def get_present_months(csv_path: str) -> set:
+        """Месяцы, которые уже есть в csv-файле с валютами. Курсы на первое число месяца
+        после публикации не меняются, поэтому такие месяцы загружать заново не нужно.
+        Args:
+            csv_path (str): путь до csv-файла.
+        Returns:
+            set: пары (год, месяц) или None, если файла нет или у него другая первая строка.
+        """
+        if not os.path.exists(csv_path):
+            return None
+        with open(file=csv_path, mode="r", encoding="utf-8-sig", newline='') as csv_file:
+            file = csv.reader(csv_file)
+            if next(file, None) != Currency_Values_Creator.start_basic_row:
+                return None
+            return {(int(line[0]), int(line[1])) for line in file}
+
+    def write_months(self, csv_path: str, months: list, is_append: bool) -> None:
+        """Загрузить месяцы и записать их во временный файл (при дозаписи - копию старого файла),
+        а затем атомарно заменить им csv-файл: при ошибке загрузки старый файл не портится.
+        Args:
+            csv_path (str): путь до csv-файла.
+            months (list): пары (год, месяц) по порядку.
+            is_append (bool): дописать к старому файлу или создать новый.
+        """
+        temp_path = csv_path + f".tmp{os.getpid()}"
+        if is_append:
+            shutil.copyfile(csv_path, temp_path)
+        try:
+            responses = self.fetcher.fetch_all([self.get_needed_url(year, month) for year, month in months],
+                                               [self.get_ttl(year, month) for year, month in months])
+            with open(file=temp_path, mode="a" if is_append else "w", encoding="utf-8-sig", newline='') as csv_basic_file:
+                csv_base = csv.writer(csv_basic_file)
+                if not is_append:
+                    csv_base.writerow(Currency_Values_Creator.start_basic_row)
+                for (cur_year, cur_month), data in zip(months, responses):
+                    self.save_data_from_xml(cur_year, cur_month, data, csv_base)
+            os.replace(temp_path, csv_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def create_csv(self, csv_name: str) -> None:
-        """Создание полного csv-файла с валютами."""
-        self.make_dir_if_needed()
-        for cur_year in range(self.start_year, self.end_year+1):
-            start_month_value, end_month_value = self.get_start_and_end_months(cur_year)
-            for cur_month in range(start_month_value, end_month_value+1):
-                self.save_data_from_xml(cur_year, cur_month, csv_name)
+        """Создание полного csv-файла с валютами (или дозагрузка недостающих месяцев).
+        Месяцы загружаются параллельно, а записываются в файл по порядку.
+        Рядом с csv-файлом сохраняется бинарный файл курсов для быстрого чтения (Rate_Table.load)."""
+        csv_path = self.data_dir + "/" + csv_name
+        present_months = Currency_Values_Creator.get_present_months(csv_path) if self.is_incremental else None
+        if present_months is None:
+            self.make_dir_if_needed()
+            present_months = set()
+        months = [month for month in self.get_months() if month not in present_months]
+        try:
+            if len(months) > 0:
+                self.write_months(csv_path, months, len(present_months) > 0)
+        finally:
+            self.fetcher.close()
+        Rate_Table.load(csv_path)
 
 
 if __name__ == '__main__':
-    values_creator = Currency_Values_Creator("api_data", "currency_csv.csv")
+    is_incremental = input("Догрузить только недостающие месяцы (Да / Нет): ") == "Да"
+    values_creator = Currency_Values_Creator("api_data", "currency_csv.csv", is_incremental=is_incremental)
@@ -0,0 +1,102 @@
+import contextlib, tempfile
+from unittest import TestCase
+from CurrencyValues import *
+from CBRStub import CBR_Stub, stub_currencies
+from RateTable import Rate_Table
+
+
+def get_stub_urls(stub: CBR_Stub, months_count: int) -> list:
+    return [f"{stub.url}?date_req=01/{month % 12 + 1:02}/{2003 + month // 12}" for month in range(months_count)]
+
+
+class CurrencyValuesUnitTests(TestCase):
+    def test_fetch_all_keeps_order(self):
+        with CBR_Stub(delay=0.01) as stub:
+            fetcher = Rates_Fetcher(concurrency=4)
+            responses = list(fetcher.fetch_all(get_stub_urls(stub, 24)))
+            fetcher.close()
+        self.assertEqual(len(responses), 24)
+        self.assertIn(b'Date="01.01.2003"', responses[0])
+        self.assertIn(b'Date="01.12.2004"', responses[23])
+
+    def test_fetch_retries_server_errors(self):
+        with CBR_Stub(failures=2) as stub:
+            fetcher = Rates_Fetcher(concurrency=2, backoff=0)
+            responses = list(fetcher.fetch_all(get_stub_urls(stub, 3)))
+            fetcher.close()
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(stub.requests_count, 9)
+
+    def test_fetch_gives_up_after_retries(self):
+        with CBR_Stub(failures=5) as stub:
+            fetcher = Rates_Fetcher(retries=1, backoff=0)
+            with self.assertRaises(requests.HTTPError):
+                fetcher.fetch(get_stub_urls(stub, 1)[0])
+            fetcher.close()
+        self.assertEqual(stub.requests_count, 2)
+
+    def test_create_csv_from_stub(self):
+        with CBR_Stub() as stub, tempfile.TemporaryDirectory() as temp_dir:
+            data_dir = os.path.join(temp_dir, "api_data")
+            with contextlib.redirect_stdout(io.StringIO()):
+                Currency_Values_Creator(data_dir, "currency_csv.csv", stub.url)
+            rate_table = Rate_Table.from_csv(os.path.join(data_dir, "currency_csv.csv"))
+            self.assertEqual(sorted(os.listdir(data_dir)), ["currency_csv.csv", "currency_csv.rates", "http_cache"])
+        now = datetime.now()
+        self.assertEqual(stub.requests_count, (now.year - 2003) * 12 + now.month)
+        self.assertEqual(rate_table.get_rate(2003, 2, "KZT"), round(20.7 * 1.002 / 100, 10))
+        self.assertEqual(rate_table.get_rate(2004, 1, "BYR"), round(15.0 * 1.051 / 1000, 10))
+
+    def test_incremental_refresh_fetches_only_missing_months(self):
+        with CBR_Stub() as stub, tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "currency_csv.csv")
+            with contextlib.redirect_stdout(io.StringIO()):
+                Currency_Values_Creator(temp_dir, "currency_csv.csv", stub.url, Rates_Fetcher())
+                with open(csv_path, encoding="utf-8-sig") as csv_file:
+                    full_lines = csv_file.readlines()
+                with open(csv_path, "w", encoding="utf-8-sig") as csv_file:
+                    csv_file.writelines(full_lines[:-len(stub_currencies) * 2])
+                full_count = stub.requests_count
+                Currency_Values_Creator(temp_dir, "currency_csv.csv", stub.url, Rates_Fetcher(), True)
+                self.assertEqual(stub.requests_count, full_count + 2)
+                Currency_Values_Creator(temp_dir, "currency_csv.csv", stub.url, Rates_Fetcher(), True)
+                self.assertEqual(stub.requests_count, full_count + 2)
+            with open(csv_path, encoding="utf-8-sig") as csv_file:
+                self.assertEqual(csv_file.readlines(), full_lines)
+            self.assertEqual(sorted(os.listdir(temp_dir)), ["currency_csv.csv", "currency_csv.rates"])
+
+    def test_second_build_is_served_from_cache(self):
+        with CBR_Stub() as stub, tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "currency_csv.csv")
+            with contextlib.redirect_stdout(io.StringIO()):
+                Currency_Values_Creator(temp_dir, "currency_csv.csv", stub.url)
+                with open(csv_path, "rb") as csv_file:
+                    full_data = csv_file.read()
+                full_count = stub.requests_count
+                Currency_Values_Creator(temp_dir, "currency_csv.csv", stub.url)
+            with open(csv_path, "rb") as csv_file:
+                self.assertEqual(csv_file.read(), full_data)
+        self.assertEqual(stub.requests_count, full_count)
+
+    def test_cache_drops_corrupted_and_expired_responses(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = Response_Cache(temp_dir)
+            cache.put("a", b"first")
+            cache.put("b", b"second", ttl=-1)
+            self.assertEqual(cache.get("a"), b"first")
+            self.assertIsNone(cache.get("b"))
+            with open(cache.get_object_path(hashlib.sha256(b"first").hexdigest()), "wb") as object_file:
+                object_file.write(b"broken")
+            self.assertIsNone(cache.get("a"))
+
+    def test_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = Response_Cache(temp_dir, max_bytes=10, validator=lambda data: data != b"bad")
+            cache.put("a", b"aaaa")
+            cache.put("b", b"bbbb")
+            os.utime(cache.get_entry_path("a"), (0, 0))
+            os.utime(cache.get_entry_path("b"), (1, 1))
+            cache.put("c", b"cccc")
+            cache.put("d", b"bad")
+            self.assertEqual([cache.get(url) for url in "abcd"], [None, b"bbbb", b"cccc", None])
+            self.assertEqual(len(os.listdir(os.path.join(temp_dir, "objects"))), 2)
@@ -0,0 +1,299 @@
+import csv, math
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from RateTable import Rate_Table
+from CompressedFiles import open_text
+
+
+def get_middle_salary_value(salary_from: str, salary_to: str) -> (float or None):
+    """Посчитать среднюю зарплату по левому и правому краю (если одного края нет - берется другой).
+    Args:
+        salary_from (str): левый край зарплаты.
+        salary_to (str): правый край зарплаты.
+    Returns:
+        float or None: средняя зарплата в валюте вакансии или None, если оба края не числа.
+    >>> get_middle_salary_value("10", "20")
+    15.0
+    >>> get_middle_salary_value("", "20.7")
+    20.0
+    >>> get_middle_salary_value("10.5", "")
+    10.0
+    >>> get_middle_salary_value("", "") is None
+    True
+    """
+    try:
+        sal_from = math.floor(float(salary_from))
+    except (ValueError, OverflowError):
+        sal_from = None
+    try:
+        sal_to = math.floor(float(salary_to))
+    except (ValueError, OverflowError):
+        sal_to = sal_from
+    if sal_from is None:
+        sal_from = sal_to
+    if sal_from is None:
+        return None
+    return (sal_from + sal_to) / 2
+
+
+class Currency_Histogram:
+    """Агрегатор: количество вакансий по каждой валюте (для правила "валюта встречается > 5000 раз").
+    Attributes:
+        currency_to_count (dict): валюта к кол-ву вакансий.
+    """
+    min_currency_count = 5000
+
+    def __init__(self):
+        """Инициализация пустой гистограммы."""
+        self.currency_to_count = {}
+
+    def add(self, currency: str) -> None:
+        """Учесть одну вакансию.
+        Args:
+            currency (str): валюта вакансии.
+        """
+        self.currency_to_count[currency] = self.currency_to_count.get(currency, 0) + 1
+
+    def merge(self, other) -> None:
+        """Добавить к себе частичный результат другого агрегатора.
+        Args:
+            other (Currency_Histogram): частичный результат.
+        """
+        for currency, count in other.currency_to_count.items():
+            self.currency_to_count[currency] = self.currency_to_count.get(currency, 0) + count
+
+    def get_valid_currencies(self) -> set:
+        """Получить множество валют, которые встречаются чаще, чем min_currency_count раз.
+        Returns:
+            set: подходящие валюты.
+        """
+        return {currency for currency, count in self.currency_to_count.items()
+                if count > Currency_Histogram.min_currency_count}
+
+
+class Year_Stats:
+    """Агрегатор данных по годам. Частичные суммы хранятся по ключу (год, валюта),
+    чтобы правило по валютам можно было применить уже после прохода по файлу.
+    Attributes:
+        year_cur_to_stats (dict): (год, валюта) к [кол-во, сумма, кол-во нужных, сумма нужных].
+    """
+    def __init__(self):
+        """Инициализация пустого агрегатора."""
+        self.year_cur_to_stats = {}
+
+    def add(self, year: int, currency: str, salary: float, is_needed: bool) -> None:
+        """Учесть одну вакансию с уже переведенной в рубли зарплатой.
+        Args:
+            year (int): год публикации.
+            currency (str): валюта вакансии.
+            salary (float): зарплата в рублях.
+            is_needed (bool): подходит ли вакансия под профессию.
+        """
+        stats = self.year_cur_to_stats.get((year, currency))
+        if stats is None:
+            stats = self.year_cur_to_stats[(year, currency)] = [0, 0, 0, 0]
+        stats[0] += 1
+        stats[1] += salary
+        if is_needed:
+            stats[2] += 1
+            stats[3] += salary
+
+    def merge(self, other) -> None:
+        """Добавить к себе частичный результат другого агрегатора.
+        Args:
+            other (Year_Stats): частичный результат.
+        """
+        for key, other_stats in other.year_cur_to_stats.items():
+            stats = self.year_cur_to_stats.setdefault(key, [0, 0, 0, 0])
+            for i in range(4):
+                stats[i] += other_stats[i]
+
+    def get_year_data(self, valid_currencies: set) -> (dict, dict, dict, dict):
+        """Вторая фаза: свернуть частичные суммы по подходящим валютам.
+        Args:
+            valid_currencies (set): валюты, прошедшие правило "> 5000".
+        Returns:
+            (dict, dict, dict, dict): Год к кол-ву, год к зарплате, год к кол-ву нужных проф. год к зарплате нужных проф.
+        """
+        year_to_stats = {}
+        for (year, currency), stats in self.year_cur_to_stats.items():
+            if currency in valid_currencies:
+                year_stats = year_to_stats.setdefault(year, [0, 0, 0, 0])
+                for i in range(4):
+                    year_stats[i] += stats[i]
+        year_to_count, year_to_salary, year_to_count_needed, year_to_salary_needed = {}, {}, {}, {}
+        for year in sorted(year_to_stats.keys()):
+            count, salary_sum, needed_count, needed_sum = year_to_stats[year]
+            year_to_count[year] = count
+            year_to_salary[year] = math.floor(salary_sum / count) if count != 0 else 0
+            year_to_count_needed[year] = needed_count
+            year_to_salary_needed[year] = math.floor(needed_sum / needed_count) if needed_count != 0 else 0
+        return year_to_count, year_to_salary, year_to_count_needed, year_to_salary_needed
+
+
+class Area_Stats:
+    """Агрегатор данных по городам. Частичные суммы хранятся по ключу (город, валюта).
+    Attributes:
+        area_cur_to_stats (dict): (город, валюта) к [кол-во, кол-во с известным курсом, сумма зарплат].
+    """
+    def __init__(self):
+        """Инициализация пустого агрегатора."""
+        self.area_cur_to_stats = {}
+
+    def add(self, area: str, currency: str, salary: (float or None)) -> None:
+        """Учесть одну вакансию.
+        Args:
+            area (str): город.
+            currency (str): валюта вакансии.
+            salary (float or None): зарплата в рублях (None - курса на эту дату нет, вакансия идет только в долю).
+        """
+        stats = self.area_cur_to_stats.get((area, currency))
+        if stats is None:
+            stats = self.area_cur_to_stats[(area, currency)] = [0, 0, 0]
+        stats[0] += 1
+        if salary is not None:
+            stats[1] += 1
+            stats[2] += salary
+
+    def merge(self, other) -> None:
+        """Добавить к себе частичный результат другого агрегатора.
+        Args:
+            other (Area_Stats): частичный результат.
+        """
+        for key, other_stats in other.area_cur_to_stats.items():
+            stats = self.area_cur_to_stats.setdefault(key, [0, 0, 0])
+            for i in range(3):
+                stats[i] += other_stats[i]
+
+    @staticmethod
+    def get_sorted_dict(key_to_salary: dict) -> dict:
+        """Отсортировать словарь по значениям по убыванию и вернуть только 10 ключ-значений.
+        Args:
+            key_to_salary (dict): Неотсортированный словарь.
+        Returns:
+            dict: Отсортированный словарь, в котором только 10 ключ-значений.
+        """
+        return dict(list(sorted(key_to_salary.items(), key=lambda item: item[1], reverse=True))[:10])
+
+    def get_area_data(self, valid_currencies: set) -> (dict, dict):
+        """Вторая фаза: свернуть частичные суммы по подходящим валютам, отбросить города с долей <= 1%.
+        Args:
+            valid_currencies (set): валюты, прошедшие правило "> 5000".
+        Returns:
+            (dict, dict): город к средней зарплате (топ-10), город к доле вакансий (топ-10).
+        """
+        area_to_stats = {}
+        for (area, currency), stats in self.area_cur_to_stats.items():
+            if currency in valid_currencies:
+                area_stats = area_to_stats.setdefault(area, [0, 0, 0])
+                for i in range(3):
+                    area_stats[i] += stats[i]
+        vacs_count = sum(stats[0] for stats in area_to_stats.values())
+        area_to_middle_salary = {}
+        area_to_piece = {}
+        for area, (count, salary_count, salary_sum) in area_to_stats.items():
+            if count / vacs_count > 0.01:
+                area_to_middle_salary[area] = math.floor(salary_sum / salary_count) if salary_count != 0 else 0
+                area_to_piece[area] = round(count / vacs_count, 4)
+        return Area_Stats.get_sorted_dict(area_to_middle_salary), Area_Stats.get_sorted_dict(area_to_piece)
+
+
+class Fused_Scan:
+    """Единый проход по большому csv-файлу, который кормит все агрегаторы сразу
+    (гистограмма валют, данные по годам, данные по городам). Правило "> 5000" применяется
+    во второй, дешевой фазе - к уже свернутым частичным суммам.
+    Объект можно передать в Image_Creator как обработчик и по годам, и по городам.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+    """
+    def __init__(self, csv_start: CSV_Start):
+        """Инициализация класса Fused_Scan. Проход по файлу и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        """
+        self.csv_start = csv_start
+        self.currency_histogram = Currency_Histogram()
+        self.year_stats = Year_Stats()
+        self.area_stats = Area_Stats()
+        self.scan_file()
+        self.count_result()
+
+    @staticmethod
+    def add_lines(lines, index_of: dict, line_len: int, prof: str, rate_table: Rate_Table,
+                  currency_histogram: Currency_Histogram, year_stats: Year_Stats, area_stats: Area_Stats) -> None:
+        """Прогнать строки через все агрегаторы. Вынесено в статический метод, чтобы им могли
+        пользоваться и другие читатели (например, по частям файла).
+        Args:
+            lines (iterable): строки csv-файла без первой строки.
+            index_of (dict): поле к индексу в строке.
+            line_len (int): длина правильной строки.
+            prof (str): название профессии.
+            rate_table (Rate_Table): таблица курсов валют.
+            currency_histogram (Currency_Histogram): агрегатор валют.
+            year_stats (Year_Stats): агрегатор по годам.
+            area_stats (Area_Stats): агрегатор по городам.
+        """
+        name_index = index_of["name"]
+        from_index = index_of["salary_from"]
+        to_index = index_of["salary_to"]
+        cur_index = index_of["salary_currency"]
+        area_index = index_of["area_name"]
+        date_index = index_of["published_at"]
+        for line in lines:
+            if len(line) != line_len:
+                continue
+            currency = line[cur_index]
+            currency_histogram.add(currency)
+            middle_salary = get_middle_salary_value(line[from_index], line[to_index])
+            if middle_salary is None:
+                continue
+            published_at = line[date_index]
+            rate = rate_table.get_rate_by_date(published_at, currency)
+            if math.isnan(rate):
+                area_stats.add(line[area_index], currency, None)
+                continue
+            salary = round(rate * middle_salary, 1)
+            year_stats.add(int(published_at[:4]), currency, salary, line[name_index].find(prof) > -1)
+            area_stats.add(line[area_index], currency, salary)
+
+    def scan_file(self) -> None:
+        """Первая фаза: один проход по файлу."""
+        with open_text(self.csv_start.input_values.file_name) as csv_file:
+            file = csv.reader(csv_file)
+            next(file)
+            Fused_Scan.add_lines(file, self.csv_start.index_of, self.csv_start.start_line_len,
+                                 self.csv_start.input_values.prof, self.csv_start.values_reader.rate_table,
+                                 self.currency_histogram, self.year_stats, self.area_stats)
+        self.csv_start.input_values.timer.write_time("FUSED > Файл прочитан за один проход")
+
+    def count_result(self) -> None:
+        """Вторая фаза: правило по валютам и итоговые словари."""
+        self.csv_start.all_currencies = self.currency_histogram.currency_to_count
+        valid_currencies = self.currency_histogram.get_valid_currencies()
+        self.year_data = self.year_stats.get_year_data(valid_currencies)
+        self.area_to_middle_salary, self.area_to_piece = self.area_stats.get_area_data(valid_currencies)
+
+    def get_year_data(self) -> (dict, dict, dict, dict):
+        """Данные по годам для Image_Creator.get_year_queue_data.
+        Returns:
+            (dict, dict, dict, dict): Год к кол-ву, год к зарплате, год к кол-ву нужных проф. год к зарплате нужных проф.
+        """
+        return tuple(dict(data) for data in self.year_data)
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    fused_scan = Fused_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_fused.png", fused_scan, fused_scan)
+    report = Report_PDF_MP("report_fused.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from FusedScan import *
+
+
+def get_test_aggregators(lines: list, prof: str = "Программист") -> (Currency_Histogram, Year_Stats, Area_Stats):
+    index_of = {"name": 0, "salary_from": 1, "salary_to": 2, "salary_currency": 3, "area_name": 4, "published_at": 5}
+    rate_table = Rate_Table.from_rows([(2022, 1, "RUR", 1.0), (2022, 1, "USD", 70.0), (2023, 1, "RUR", 1.0)])
+    aggregators = (Currency_Histogram(), Year_Stats(), Area_Stats())
+    Fused_Scan.add_lines(lines, index_of, 6, prof, rate_table, *aggregators)
+    return aggregators
+
+
+class FusedScanUnitTests(TestCase):
+    def test_get_middle_salary_value_with_both_sides(self):
+        self.assertEqual(get_middle_salary_value("10", "20"), 15.0)
+
+    def test_get_middle_salary_value_without_left_side(self):
+        self.assertEqual(get_middle_salary_value("", "20.7"), 20.0)
+
+    def test_get_middle_salary_value_without_right_side(self):
+        self.assertEqual(get_middle_salary_value("10.5", ""), 10.0)
+
+    def test_get_middle_salary_value_without_sides(self):
+        self.assertIsNone(get_middle_salary_value("", "abc"))
+
+    def test_currency_histogram_counts_only_full_lines(self):
+        histogram, _, _ = get_test_aggregators([["a", "1", "2", "RUR", "Мск", "2022-01-01"],
+                                                ["a", "", "", "USD", "Мск", "2022-01-01"],
+                                                ["a", "1", "2", "USD"]])
+        self.assertEqual(histogram.currency_to_count, {"RUR": 1, "USD": 1})
+
+    def test_year_stats_converts_salary(self):
+        _, year_stats, _ = get_test_aggregators([["Программист", "100", "200", "USD", "Мск", "2022-01-01"],
+                                                 ["Тестировщик", "100", "", "RUR", "Мск", "2022-01-01"]])
+        self.assertEqual(year_stats.get_year_data({"RUR", "USD"}),
+                         ({2022: 2}, {2022: 5300}, {2022: 1}, {2022: 10500}))
+
+    def test_year_stats_skips_invalid_currencies_in_second_phase(self):
+        _, year_stats, _ = get_test_aggregators([["Программист", "100", "200", "USD", "Мск", "2022-01-01"],
+                                                 ["Тестировщик", "100", "", "RUR", "Мск", "2022-01-01"]])
+        self.assertEqual(year_stats.get_year_data({"RUR"}), ({2022: 1}, {2022: 100}, {2022: 0}, {2022: 0}))
+
+    def test_year_stats_skips_vacancies_without_rate(self):
+        _, year_stats, area_stats = get_test_aggregators([["a", "100", "200", "USD", "Екб", "2023-01-01"],
+                                                          ["a", "100", "200", "RUR", "Мск", "2023-01-01"]])
+        self.assertEqual(year_stats.get_year_data({"RUR", "USD"})[0], {2023: 1})
+        self.assertEqual(area_stats.get_area_data({"RUR", "USD"}), ({"Мск": 150, "Екб": 0}, {"Екб": 0.5, "Мск": 0.5}))
+
+    def test_merge_gives_the_same_result_as_one_pass(self):
+        lines = [["Программист", str(i), str(i * 2), "RUR", "Город " + str(i % 3), "2022-01-01"] for i in range(30)]
+        _, year_full, area_full = get_test_aggregators(lines)
+        histogram, year_stats, area_stats = get_test_aggregators(lines[:10])
+        for part in get_test_aggregators(lines[10:20]), get_test_aggregators(lines[20:]):
+            histogram.merge(part[0])
+            year_stats.merge(part[1])
+            area_stats.merge(part[2])
+        self.assertEqual(histogram.currency_to_count, {"RUR": 30})
+        self.assertEqual(year_stats.get_year_data({"RUR"}), year_full.get_year_data({"RUR"}))
+        self.assertEqual(area_stats.get_area_data({"RUR"}), area_full.get_area_data({"RUR"}))
+
+    def test_area_stats_drops_small_areas(self):
+        area_stats = Area_Stats()
+        for _ in range(200):
+            area_stats.add("Мск", "RUR", 100)
+        area_stats.add("Екб", "RUR", 1000)
+        self.assertEqual(area_stats.get_area_data({"RUR"}), ({"Мск": 100}, {"Мск": 0.995}))
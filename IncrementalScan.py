@@ -0,0 +1,169 @@
+import csv, os, json, hashlib
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Fused_Scan
+from ColumnCache import get_file_fingerprint
+from CompressedFiles import get_compression
+
+checksum_block_size = 4 << 20
+
+
+def get_prefix_checksums(file_name: str, offset: int, known_checksums: list = (), known_offset: int = 0) -> list:
+    """Контрольные суммы всего уже обработанного начала файла по блокам checksum_block_size
+    (последний блок может быть неполным). sha1 считается быстрее, чем разбирается csv,
+    поэтому проверка начала файла целиком обходится дешевле разбора даже небольшого хвоста.
+    Args:
+        file_name (str): путь до файла.
+        offset (int): длина начала файла в байтах.
+        known_checksums (list): уже проверенные суммы более короткого начала этого же файла
+            (полные блоки из них не читаются заново).
+        known_offset (int): длина начала, для которого посчитаны known_checksums.
+    Returns:
+        list: sha1 блоков в hex-виде.
+    """
+    full_blocks = min(known_offset, offset) // checksum_block_size
+    checksums = list(known_checksums[:full_blocks])
+    with open(file_name, "rb") as file:
+        file.seek(full_blocks * checksum_block_size)
+        position = file.tell()
+        while position < offset:
+            block = file.read(min(checksum_block_size, offset - position))
+            if not block:
+                break
+            checksums.append(hashlib.sha1(block).hexdigest())
+            position += len(block)
+    return checksums
+
+
+class Incremental_Scan(Fused_Scan):
+    """Вариант Fused_Scan для выгрузки, которая только дописывается в конец. После прохода
+    сохраняется состояние: байтовое смещение конца последней целой записи, контрольные суммы
+    всех блоков начала файла до этого смещения и частичные суммы агрегаторов (валюты, годы, города).
+    В следующий раз разбирается только дописанный хвост, его суммы добавляются к сохраненным (merge).
+    Если начало файла, первая строка, профессия или файл валют изменились - файл читается заново.
+    Недописанная последняя запись (без перевода строки) попадает в отчет, но не в состояние.
+    Сжатые файлы читаются целиком каждый раз: смещение в них не соответствует смещению в csv.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        state_dir (str): папка для файлов состояния.
+    """
+    version = 2
+
+    def __init__(self, csv_start: CSV_Start, state_dir: str = "incremental"):
+        """Инициализация класса Incremental_Scan. Загрузка состояния, разбор хвоста и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+            state_dir (str): папка для файлов состояния.
+        """
+        file_name = csv_start.input_values.file_name
+        self.state_path = os.path.join(state_dir, hashlib.sha1(os.path.abspath(file_name).encode()).hexdigest()[:20]
+                                       + ".json")
+        self.key = {"version": Incremental_Scan.version, "prof": csv_start.input_values.prof,
+                    "start_line": csv_start.start_line,
+                    "rates": get_file_fingerprint(csv_start.values_reader.csv_path)}
+        self.offset = 0
+        self.checksums = []
+        self.checksums_offset = 0
+        super().__init__(csv_start)
+
+    def load_state(self) -> bool:
+        """Загрузить сохраненное состояние, если оно подходит к файлу.
+        Returns:
+            bool: загружено ли состояние (False - файл нужно читать с начала).
+        """
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, "r", encoding="utf-8") as state_file:
+            state = json.load(state_file)
+        file_name = self.csv_start.input_values.file_name
+        if state["key"] != self.key or state["offset"] > os.path.getsize(file_name) \
+                or state["checksums"] != get_prefix_checksums(file_name, state["offset"]):
+            return False
+        self.offset = state["offset"]
+        self.checksums = state["checksums"]
+        self.checksums_offset = self.offset
+        self.currency_histogram.currency_to_count = dict(state["currencies"])
+        self.year_stats.year_cur_to_stats = {(year, currency): stats for year, currency, stats in state["years"]}
+        self.area_stats.area_cur_to_stats = {(area, currency): stats for area, currency, stats in state["areas"]}
+        return True
+
+    def save_state(self) -> None:
+        """Записать состояние во временный файл и атомарно переименовать его."""
+        state = {"key": self.key, "offset": self.offset,
+                 "checksums": get_prefix_checksums(self.csv_start.input_values.file_name, self.offset,
+                                                   self.checksums, self.checksums_offset),
+                 "currencies": list(self.currency_histogram.currency_to_count.items()),
+                 "years": [[year, currency, stats] for (year, currency), stats in self.year_stats.year_cur_to_stats.items()],
+                 "areas": [[area, currency, stats] for (area, currency), stats in self.area_stats.area_cur_to_stats.items()]}
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        temp_path = self.state_path + f".tmp{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
+
+    def read_tail(self, rest: list):
+        """Поток строк файла после сохраненного смещения. Строки отдаются только целыми записями
+        (запись закончилась переводом строки и в ней четное кол-во кавычек), смещение сдвигается
+        за каждую отданную запись. Недописанная последняя запись складывается в rest.
+        Args:
+            rest (list): куда положить строки недописанной записи.
+        Returns:
+            generator: строки файла (первая строка файла пропускается).
+        """
+        with open(self.csv_start.input_values.file_name, "rb") as file:
+            file.seek(self.offset)
+            is_header = self.offset == 0
+            record, quotes = [], 0
+            for line in file:
+                record.append(line)
+                quotes += line.count(b'"')
+                if quotes % 2 != 0 or not line.endswith(b"\n"):
+                    continue
+                self.offset += sum(len(record_line) for record_line in record)
+                if is_header:
+                    is_header = False
+                else:
+                    yield from (record_line.decode("utf-8") for record_line in record)
+                record, quotes = [], 0
+            rest.extend(record_line.decode("utf-8") for record_line in record)
+
+    def add_tail_lines(self, lines) -> None:
+        """Прогнать строки через агрегаторы.
+        Args:
+            lines (iterable): строки csv-файла без первой строки.
+        """
+        Fused_Scan.add_lines(csv.reader(lines), self.csv_start.index_of, self.csv_start.start_line_len,
+                             self.csv_start.input_values.prof, self.csv_start.values_reader.rate_table,
+                             self.currency_histogram, self.year_stats, self.area_stats)
+
+    def scan_file(self) -> None:
+        """Первая фаза: разбор только новых записей и сохранение состояния."""
+        timer = self.csv_start.input_values.timer
+        if get_compression(self.csv_start.input_values.file_name):
+            super().scan_file()
+            return
+        if self.load_state():
+            timer.write_time(f"INCREMENTAL > Состояние загружено, хвост с байта {self.offset}")
+        rest = []
+        self.add_tail_lines(self.read_tail(rest))
+        self.save_state()
+        self.add_tail_lines(rest)
+        timer.write_time("INCREMENTAL > Новые записи разобраны, состояние сохранено")
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    incremental_scan = Incremental_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_incremental.png", incremental_scan, incremental_scan)
+    report = Report_PDF_MP("report_incremental.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
@@ -0,0 +1,64 @@
+import os, shutil, tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from IncrementalScan import *
+from Benchmark import write_synthetic_csv, write_currency_csv
+
+
+class IncrementalScanUnitTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.temp_dir, "vacancies.csv")
+        self.state_dir = os.path.join(self.temp_dir, "incremental")
+        write_currency_csv(os.path.join(self.temp_dir, "currency.csv"))
+        write_synthetic_csv(self.file_name, 8000)
+        with open(self.file_name, "rb") as csv_file:
+            self.data = csv_file.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def scan(self, scan_class, **kwargs) -> Fused_Scan:
+        timer = Timer("TEST", 0)
+        csv_start = CSV_Start(InputCorrect(self.file_name, "Программист", timer),
+                              Currency_Values_Reader(self.temp_dir, "currency.csv"), False)
+        return scan_class(csv_start, **kwargs)
+
+    def assertSameResult(self, first: Fused_Scan, second: Fused_Scan):
+        self.assertEqual(first.get_year_data(), second.get_year_data())
+        self.assertEqual((first.area_to_middle_salary, first.area_to_piece),
+                         (second.area_to_middle_salary, second.area_to_piece))
+
+    def test_appended_tail_is_merged(self):
+        cut = len(self.data) // 2 + 7
+        with open(self.file_name, "wb") as csv_file:
+            csv_file.write(self.data[:cut])
+        self.assertSameResult(self.scan(Incremental_Scan, state_dir=self.state_dir), self.scan(Fused_Scan))
+        with open(self.file_name, "ab") as csv_file:
+            csv_file.write(self.data[cut:])
+        incremental_scan = self.scan(Incremental_Scan, state_dir=self.state_dir)
+        self.assertGreater(len(incremental_scan.year_data[0]), 0)
+        self.assertSameResult(incremental_scan, self.scan(Fused_Scan))
+        self.assertEqual(incremental_scan.offset, len(self.data))
+
+    def test_changed_prefix_is_read_again(self):
+        self.scan(Incremental_Scan, state_dir=self.state_dir)
+        with open(self.file_name, "wb") as csv_file:
+            csv_file.write(self.data.replace(b"RUR", b"USD", 100))
+        self.assertSameResult(self.scan(Incremental_Scan, state_dir=self.state_dir), self.scan(Fused_Scan))
+
+    def test_same_length_edit_in_the_middle_is_read_again(self):
+        self.scan(Incremental_Scan, state_dir=self.state_dir)
+        middle = self.data.index(b"RUR", len(self.data) // 2)
+        with open(self.file_name, "r+b") as csv_file:
+            csv_file.seek(middle)
+            csv_file.write(b"USD")
+        self.assertSameResult(self.scan(Incremental_Scan, state_dir=self.state_dir), self.scan(Fused_Scan))
+
+    @patch("IncrementalScan.checksum_block_size", 1000)
+    def test_prefix_checksums_reuse_known_blocks(self):
+        checksums = get_prefix_checksums(self.file_name, len(self.data))
+        self.assertEqual(len(checksums), len(self.data) // 1000 + 1)
+        known = ["known"] * len(checksums)
+        self.assertEqual(get_prefix_checksums(self.file_name, len(self.data), known, 5500),
+                         ["known"] * 5 + checksums[5:])
@@ -0,0 +1,164 @@
+import os, time, tracemalloc
+import multiprocessing as mp
+from prettytable import PrettyTable
+
+from Tracing import tracer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ignored_traces = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib.*"),
+                  tracemalloc.Filter(False, "<unknown>"))
+
+
+def get_rss_mb() -> float:
+    """Текущий RSS процесса (по /proc/self/statm, а где его нет - пиковый RSS из getrusage;
+    без модуля resource, например в Windows, - 0).
+    Returns:
+        float: RSS в МБ.
+    """
+    try:
+        with open("/proc/self/statm") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Memory_Profiler:
+    """Учет памяти по этапам (включается явно, по умолчанию ничего не делает). На границе этапа
+    (checkpoint) записываются: текущий и пиковый объем памяти под tracemalloc с прошлой границы,
+    места с наибольшими выделениями и RSS процесса. Записи идут в трассу Tracing.tracer
+    (мгновенное событие + счетчик для Perfetto), поэтому записи из воркеров приходят в основной
+    процесс вместе с их интервалами.
+    Включенный учет передается дочерним процессам через переменную окружения MEMORY_PROFILE
+    (при fork состояние наследуется само, при spawn учет включается при импорте модуля).
+    Attributes:
+        is_enabled (bool): включен ли учет.
+        top_count (int): сколько мест выделения памяти записывать.
+    """
+    environment_name = "MEMORY_PROFILE"
+
+    def __init__(self):
+        """Инициализация класса Memory_Profiler. Учет выключен, если это не дочерний процесс
+        процесса с включенным учетом."""
+        self.is_enabled = False
+        self.top_count = 5
+        if os.environ.get(Memory_Profiler.environment_name) and mp.parent_process() is not None:
+            self.start(Memory_Profiler.get_top_count(os.environ[Memory_Profiler.environment_name]))
+
+    @staticmethod
+    def get_top_count(value: str) -> int:
+        """Кол-во мест выделения памяти из значения переменной окружения.
+        Args:
+            value (str): значение переменной.
+        Returns:
+            int: кол-во мест (по умолчанию 5).
+        >>> Memory_Profiler.get_top_count("10"), Memory_Profiler.get_top_count("0"), Memory_Profiler.get_top_count("1")
+        (10, 0, 5)
+        """
+        return int(value) if value.isdigit() and int(value) != 1 else 5
+
+    def start(self, top_count: int) -> None:
+        """Включить учет в текущем процессе (без трассировки).
+        Args:
+            top_count (int): сколько мест выделения памяти записывать.
+        """
+        self.is_enabled = True
+        self.top_count = top_count
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def enable(self, top_count: int = 5) -> None:
+        """Включить учет памяти (и трассировку, если она еще не включена).
+        Args:
+            top_count (int): сколько мест выделения памяти записывать.
+        """
+        os.environ[Memory_Profiler.environment_name] = str(top_count)
+        self.start(top_count)
+        if not tracer.is_enabled:
+            tracer.enable()
+
+    def enable_from_environment(self) -> bool:
+        """Включить учет, если задана переменная окружения MEMORY_PROFILE (значение - кол-во мест выделения,
+        0 - без мест выделения, 1 или не число - 5 мест).
+        Returns:
+            bool: включен ли учет.
+        """
+        value = os.environ.get(Memory_Profiler.environment_name)
+        if value:
+            self.enable(Memory_Profiler.get_top_count(value))
+        return self.is_enabled
+
+    def get_top_sites(self) -> list:
+        """Места с наибольшим объемом живых выделений памяти (без выделений самого импорта модулей).
+        Снимок всех выделений - самая дорогая часть учета, при top_count = 0 он не делается.
+        Returns:
+            list: строки вида "файл:строка размер_КБ".
+        """
+        if self.top_count == 0:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignored_traces)
+        return [f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno} {stat.size / 1024:.1f} KB"
+                for stat in snapshot.statistics("lineno")[:self.top_count]]
+
+    def checkpoint(self, stage: str) -> None:
+        """Граница этапа: записать память этапа и сбросить пик tracemalloc.
+        Args:
+            stage (str): название этапа (read, filter, aggregate, plot, render и т.д.).
+        """
+        if not self.is_enabled or not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        rss = get_rss_mb()
+        ts = time.perf_counter_ns() / 1000
+        tracer.append({"name": stage, "cat": "memory", "ph": "i", "s": "p", "ts": ts, "pid": os.getpid(),
+                       "tid": os.getpid(), "args": {"process": mp.current_process().name,
+                                                    "traced_mb": current / (1 << 20), "peak_mb": peak / (1 << 20),
+                                                    "rss_mb": rss, "top_sites": self.get_top_sites()}})
+        tracer.append({"name": "memory", "ph": "C", "ts": ts, "pid": os.getpid(),
+                       "args": {"traced_mb": current / (1 << 20), "rss_mb": rss}})
+        tracemalloc.reset_peak()
+
+    @staticmethod
+    def get_rows(events: list) -> list:
+        """Записи учета памяти из событий трассы.
+        Args:
+            events (list): события трассы.
+        Returns:
+            list: словари с процессом, этапом и замерами в порядке времени.
+        """
+        memory_events = sorted((event for event in events if event.get("cat") == "memory"),
+                               key=lambda event: event["ts"])
+        return [dict(event["args"], stage=event["name"]) for event in memory_events]
+
+    @staticmethod
+    def get_table(rows: list) -> PrettyTable:
+        """Таблица учета памяти по этапам.
+        Args:
+            rows (list): записи учета памяти.
+        Returns:
+            PrettyTable: таблица.
+        """
+        table = PrettyTable(["Процесс", "Этап", "Память, МБ", "Пик этапа, МБ", "RSS, МБ", "Больше всего выделяют"],
+                            align="l")
+        for row in rows:
+            table.add_row([row["process"], row["stage"], f"{row['traced_mb']:.1f}", f"{row['peak_mb']:.1f}",
+                           f"{row['rss_mb']:.1f}", "\n".join(row["top_sites"])])
+        return table
+
+    def write_report(self, file_name: str) -> None:
+        """Собрать записи основного процесса и воркеров и сохранить таблицу в текстовый файл.
+        Args:
+            file_name (str): путь до файла отчета.
+        """
+        if not self.is_enabled:
+            return
+        with open(file_name, "w", encoding="utf-8") as report_file:
+            report_file.write(Memory_Profiler.get_table(Memory_Profiler.get_rows(tracer.collect())).get_string())
+
+
+memory_profiler = Memory_Profiler()
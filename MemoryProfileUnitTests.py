@@ -0,0 +1,67 @@
+import os, tempfile, tracemalloc
+from unittest import TestCase
+from unittest.mock import patch
+from MemoryProfile import *
+from WorkerPool import Worker_Pool
+
+
+def allocate_in_worker(size: int) -> int:
+    data = [0] * size
+    memory_profiler.checkpoint("aggregate")
+    return len(data)
+
+
+class MemoryProfileUnitTests(TestCase):
+    def tearDown(self):
+        tracer.collect()
+        tracer.is_enabled = False
+        tracer.queue = None
+        tracer.events = []
+        memory_profiler.is_enabled = False
+        os.environ.pop(Memory_Profiler.environment_name, None)
+        tracemalloc.stop()
+
+    def test_disabled_profiler_records_nothing(self):
+        memory_profiler.checkpoint("read")
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(tracer.events, [])
+
+    def test_checkpoint_records_stage_peak(self):
+        memory_profiler.enable(3)
+        data = [str(i) for i in range(100_000)]
+        memory_profiler.checkpoint("read")
+        del data
+        memory_profiler.checkpoint("filter")
+        read, filtered = Memory_Profiler.get_rows(tracer.collect())
+        self.assertEqual((read["stage"], read["process"], filtered["stage"]), ("read", "MainProcess", "filter"))
+        self.assertGreater(read["peak_mb"], 5)
+        self.assertLess(filtered["traced_mb"], read["traced_mb"])
+        self.assertLessEqual(len(read["top_sites"]), 3)
+        self.assertTrue(read["top_sites"][0].startswith("MemoryProfileUnitTests.py:"))
+        self.assertGreater(read["rss_mb"], 0)
+
+    def test_checkpoints_from_worker_processes(self):
+        memory_profiler.enable(0)
+        worker_pool = Worker_Pool(allocate_in_worker, (), 2)
+        for size in (10, 20, 30):
+            worker_pool.put(size)
+        self.assertEqual(sorted(worker_pool.get_results()), [10, 20, 30])
+        rows = Memory_Profiler.get_rows(tracer.collect())
+        self.assertEqual([row["stage"] for row in rows], ["aggregate"] * 3)
+        self.assertNotIn("MainProcess", {row["process"] for row in rows})
+        self.assertEqual(rows[0]["top_sites"], [])
+
+    def test_write_report(self):
+        memory_profiler.enable(1)
+        memory_profiler.checkpoint("render")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "memory_report.txt")
+            memory_profiler.write_report(file_name)
+            with open(file_name, encoding="utf-8") as report_file:
+                report = report_file.read()
+        self.assertIn("render", report)
+        self.assertIn("MainProcess", report)
+
+    def test_rss_without_proc_and_resource(self):
+        with patch("builtins.open", side_effect=OSError), patch("MemoryProfile.resource", None):
+            self.assertEqual(get_rss_mb(), 0.0)
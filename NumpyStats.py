@@ -0,0 +1,183 @@
+import numpy as np
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Currency_Histogram
+from ColumnCache import Cached_Scan
+
+
+class Numpy_Stats:
+    """Векторный движок статистики по годам и городам. Зарплаты, года, коды городов и валют
+    хранятся массивами NumPy; кол-ва, суммы, средние, фильтр 1% и топ-10 считаются через
+    bincount/argpartition. Порядок суммирования повторяет построчный проход (Year_Stats, Area_Stats),
+    поэтому результат совпадает с ним до бита, включая порядок городов с одинаковыми значениями.
+    Attributes:
+        columns (dict): столбцы в формате Column_Cache (name_id, area_id, currency_id, year,
+            middle_salary, salary_rur и словари areas, currencies).
+        is_needed (ndarray): bool-маска вакансий нужной профессии.
+    """
+    def __init__(self, columns: dict, is_needed: np.ndarray):
+        """Инициализация класса Numpy_Stats. Применение правила по валютам.
+        Args:
+            columns (dict): столбцы в формате Column_Cache.
+            is_needed (ndarray): bool-маска вакансий нужной профессии.
+        """
+        self.currencies = [str(currency) for currency in columns["currencies"]]
+        self.areas = columns["areas"]
+        self.currency_id = np.asarray(columns["currency_id"], dtype=np.int64)
+        self.year = np.asarray(columns["year"], dtype=np.int64)
+        self.area_id = np.asarray(columns["area_id"], dtype=np.int64)
+        self.salary_rur = np.asarray(columns["salary_rur"], dtype=np.float64)
+        self.middle_salary = np.asarray(columns["middle_salary"], dtype=np.float64)
+        self.is_needed = np.asarray(is_needed, dtype=bool)
+        currency_counts = np.bincount(self.currency_id, minlength=len(self.currencies))
+        self.currency_to_count = {self.currencies[code]: int(count)
+                                  for code, count in enumerate(currency_counts) if count > 0}
+        self.is_valid_currency = (currency_counts > Currency_Histogram.min_currency_count)[self.currency_id]
+
+    def group_in_order(self, rows: np.ndarray, outer: np.ndarray, weights: list) \
+            -> (np.ndarray, np.ndarray, np.ndarray, list):
+        """Сгруппировать строки по (outer, валюта), а затем свернуть группы по outer в порядке
+        первого появления групп - так же, как словари Year_Stats/Area_Stats.
+        Args:
+            rows (ndarray): номера отфильтрованных строк.
+            outer (ndarray): внешний ключ (год или код города) по отфильтрованным строкам.
+            weights (list): суммируемые столбцы по тем же строкам.
+        Returns:
+            (ndarray, ndarray, ndarray, list): значения outer (по возрастанию), кол-во строк,
+                индекс первого появления, суммы по каждому столбцу weights.
+        """
+        currencies_count = len(self.currencies)
+        keys = outer * currencies_count + self.currency_id[rows]
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(first_index, kind="stable")
+        outer_values, outer_index = np.unique(unique_keys[order] // currencies_count, return_inverse=True)
+        counts = np.bincount(outer_index, weights=np.bincount(inverse)[order], minlength=len(outer_values))
+        outer_first = np.full(len(outer_values), len(keys), dtype=np.int64)
+        np.minimum.at(outer_first, outer_index, first_index[order])
+        totals = []
+        for weight in weights:
+            group_sums = np.bincount(inverse, weights=weight, minlength=len(unique_keys))[order]
+            total = np.zeros(len(outer_values), dtype=np.float64)
+            np.add.at(total, outer_index, group_sums)
+            totals.append(total)
+        return outer_values, counts.astype(np.int64), outer_first, totals
+
+    @staticmethod
+    def get_floor_means(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Средние с округлением вниз, 0 там, где кол-во равно 0.
+        Args:
+            sums (ndarray): суммы.
+            counts (ndarray): кол-ва.
+        Returns:
+            ndarray: целые средние.
+        >>> Numpy_Stats.get_floor_means(np.array([120.0, 0.0, 7.0]), np.array([10, 0, 2])).tolist()
+        [12, 0, 3]
+        """
+        means = np.zeros(len(sums), dtype=np.int64)
+        is_not_zero = counts != 0
+        means[is_not_zero] = np.floor(sums[is_not_zero] / counts[is_not_zero])
+        return means
+
+    @staticmethod
+    def get_top_indexes(values: np.ndarray, first_index: np.ndarray, count: int = 10) -> np.ndarray:
+        """Индексы count наибольших значений по убыванию; при равенстве раньше идет то,
+        что раньше встретилось в файле (как при стабильной сортировке словаря).
+        Args:
+            values (ndarray): значения.
+            first_index (ndarray): порядок первого появления.
+            count (int): сколько значений оставить.
+        Returns:
+            ndarray: индексы.
+        >>> Numpy_Stats.get_top_indexes(np.array([5, 4, 5]), np.array([0, 1, 2]), 2).tolist()
+        [0, 2]
+        >>> Numpy_Stats.get_top_indexes(np.array([1, 3, 2]), np.array([2, 1, 0])).tolist()
+        [1, 2, 0]
+        """
+        if len(values) > count:
+            threshold = values[np.argpartition(-values, count - 1)[count - 1]]
+            candidates = np.flatnonzero(values >= threshold)
+        else:
+            candidates = np.arange(len(values))
+        order = np.lexsort((first_index[candidates], -values[candidates]))
+        return candidates[order][:count]
+
+    def get_year_data(self) -> (dict, dict, dict, dict):
+        """Данные по годам (строки с известным курсом и подходящей валютой).
+        Returns:
+            (dict, dict, dict, dict): Год к кол-ву, год к зарплате, год к кол-ву нужных проф. год к зарплате нужных проф.
+        """
+        rows = np.flatnonzero(~np.isnan(self.salary_rur) & self.is_valid_currency)
+        salary = self.salary_rur[rows]
+        is_needed = self.is_needed[rows]
+        years, counts, _, (sums, needed_counts, needed_sums) = \
+            self.group_in_order(rows, self.year[rows], [salary, is_needed.astype(np.float64),
+                                                       np.where(is_needed, salary, 0.0)])
+        needed_counts = needed_counts.astype(np.int64)
+        middles = Numpy_Stats.get_floor_means(sums, counts)
+        needed_middles = Numpy_Stats.get_floor_means(needed_sums, needed_counts)
+        years = years.tolist()
+        return dict(zip(years, counts.tolist())), dict(zip(years, middles.tolist())), \
+            dict(zip(years, needed_counts.tolist())), dict(zip(years, needed_middles.tolist()))
+
+    def get_area_data(self) -> (dict, dict):
+        """Данные по городам (строки с числовой зарплатой и подходящей валютой), доля > 1%, топ-10.
+        Returns:
+            (dict, dict): город к средней зарплате (топ-10), город к доле вакансий (топ-10).
+        """
+        rows = np.flatnonzero(~np.isnan(self.middle_salary) & self.is_valid_currency)
+        salary = self.salary_rur[rows]
+        has_rate = ~np.isnan(salary)
+        area_codes, counts, first_index, (salary_counts, salary_sums) = \
+            self.group_in_order(rows, self.area_id[rows], [has_rate.astype(np.float64),
+                                                           np.where(has_rate, salary, 0.0)])
+        vacs_count = int(counts.sum())
+        is_big = counts / vacs_count > 0.01
+        area_codes, counts, first_index = area_codes[is_big], counts[is_big], first_index[is_big]
+        middles = Numpy_Stats.get_floor_means(salary_sums[is_big], salary_counts[is_big].astype(np.int64))
+        pieces = np.array([round(count / vacs_count, 4) for count in counts.tolist()], dtype=np.float64)
+        area_to_middle_salary = {str(self.areas[area_codes[i]]): int(middles[i])
+                                 for i in Numpy_Stats.get_top_indexes(middles, first_index)}
+        area_to_piece = {str(self.areas[area_codes[i]]): float(pieces[i])
+                         for i in Numpy_Stats.get_top_indexes(pieces, first_index)}
+        return area_to_middle_salary, area_to_piece
+
+
+class Numpy_Scan(Cached_Scan):
+    """Вариант Cached_Scan, в котором вторая фаза считается движком Numpy_Stats,
+    а не словарями Year_Stats/Area_Stats.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        cache_dir (str): папка для кэша.
+    """
+    def scan_file(self) -> None:
+        """Первая фаза: только открыть (или построить) колоночный кэш."""
+        if not self.cache.is_ready():
+            self.cache.build(self.csv_start)
+            self.csv_start.input_values.timer.write_time("NUMPY > Кэш построен: \"" + self.cache.path + "\"")
+        self.cache.load()
+
+    def count_result(self) -> None:
+        """Вторая фаза: правило по валютам и итоговые словари через NumPy."""
+        stats = Numpy_Stats(self.cache.columns, self.cache.get_needed_mask(self.csv_start.input_values.prof))
+        self.csv_start.all_currencies = stats.currency_to_count
+        self.year_data = stats.get_year_data()
+        self.area_to_middle_salary, self.area_to_piece = stats.get_area_data()
+        self.csv_start.input_values.timer.write_time("NUMPY > Статистика посчитана")
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    numpy_scan = Numpy_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_numpy.png", numpy_scan, numpy_scan)
+    report = Report_PDF_MP("report_numpy.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
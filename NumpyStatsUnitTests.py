@@ -0,0 +1,73 @@
+import random
+from unittest import TestCase
+from NumpyStats import *
+from FusedScan import Year_Stats, Area_Stats
+
+
+def get_random_columns(rows_count: int, seed: int) -> (dict, np.ndarray):
+    rand = random.Random(seed)
+    currencies, areas = ["RUR", "USD", "EUR"], ["Город " + str(i) for i in range(40)]
+    columns = {"currency_id": [], "year": [], "area_id": [], "salary_rur": [], "middle_salary": []}
+    for _ in range(rows_count):
+        columns["currency_id"].append(rand.choice([0, 0, 0, 1, 1, 2]))
+        columns["year"].append(rand.randint(2003, 2010))
+        columns["area_id"].append(min(int(rand.paretovariate(1)) - 1, len(areas) - 1))
+        middle = rand.choice([np.nan, rand.randint(100, 9000) / 2, 1000.0])
+        columns["middle_salary"].append(middle)
+        columns["salary_rur"].append(rand.choice([np.nan, round(middle * rand.random() * 70, 1), round(middle, 1)]))
+    columns = {name: np.array(values) for name, values in columns.items()}
+    columns["currencies"], columns["areas"] = np.array(currencies), np.array(areas)
+    is_needed = np.array([rand.random() < 0.3 for _ in range(rows_count)])
+    return columns, is_needed
+
+
+def get_dict_result(columns: dict, is_needed: np.ndarray, valid_currencies: set) -> tuple:
+    year_stats, area_stats = Year_Stats(), Area_Stats()
+    for i in range(len(columns["year"])):
+        currency = str(columns["currencies"][columns["currency_id"][i]])
+        area = str(columns["areas"][columns["area_id"][i]])
+        salary = float(columns["salary_rur"][i])
+        if np.isnan(columns["middle_salary"][i]):
+            continue
+        if np.isnan(salary):
+            area_stats.add(area, currency, None)
+            continue
+        year_stats.add(int(columns["year"][i]), currency, salary, bool(is_needed[i]))
+        area_stats.add(area, currency, salary)
+    return year_stats.get_year_data(valid_currencies), area_stats.get_area_data(valid_currencies)
+
+
+class NumpyStatsUnitTests(TestCase):
+    def setUp(self):
+        self.min_currency_count = Currency_Histogram.min_currency_count
+        Currency_Histogram.min_currency_count = 1000
+
+    def tearDown(self):
+        Currency_Histogram.min_currency_count = self.min_currency_count
+
+    def assert_same_as_dict_path(self, rows_count: int, seed: int):
+        columns, is_needed = get_random_columns(rows_count, seed)
+        stats = Numpy_Stats(columns, is_needed)
+        valid_currencies = {currency for currency, count in stats.currency_to_count.items() if count > 1000}
+        year_data, area_data = get_dict_result(columns, is_needed, valid_currencies)
+        self.assertEqual(stats.get_year_data(), year_data)
+        self.assertEqual(list(stats.get_year_data()[1].items()), list(year_data[1].items()))
+        numpy_area_data = stats.get_area_data()
+        self.assertEqual(list(numpy_area_data[0].items()), list(area_data[0].items()))
+        self.assertEqual(list(numpy_area_data[1].items()), list(area_data[1].items()))
+
+    def test_same_as_dict_path_with_all_currencies(self):
+        self.assert_same_as_dict_path(4000, 1)
+
+    def test_same_as_dict_path_with_filtered_currency(self):
+        self.assert_same_as_dict_path(2500, 2)
+
+    def test_same_as_dict_path_with_many_rows(self):
+        self.assert_same_as_dict_path(20000, 3)
+
+    def test_get_top_indexes_with_ties(self):
+        self.assertEqual(Numpy_Stats.get_top_indexes(np.array([1, 2, 2, 2]), np.array([0, 3, 1, 2]), 2).tolist(),
+                         [2, 3])
+
+    def test_get_floor_means_with_zero_count(self):
+        self.assertEqual(Numpy_Stats.get_floor_means(np.array([0.0, 5.0]), np.array([0, 2])).tolist(), [0, 2])
@@ -0,0 +1,294 @@
+import csv, json, math, mmap, os, struct
+import numpy as np
+from multiprocessing import shared_memory
+
+binary_magic = b"RATE"
+binary_version = 1
+
+
+def get_binary_name(csv_path: str) -> str:
+    """Название бинарного файла курсов рядом с csv-файлом.
+    Args:
+        csv_path (str): путь до csv-файла с валютами.
+    Returns:
+        str: путь до бинарного файла.
+    >>> get_binary_name("api_data/currency_csv.csv")
+    'api_data/currency_csv.rates'
+    """
+    return os.path.splitext(csv_path)[0] + ".rates"
+
+
+def get_source_stamp(csv_path: str) -> list:
+    """Отметка версии csv-файла, по которой построен бинарный файл (размер и время изменения).
+    Args:
+        csv_path (str): путь до csv-файла.
+    Returns:
+        list: [размер, время изменения в нс].
+    """
+    stat = os.stat(csv_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Rate_Table:
+    """Плотная таблица курсов валют: матрица float64 [номер месяца, код валюты], где
+    номер месяца = (год - start_year) * 12 + (месяц - 1). Отсутствующий курс - NaN.
+    После publish() матрица лежит в shared memory, и при передаче таблицы в другой процесс
+    передается только имя блока памяти: воркеры подключаются к нему без копирования.
+    Attributes:
+        start_year (int): первый год таблицы.
+        currencies (list): валюты (номер в списке - код валюты, столбец матрицы).
+        rates (ndarray): матрица курсов.
+    """
+    def __init__(self, start_year: int, currencies: list, rates: np.ndarray):
+        """Инициализация класса Rate_Table.
+        Args:
+            start_year (int): первый год таблицы.
+            currencies (list): валюты (номер в списке - код валюты, столбец матрицы).
+            rates (ndarray): матрица курсов.
+        """
+        self.start_year = start_year
+        self.currencies = list(currencies)
+        self.currency_to_id = {currency: code for code, currency in enumerate(self.currencies)}
+        self.shared_memory = None
+        self.is_owner = False
+        self.set_rates(rates)
+
+    def set_rates(self, rates: np.ndarray) -> None:
+        """Задать матрицу курсов. Скалярный поиск идет через memoryview той же памяти, без копии.
+        Args:
+            rates (ndarray): матрица курсов.
+        """
+        self.rates = np.ascontiguousarray(rates, dtype=np.float64)
+        self.rate_rows = memoryview(self.rates) if self.rates.size > 0 else []
+
+    def publish(self):
+        """Переложить матрицу в shared memory. Вызывается один раз в основном процессе.
+        Returns:
+            Rate_Table: эта же таблица.
+        """
+        if self.shared_memory is None:
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=max(self.rates.nbytes, 1))
+            self.is_owner = True
+            shared_rates = np.ndarray(self.rates.shape, dtype=np.float64, buffer=self.shared_memory.buf)
+            shared_rates[:] = self.rates
+            self.set_rates(shared_rates)
+        return self
+
+    def unpublish(self) -> None:
+        """Вернуть матрицу в обычную память и освободить shared memory (удалить блок, если он наш)."""
+        if self.shared_memory is not None:
+            rates = self.rates.copy()
+            self.rates, self.rate_rows = None, []
+            self.shared_memory.close()
+            if self.is_owner:
+                self.shared_memory.unlink()
+            self.shared_memory, self.is_owner = None, False
+            self.set_rates(rates)
+
+    def __getstate__(self) -> dict:
+        """Состояние для pickle: если таблица опубликована - только имя блока shared memory.
+        Returns:
+            dict: состояние.
+        """
+        state = {"start_year": self.start_year, "currencies": self.currencies, "shape": self.rates.shape}
+        if self.shared_memory is not None:
+            state["shared_memory_name"] = self.shared_memory.name
+        else:
+            state["rates"] = self.rates
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Восстановление после pickle: подключение к shared memory без копирования матрицы.
+        Args:
+            state (dict): состояние.
+        """
+        self.start_year = state["start_year"]
+        self.currencies = state["currencies"]
+        self.currency_to_id = {currency: code for code, currency in enumerate(self.currencies)}
+        self.shared_memory = None
+        self.is_owner = False
+        if "shared_memory_name" in state:
+            self.shared_memory = shared_memory.SharedMemory(name=state["shared_memory_name"])
+            self.set_rates(np.ndarray(state["shape"], dtype=np.float64, buffer=self.shared_memory.buf))
+        else:
+            self.set_rates(state["rates"])
+
+    @staticmethod
+    def from_csv(csv_path: str):
+        """Построить таблицу по csv-файлу с валютами (Year, Month, CharCode, InRuR).
+        Args:
+            csv_path (str): путь до csv-файла.
+        Returns:
+            Rate_Table: таблица курсов.
+        """
+        year_month_code_rate = []
+        with open(file=csv_path, mode="r", encoding="utf-8-sig") as csv_file:
+            file = csv.reader(csv_file)
+            start_line = next(file)
+            year_index, month_index = start_line.index("Year"), start_line.index("Month")
+            code_index, rate_index = start_line.index("CharCode"), start_line.index("InRuR")
+            for line in file:
+                year_month_code_rate.append((int(line[year_index]), int(line[month_index]),
+                                             line[code_index], float(line[rate_index])))
+        return Rate_Table.from_rows(year_month_code_rate)
+
+    def save_binary(self, binary_path: str, source_stamp: list = None) -> None:
+        """Сохранить таблицу в компактный бинарный файл: "RATE", версия формата и длина заголовка
+        (uint32), json-заголовок (первый год, кол-во месяцев, валюты по кодам, отметка csv-файла),
+        выравнивание до 8 байт и матрица float64. Запись идет через временный файл и переименование.
+        Args:
+            binary_path (str): путь до бинарного файла.
+            source_stamp (list): отметка csv-файла, из которого построена таблица.
+        """
+        header = json.dumps({"start_year": self.start_year, "months": self.rates.shape[0],
+                             "currencies": self.currencies, "source": source_stamp}).encode()
+        header += b" " * (-(len(header) + 12) % 8)
+        temp_path = binary_path + f".tmp{os.getpid()}"
+        with open(temp_path, "wb") as binary_file:
+            binary_file.write(binary_magic + struct.pack("<II", binary_version, len(header)) + header)
+            binary_file.write(np.ascontiguousarray(self.rates, dtype="<f8").tobytes())
+        os.replace(temp_path, binary_path)
+
+    @staticmethod
+    def from_binary(binary_path: str, source_stamp: list = None):
+        """Открыть бинарный файл курсов через mmap (матрица не читается в память и не разбирается).
+        Args:
+            binary_path (str): путь до бинарного файла.
+            source_stamp (list): ожидаемая отметка csv-файла (None - не проверять).
+        Returns:
+            Rate_Table: таблица курсов или None, если файла нет, он другой версии формата,
+                испорчен или построен по другой версии csv-файла.
+        """
+        try:
+            with open(binary_path, "rb") as binary_file:
+                memory_map = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if memory_map[:4] != binary_magic or len(memory_map) < 12:
+            return None
+        version, header_length = struct.unpack("<II", memory_map[4:12])
+        if version != binary_version:
+            return None
+        try:
+            header = json.loads(memory_map[12:12 + header_length])
+        except ValueError:
+            return None
+        shape = (header["months"], len(header["currencies"]))
+        if source_stamp is not None and header["source"] != source_stamp \
+                or len(memory_map) != 12 + header_length + shape[0] * shape[1] * 8:
+            return None
+        rates = np.frombuffer(memory_map, dtype="<f8", count=shape[0] * shape[1], offset=12 + header_length)
+        return Rate_Table(header["start_year"], header["currencies"], rates.reshape(shape))
+
+    @staticmethod
+    def load(csv_path: str):
+        """Таблица курсов для csv-файла: из бинарного файла рядом с ним, если он построен по этой же
+        версии csv-файла и в текущей версии формата, иначе - разбор csv и пересборка бинарного файла.
+        Args:
+            csv_path (str): путь до csv-файла с валютами.
+        Returns:
+            Rate_Table: таблица курсов.
+        """
+        source_stamp = get_source_stamp(csv_path)
+        table = Rate_Table.from_binary(get_binary_name(csv_path), source_stamp)
+        if table is None:
+            table = Rate_Table.from_csv(csv_path)
+            try:
+                table.save_binary(get_binary_name(csv_path), source_stamp)
+            except OSError:
+                pass
+        return table
+
+    @staticmethod
+    def from_rows(year_month_code_rate: list):
+        """Построить таблицу по списку (год, месяц, валюта, курс).
+        Args:
+            year_month_code_rate (list): список кортежей.
+        Returns:
+            Rate_Table: таблица курсов.
+        >>> Rate_Table.from_rows([(2003, 2, "USD", 30.0), (2004, 1, "EUR", 35.5)]).rates.shape
+        (13, 2)
+        """
+        if len(year_month_code_rate) == 0:
+            return Rate_Table(0, [], np.zeros((0, 0), dtype=np.float64))
+        start_year = min(row[0] for row in year_month_code_rate)
+        end_year = max(row[0] for row in year_month_code_rate)
+        end_month = max(row[1] for row in year_month_code_rate if row[0] == end_year)
+        currencies = []
+        currency_to_id = {}
+        for row in year_month_code_rate:
+            if row[2] not in currency_to_id:
+                currency_to_id[row[2]] = len(currencies)
+                currencies.append(row[2])
+        rates = np.full(((end_year - start_year) * 12 + end_month, len(currencies)), np.nan, dtype=np.float64)
+        for year, month, code, rate in year_month_code_rate:
+            rates[(year - start_year) * 12 + month - 1, currency_to_id[code]] = rate
+        return Rate_Table(start_year, currencies, rates)
+
+    def get_rate(self, year: int, month: int, currency: str) -> float:
+        """Курс валюты на месяц (скалярный поиск).
+        Args:
+            year (int): год.
+            month (int): месяц (1-12).
+            currency (str): код валюты.
+        Returns:
+            float: курс в рублях или NaN, если курса нет.
+        >>> table = Rate_Table.from_rows([(2003, 2, "USD", 30.0)])
+        >>> table.get_rate(2003, 2, "USD")
+        30.0
+        >>> math.isnan(table.get_rate(2003, 1, "USD")), math.isnan(table.get_rate(2003, 2, "EUR"))
+        (True, True)
+        """
+        code = self.currency_to_id.get(currency)
+        month_number = (year - self.start_year) * 12 + month - 1
+        if code is None or not 1 <= month <= 12 or not 0 <= month_number < len(self.rates):
+            return math.nan
+        return self.rate_rows[month_number, code]
+
+    def get_rate_by_date(self, published_at: str, currency: str) -> float:
+        """Курс валюты по дате публикации вакансии вида 2003-09-19T14:42:13+0400.
+        Args:
+            published_at (str): дата публикации.
+            currency (str): код валюты.
+        Returns:
+            float: курс в рублях или NaN, если курса нет или дата некорректна.
+        >>> table = Rate_Table.from_rows([(2003, 9, "USD", 30.0)])
+        >>> table.get_rate_by_date("2003-09-19T14:42:13+0400", "USD")
+        30.0
+        >>> math.isnan(table.get_rate_by_date("abc", "USD"))
+        True
+        """
+        try:
+            return self.get_rate(int(published_at[:4]), int(published_at[5:7]), currency)
+        except ValueError:
+            return math.nan
+
+    def get_currency_ids(self, currencies) -> np.ndarray:
+        """Коды валют для векторного поиска (-1 - валюты нет в таблице).
+        Args:
+            currencies (iterable): коды валют.
+        Returns:
+            ndarray: массив кодов.
+        """
+        return np.array([self.currency_to_id.get(currency, -1) for currency in currencies], dtype=np.int64)
+
+    def get_rates(self, years: np.ndarray, months: np.ndarray, currency_ids: np.ndarray) -> np.ndarray:
+        """Курсы для массивов годов, месяцев и кодов валют (векторный поиск).
+        Args:
+            years (ndarray): года.
+            months (ndarray): месяцы (1-12).
+            currency_ids (ndarray): коды валют из get_currency_ids.
+        Returns:
+            ndarray: курсы, NaN там, где курса нет.
+        >>> table = Rate_Table.from_rows([(2003, 2, "USD", 30.0), (2003, 3, "EUR", 35.5)])
+        >>> table.get_rates(np.array([2003, 2003, 2002]), np.array([2, 3, 2]), table.get_currency_ids(["USD", "EUR", "USD"])).tolist()
+        [30.0, 35.5, nan]
+        """
+        years, months = np.asarray(years, dtype=np.int64), np.asarray(months, dtype=np.int64)
+        currency_ids = np.asarray(currency_ids, dtype=np.int64)
+        month_numbers = (years - self.start_year) * 12 + months - 1
+        is_found = (months >= 1) & (months <= 12) & (month_numbers >= 0) & (month_numbers < len(self.rates)) \
+            & (currency_ids >= 0)
+        rates = np.full(len(month_numbers), np.nan, dtype=np.float64)
+        rates[is_found] = self.rates[month_numbers[is_found], currency_ids[is_found]]
+        return rates
@@ -0,0 +1,103 @@
+import math, os, pickle, tempfile
+from unittest import TestCase
+from RateTable import *
+
+
+class RateTableUnitTests(TestCase):
+    def setUp(self):
+        self.table = Rate_Table.from_rows([(2003, 1, "USD", 31.8), (2003, 1, "EUR", 33.5), (2004, 12, "USD", 27.7)])
+
+    def test_from_rows_shape(self):
+        self.assertEqual(self.table.rates.shape, (24, 2))
+
+    def test_from_empty_rows(self):
+        self.assertTrue(math.isnan(Rate_Table.from_rows([]).get_rate(2003, 1, "USD")))
+
+    def test_get_rate(self):
+        self.assertEqual(self.table.get_rate(2004, 12, "USD"), 27.7)
+
+    def test_get_rate_of_missing_month(self):
+        self.assertTrue(math.isnan(self.table.get_rate(2004, 11, "USD")))
+
+    def test_get_rate_of_missing_currency(self):
+        self.assertTrue(math.isnan(self.table.get_rate(2003, 1, "KZT")))
+
+    def test_get_rate_out_of_range(self):
+        self.assertTrue(math.isnan(self.table.get_rate(2002, 12, "USD")))
+        self.assertTrue(math.isnan(self.table.get_rate(2005, 1, "USD")))
+
+    def test_get_rate_with_wrong_month(self):
+        self.assertTrue(math.isnan(self.table.get_rate(2004, 0, "USD")))
+
+    def test_get_rate_by_date(self):
+        self.assertEqual(self.table.get_rate_by_date("2003-01-31T18:24:11+0300", "EUR"), 33.5)
+
+    def test_get_rate_by_wrong_date(self):
+        self.assertTrue(math.isnan(self.table.get_rate_by_date("", "EUR")))
+
+    def test_get_rates_is_the_same_as_get_rate(self):
+        years, months, codes = [2003, 2003, 2004, 2004, 2001], [1, 1, 12, 1, 1], ["USD", "EUR", "USD", "KZT", "USD"]
+        rates = self.table.get_rates(np.array(years), np.array(months), self.table.get_currency_ids(codes))
+        for i in range(len(years)):
+            rate = self.table.get_rate(years[i], months[i], codes[i])
+            self.assertTrue(rate == rates[i] or math.isnan(rate) and math.isnan(rates[i]))
+
+    def test_publish_keeps_rates(self):
+        self.table.publish()
+        try:
+            self.assertIsNotNone(self.table.shared_memory)
+            self.assertEqual(self.table.get_rate(2004, 12, "USD"), 27.7)
+        finally:
+            self.table.unpublish()
+        self.assertIsNone(self.table.shared_memory)
+        self.assertEqual(self.table.get_rate(2003, 1, "EUR"), 33.5)
+
+    def test_pickle_of_published_table_attaches_to_shared_memory(self):
+        self.table.publish()
+        try:
+            state = self.table.__getstate__()
+            self.assertNotIn("rates", state)
+            copy = pickle.loads(pickle.dumps(self.table))
+            self.assertEqual(copy.shared_memory.name, self.table.shared_memory.name)
+            self.assertEqual(copy.get_rate(2003, 1, "USD"), 31.8)
+            copy.unpublish()
+        finally:
+            self.table.unpublish()
+
+    def test_pickle_of_not_published_table(self):
+        copy = pickle.loads(pickle.dumps(self.table))
+        self.assertIsNone(copy.shared_memory)
+        self.assertEqual(copy.get_rate(2004, 12, "USD"), 27.7)
+
+    def test_binary_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            binary_path = os.path.join(temp_dir, "currency_csv.rates")
+            self.table.save_binary(binary_path, [1, 2])
+            copy = Rate_Table.from_binary(binary_path, [1, 2])
+            self.assertEqual((copy.start_year, copy.currencies), (2003, ["USD", "EUR"]))
+            self.assertEqual(copy.get_rate(2004, 12, "USD"), 27.7)
+            self.assertTrue(math.isnan(copy.get_rate(2004, 11, "USD")))
+            self.assertIsNone(Rate_Table.from_binary(binary_path, [1, 3]))
+            copy = pickle.loads(pickle.dumps(copy))
+            self.assertEqual(copy.get_rate(2003, 1, "EUR"), 33.5)
+
+    def test_load_rebuilds_stale_binary(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "currency_csv.csv")
+            with open(csv_path, "w", encoding="utf-8-sig") as csv_file:
+                csv_file.write("Year,Month,CharCode,InRuR\n2003,1,USD,31.8\n")
+            self.assertEqual(Rate_Table.load(csv_path).get_rate(2003, 1, "USD"), 31.8)
+            self.assertTrue(os.path.exists(get_binary_name(csv_path)))
+            with open(csv_path, "a", encoding="utf-8") as csv_file:
+                csv_file.write("2003,2,USD,31.5\n")
+            self.assertEqual(Rate_Table.load(csv_path).get_rate(2003, 2, "USD"), 31.5)
+            self.assertIsNotNone(Rate_Table.from_binary(get_binary_name(csv_path), get_source_stamp(csv_path)))
+
+    def test_binary_of_other_version_is_ignored(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            binary_path = os.path.join(temp_dir, "currency_csv.rates")
+            self.table.save_binary(binary_path)
+            with open(binary_path, "r+b") as binary_file:
+                binary_file.seek(4)
+                binary_file.write(struct.pack("<I", binary_version + 1))
+            self.assertIsNone(Rate_Table.from_binary(binary_path))
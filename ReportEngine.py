@@ -0,0 +1,251 @@
+import asyncio, os
+import concurrent.futures as pool
+
+from ReportPDF_New_MProcess_2 import Timer, Error, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Fused_Scan
+from ChunkedReader import Chunked_Scan, init_worker, scan_range
+from RateTable import Rate_Table
+from WorkerPool import Worker_Pool
+from Tracing import tracer
+from MemoryProfile import memory_profiler
+
+
+def run_indexed(rate_table: Rate_Table, function, index: int, *args) -> tuple:
+    """Выполнить задачу в процессе Worker_Pool и вернуть результат вместе с ее номером
+    (Worker_Pool отдает результаты в порядке готовности, а слияние идет в порядке задач).
+    Args:
+        rate_table (Rate_Table): таблица курсов валют.
+        function (callable): функция задачи.
+        index (int): номер задачи.
+        *args: аргументы задачи.
+    Returns:
+        tuple: (номер задачи, результат).
+    """
+    init_worker(rate_table)
+    return index, function(*args)
+
+
+class Serial_Backend:
+    """Последовательное выполнение задач в основном процессе.
+    Attributes:
+        rate_table (Rate_Table): таблица курсов валют.
+        max_workers (int): кол-во воркеров (не используется).
+    """
+    def __init__(self, rate_table: Rate_Table, max_workers: int):
+        """Инициализация класса Serial_Backend.
+        Args:
+            rate_table (Rate_Table): таблица курсов валют.
+            max_workers (int): кол-во воркеров.
+        """
+        self.rate_table = rate_table
+        self.max_workers = max_workers
+        init_worker(rate_table)
+
+    def map(self, function, *iterables) -> list:
+        """Выполнить функцию для каждого набора аргументов.
+        Args:
+            function (callable): функция задачи.
+            *iterables: списки аргументов.
+        Returns:
+            list: результаты в порядке задач.
+        """
+        return list(map(function, *iterables))
+
+    def close(self) -> None:
+        """Освободить ресурсы."""
+
+
+class Thread_Backend(Serial_Backend):
+    """Выполнение задач в ThreadPoolExecutor."""
+    def __init__(self, rate_table: Rate_Table, max_workers: int):
+        """Инициализация класса Thread_Backend. Запуск пула потоков.
+        Args:
+            rate_table (Rate_Table): таблица курсов валют.
+            max_workers (int): кол-во потоков.
+        """
+        super().__init__(rate_table, max_workers)
+        self.executor = pool.ThreadPoolExecutor(max_workers=max_workers)
+
+    def map(self, function, *iterables) -> list:
+        """Выполнить функцию для каждого набора аргументов.
+        Args:
+            function (callable): функция задачи.
+            *iterables: списки аргументов.
+        Returns:
+            list: результаты в порядке задач.
+        """
+        return list(self.executor.map(function, *iterables))
+
+    def close(self) -> None:
+        """Остановить пул."""
+        self.executor.shutdown()
+
+
+class Process_Backend(Thread_Backend):
+    """Выполнение задач в ProcessPoolExecutor. Таблица курсов передается воркерам один раз."""
+    def __init__(self, rate_table: Rate_Table, max_workers: int):
+        """Инициализация класса Process_Backend. Запуск пула процессов.
+        Args:
+            rate_table (Rate_Table): таблица курсов валют.
+            max_workers (int): кол-во процессов.
+        """
+        self.rate_table = rate_table
+        self.max_workers = max_workers
+        self.executor = pool.ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                                 initargs=(rate_table, tracer.get_queue()))
+
+
+class MP_Process_Backend(Serial_Backend):
+    """Выполнение задач в явных процессах mp.Process (Worker_Pool). На каждый вызов map
+    создается свой пул, результаты сортируются по номеру задачи."""
+    def map(self, function, *iterables) -> list:
+        """Выполнить функцию для каждого набора аргументов.
+        Args:
+            function (callable): функция задачи.
+            *iterables: списки аргументов.
+        Returns:
+            list: результаты в порядке задач.
+        """
+        worker_pool = Worker_Pool(run_indexed, (self.rate_table, function), self.max_workers)
+        for index, args in enumerate(zip(*iterables)):
+            worker_pool.put(index, *args)
+        return [result for _, result in sorted(worker_pool.get_results(), key=lambda item: item[0])]
+
+
+class Asyncio_Backend(Thread_Backend):
+    """Выполнение задач корутинами asyncio: каждая задача уходит в пул потоков через
+    run_in_executor, результаты собираются asyncio.gather в порядке задач."""
+    async def gather(self, function, *iterables) -> list:
+        """Запустить все задачи и дождаться их.
+        Args:
+            function (callable): функция задачи.
+            *iterables: списки аргументов.
+        Returns:
+            list: результаты в порядке задач.
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[loop.run_in_executor(self.executor, function, *args)
+                                      for args in zip(*iterables)])
+
+    def map(self, function, *iterables) -> list:
+        """Выполнить функцию для каждого набора аргументов.
+        Args:
+            function (callable): функция задачи.
+            *iterables: списки аргументов.
+        Returns:
+            list: результаты в порядке задач.
+        """
+        return asyncio.run(self.gather(function, *iterables))
+
+
+backends = {
+    "serial": Serial_Backend,
+    "thread": Thread_Backend,
+    "process": Process_Backend,
+    "mp_process": MP_Process_Backend,
+    "asyncio": Asyncio_Backend,
+}
+
+
+class Report_Engine(Chunked_Scan):
+    """Единый движок отчета: файл делится на диапазоны записей (как в Chunked_Scan), диапазоны
+    разбираются выбранным способом выполнения, частичные агрегаты сливаются в порядке диапазонов.
+    Поэтому результат не зависит от способа выполнения.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        backend (str): способ выполнения (serial, thread, process, mp_process, asyncio).
+        max_workers (int): кол-во воркеров (по умолчанию - кол-во ядер).
+        chunk_size (int): желаемый размер диапазона в байтах.
+    """
+    def __init__(self, csv_start: CSV_Start, backend: str = "process", max_workers: int = None,
+                 chunk_size: int = 64 << 20):
+        """Инициализация класса Report_Engine. Проход по файлу и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+            backend (str): способ выполнения (serial, thread, process, mp_process, asyncio).
+            max_workers (int): кол-во воркеров (по умолчанию - кол-во ядер).
+            chunk_size (int): желаемый размер диапазона в байтах.
+        """
+        if backend not in backends:
+            Error("BACKEND", f"Неизвестный способ выполнения \"{backend}\". Доступны: {', '.join(backends)}",
+                  True, csv_start.input_values.timer)
+        self.backend = backend
+        super().__init__(csv_start, max_workers, chunk_size)
+
+    def scan_file(self) -> None:
+        """Первая фаза: разбор диапазонов выбранным способом и слияние частичных агрегатов
+        (сжатый файл без блочного индекса читается потоком)."""
+        file_name = self.csv_start.input_values.file_name
+        if not Chunked_Scan.can_split(file_name):
+            Fused_Scan.scan_file(self)
+            return
+        timer = self.csv_start.input_values.timer
+        rate_table = self.csv_start.values_reader.rate_table
+        is_published = rate_table.shared_memory is not None
+        rate_table.publish()
+        executor = backends[self.backend](rate_table, self.max_workers)
+        try:
+            with tracer.span("find_offsets", backend=self.backend):
+                offsets = self.get_record_offsets(executor)
+            count = len(offsets) - 1
+            timer.write_time(f"ENGINE > [{self.backend}] Файл разбит на {count} диапазонов")
+            with tracer.span("scan_ranges", backend=self.backend, ranges=count):
+                results = executor.map(scan_range, [file_name] * count, offsets[:-1], offsets[1:],
+                                       [self.csv_start.index_of] * count, [self.csv_start.start_line_len] * count,
+                                       [self.csv_start.input_values.prof] * count)
+            for histogram, year_stats, area_stats in results:
+                self.currency_histogram.merge(histogram)
+                self.year_stats.merge(year_stats)
+                self.area_stats.merge(area_stats)
+        finally:
+            executor.close()
+            if not is_published:
+                rate_table.unpublish()
+        timer.write_time(f"ENGINE > [{self.backend}] Все диапазоны разобраны")
+
+
+fork_to_backend = {"ReportPDF": "serial", "ReportPDFInFutures": "process", "ReportPDFInMultiprocess": "mp_process",
+                   "ReportPDF_New_MProcess": "mp_process", "ReportPDF_New_MProcess_2": "mp_process"}
+
+
+def create_report(file_name: str, prof: str, backend: str, pdf_name: str, image_name: str) -> Report_Engine:
+    """Построить pdf-отчет единым движком. Через эту функцию строят отчет и прежние варианты
+    (ReportPDF*), каждый своим способом выполнения (fork_to_backend).
+    Args:
+        file_name (str): название csv-файла с вакансиями.
+        prof (str): название профессии.
+        backend (str): способ выполнения (serial, thread, process, mp_process, asyncio).
+        pdf_name (str): название pdf-файла.
+        image_name (str): название png-файла с графиками.
+    Returns:
+        Report_Engine: движок с итоговыми данными.
+    """
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(file_name, prof, timer)
+    timer.reload_start_time()
+
+    if not os.path.exists("api_data/currency_csv.csv"):
+        Error("CURRENCY_FILE", "Нет файла курсов ЦБ api_data/currency_csv.csv (его создает CurrencyValues.py)",
+              True, timer)
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    report_engine = Report_Engine(csv_start, backend)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator(image_name, report_engine, report_engine)
+    Report_PDF_MP(pdf_name, image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
+    return report_engine
+
+
+if __name__ == '__main__':
+    tracer.enable()
+    memory_profiler.enable_from_environment()
+    file_name, prof = input("Введите название файла: "), input("Введите название профессии: ")
+    backend = input(f"Введите способ выполнения ({', '.join(backends)}): ") or "process"
+    create_report(file_name, prof, backend, f"report_{backend}.pdf", f"graph_{backend}.png")
+    tracer.export(f"trace_{backend}.json")
+    memory_profiler.write_report(f"memory_report_{backend}.txt")
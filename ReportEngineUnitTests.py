@@ -0,0 +1,67 @@
+import gzip, os, shutil, tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from ReportEngine import *
+from ChunkedReader import count_quotes
+from Benchmark import write_synthetic_csv, write_currency_csv
+
+
+class ReportEngineUnitTests(TestCase):
+    def setUp(self):
+        self.rate_table = Rate_Table.from_rows([(2022, 1, "USD", 70.0)])
+        file, self.file_name = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(file, "wb") as csv_file:
+            csv_file.write(b'a,"b""c"\n"d\ne",f\n')
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_run_indexed(self):
+        self.assertEqual(run_indexed(self.rate_table, count_quotes, 3, self.file_name, 0, 9), (3, 4))
+
+    def test_all_backends_give_the_same_result_in_order(self):
+        starts, ends = [0, 2, 9, 0], [9, 9, 18, 18]
+        for name, backend in backends.items():
+            executor = backend(self.rate_table, 2)
+            try:
+                self.assertEqual(executor.map(count_quotes, [self.file_name] * 4, starts, ends), [4, 4, 2, 6], name)
+            finally:
+                executor.close()
+
+    def test_backends_with_empty_tasks(self):
+        for name, backend in backends.items():
+            executor = backend(self.rate_table, 2)
+            try:
+                self.assertEqual(executor.map(count_quotes, [], [], []), [], name)
+            finally:
+                executor.close()
+
+    def test_compressed_file_without_index_is_streamed(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(temp_dir, "vacancies.csv")
+            write_synthetic_csv(file_name, 8000)
+            write_currency_csv(os.path.join(temp_dir, "currency.csv"))
+            with open(file_name, "rb") as csv_file, gzip.open(file_name + ".gz", "wb") as gzip_file:
+                shutil.copyfileobj(csv_file, gzip_file)
+            scans = []
+            for scan_class, name, kwargs in [(Fused_Scan, file_name, {}),
+                                             (Chunked_Scan, file_name + ".gz", {"max_workers": 2}),
+                                             (Report_Engine, file_name + ".gz", {"backend": "serial"})]:
+                timer = Timer("TEST", 0)
+                csv_start = CSV_Start(InputCorrect(name, "Программист", timer),
+                                      Currency_Values_Reader(temp_dir, "currency.csv"), False)
+                with patch("ChunkedReader.read_text_range", side_effect=AssertionError):
+                    scans.append(scan_class(csv_start, **kwargs))
+        finally:
+            shutil.rmtree(temp_dir)
+        self.assertGreater(len(scans[0].year_data[0]), 0)
+        for scan in scans[1:]:
+            self.assertEqual(scan.get_year_data(), scans[0].get_year_data())
+            self.assertEqual((scan.area_to_middle_salary, scan.area_to_piece),
+                             (scans[0].area_to_middle_salary, scans[0].area_to_piece))
+
+    def test_every_fork_has_a_backend(self):
+        for fork_name, backend in fork_to_backend.items():
+            self.assertTrue(os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), fork_name + ".py")))
+            self.assertIn(backend, backends, fork_name)
@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from ReportPDF_New_MProcess_2 import *
+
+
+def get_test_csv_start() -> CSV_Start:
+    csv_start = CSV_Start.__new__(CSV_Start)
+    csv_start.start_line = ["name", "description", "salary_from", "salary_to", "salary_currency", "area_name",
+                            "published_at"]
+    csv_start.index_of = {field: csv_start.start_line.index(field) for field in CSV_Start.needed_fields}
+    csv_start.start_line_len = 7
+    csv_start.all_currencies = {"RUR": 6000, "USD": 6000, "EUR": 10}
+    csv_start.values_reader = SimpleNamespace(rate_table=Rate_Table.from_rows([(2022, 1, "RUR", 1.0),
+                                                                               (2022, 1, "USD", 70.0)]))
+    return csv_start
+
+
+test_lines = [["Программист", "длинное описание", "100", "200", "USD", "Мск", "2022-01-10T10:00:00+0300"],
+              ["Тестировщик", "", "", "300.5", "RUR", "Екб", "2022-01-11T10:00:00+0300"],
+              ["Аналитик", "", "", "", "RUR", "Екб", "2022-01-11T10:00:00+0300"],
+              ["Дизайнер", "", "100", "", "EUR", "Екб", "2022-01-11T10:00:00+0300"],
+              ["Программист", "", "100", "", "USD", "Мск", "2023-01-11T10:00:00+0300"],
+              ["Короткая строка", "100"]]
+
+
+class ReportPDFNewMProcess2UnitTests(TestCase):
+    def test_read_projected_keeps_only_needed_fields(self):
+        rows = list(get_test_csv_start().read_projected(iter(test_lines)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0], ("Программист", "100", "200", "USD", "Мск", "2022-01-10T10:00:00+0300"))
@@ -4,6 +4,9 @@ from prettytable import PrettyTable
 
 import doctest
 
+from MemoryProfile import memory_profiler
+from CompressedFiles import open_text
+
 
 def do_exit(message):
     """Преднамеренное завершение программы с выводом сообщения в консоль.
@@ -227,7 +230,7 @@ class InputCorrect:
 
     def check_file(self):
         """Проверка корректности файла."""
-        with open(self.in_file_name, "r", encoding='utf-8-sig', newline='') as csv_file:
+        with open_text(self.in_file_name) as csv_file:
             file_iter = iter(csv.reader(csv_file))
             if next(file_iter, "none") == "none": do_exit("Пустой файл")
             if next(file_iter, "none") == "none": do_exit("Нет данных")
@@ -278,13 +281,17 @@ class DataSet:
                             input("Введите параметр сортировки: "), input("Обратный порядок сортировки (Да / Нет): "),
                             input("Введите диапазон вывода: "), input("Введите требуемые столбцы: "))
         self.csv_reader()
+        memory_profiler.checkpoint("read")
         self.csv_filter()
+        memory_profiler.checkpoint("filter")
         self.sort_vacancies()
+        memory_profiler.checkpoint("sort")
         self.print_vacancies()
+        memory_profiler.checkpoint("render")
 
     def csv_reader(self):
         """Считывание csv-файла с первичной фильтрацией (пропуск невалидных строк)."""
-        with open(self.input_values.in_file_name, "r", encoding='utf-8-sig', newline='') as csv_file:
+        with open_text(self.input_values.in_file_name) as csv_file:
             file = csv.reader(csv_file)
             self.start_line = next(file)
             self.other_lines = [line for line in file
@@ -366,7 +373,9 @@ class DataSet:
 
 def create_table():
     """Создать и напечатать таблицу PrettyTable."""
+    memory_profiler.enable_from_environment()
     DataSet()
+    memory_profiler.write_report("memory_report_table.txt")
 
 
 if __name__ == '__main__':
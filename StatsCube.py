@@ -0,0 +1,140 @@
+import csv, math
+import numpy as np
+
+from ReportPDF_New_MProcess_2 import Timer, InputCorrect, Currency_Values_Reader, CSV_Start, \
+    Image_Creator, Report_PDF_MP
+from FusedScan import Fused_Scan, Currency_Histogram, Year_Stats, Area_Stats, get_middle_salary_value
+from ColumnCache import Column_Cache, Cached_Scan
+from CompressedFiles import open_text
+
+
+class Stats_Cube(Column_Cache):
+    """Куб заранее посчитанных сумм: одна ячейка на сочетание (год, месяц, город, валюта, название).
+    В ячейке - кол-во вакансий, кол-во вакансий с зарплатой, кол-во вакансий с известным курсом
+    и сумма зарплат в рублях. Признак профессии в куб не входит: он считается при запросе
+    по словарю названий (get_needed_mask), поэтому один куб отвечает на запрос по любой профессии.
+    Хранится так же, как Column_Cache (папка со столбцами .npy и словарями строк), но строк в нем
+    столько, сколько разных сочетаний, а не вакансий.
+    Attributes:
+        cache_dir (str): папка для куба.
+        file_name (str): csv-файл с вакансиями.
+        currency_file_name (str): csv-файл с валютами.
+    """
+    version = "cube-1"
+    column_names = ["year", "month", "area_id", "currency_id", "name_id", "rows", "salary_rows", "rate_rows",
+                    "salary_sum"]
+    column_dtypes = {"year": np.int16, "month": np.int8, "area_id": np.int32, "currency_id": np.int16,
+                     "name_id": np.int32, "rows": np.int64, "salary_rows": np.int64, "rate_rows": np.int64,
+                     "salary_sum": np.float64}
+
+    def build(self, csv_start: CSV_Start) -> None:
+        """Разобрать csv-файл один раз, сложить вакансии в ячейки куба и сохранить его.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        """
+        rate_table = csv_start.values_reader.rate_table
+        dicts = {name: {} for name in Stats_Cube.dict_names}
+        names, areas, currencies = dicts["names"], dicts["areas"], dicts["currencies"]
+        key_to_cell = {}
+        with open_text(csv_start.input_values.file_name) as csv_file:
+            file = csv.reader(csv_file)
+            next(file)
+            for name, salary_from, salary_to, currency, area, published_at in csv_start.read_projected(file):
+                try:
+                    year, month = int(published_at[:4]), int(published_at[5:7])
+                except ValueError:
+                    year, month = 0, 0
+                key = (year, month, Column_Cache.get_code(areas, area), Column_Cache.get_code(currencies, currency),
+                       Column_Cache.get_code(names, name))
+                cell = key_to_cell.get(key)
+                if cell is None:
+                    cell = key_to_cell[key] = [0, 0, 0, 0.0]
+                cell[0] += 1
+                middle_salary = get_middle_salary_value(salary_from, salary_to)
+                if middle_salary is None:
+                    continue
+                cell[1] += 1
+                rate = rate_table.get_rate(year, month, currency)
+                if not math.isnan(rate):
+                    cell[2] += 1
+                    cell[3] += round(rate * middle_salary, 1)
+        columns = {name: [] for name in Stats_Cube.column_names}
+        for key, cell in key_to_cell.items():
+            for name, value in zip(Stats_Cube.column_names, key + tuple(cell)):
+                columns[name].append(value)
+        self.save(columns, dicts)
+
+    def fill_aggregators(self, prof: str, currency_histogram: Currency_Histogram,
+                         year_stats: Year_Stats, area_stats: Area_Stats) -> None:
+        """Заполнить агрегаторы Fused_Scan по ячейкам куба.
+        Args:
+            prof (str): название профессии.
+            currency_histogram (Currency_Histogram): агрегатор валют.
+            year_stats (Year_Stats): агрегатор по годам.
+            area_stats (Area_Stats): агрегатор по городам.
+        """
+        currencies = [str(currency) for currency in self.columns["currencies"]]
+        currency_id = np.asarray(self.columns["currency_id"], dtype=np.int64)
+        rows = np.asarray(self.columns["rows"], dtype=np.float64)
+        for code, count in enumerate(np.bincount(currency_id, weights=rows, minlength=len(currencies))):
+            if count > 0:
+                currency_histogram.currency_to_count[currencies[code]] = int(count)
+        rate_rows = np.asarray(self.columns["rate_rows"], dtype=np.float64)
+        salary_sum = np.asarray(self.columns["salary_sum"])
+        has_rate = rate_rows > 0
+        is_needed = self.get_needed_mask(prof)[has_rate]
+        keys = np.asarray(self.columns["year"], dtype=np.int64)[has_rate] * len(currencies) + currency_id[has_rate]
+        unique_keys, (_, counts, sums, needed_counts, needed_sums) = \
+            Column_Cache.group_sums(keys, rate_rows[has_rate], salary_sum[has_rate],
+                                    np.where(is_needed, rate_rows[has_rate], 0.0),
+                                    np.where(is_needed, salary_sum[has_rate], 0.0))
+        for i, key in enumerate(unique_keys):
+            year, code = divmod(int(key), len(currencies))
+            year_stats.year_cur_to_stats[(year, currencies[code])] = \
+                [int(counts[i]), float(sums[i]), int(needed_counts[i]), float(needed_sums[i])]
+        salary_rows = np.asarray(self.columns["salary_rows"], dtype=np.float64)
+        has_salary = salary_rows > 0
+        areas = self.columns["areas"]
+        keys = np.asarray(self.columns["area_id"], dtype=np.int64)[has_salary] * len(currencies) \
+            + currency_id[has_salary]
+        unique_keys, (_, counts, salary_counts, salary_sums) = \
+            Column_Cache.group_sums(keys, salary_rows[has_salary], rate_rows[has_salary], salary_sum[has_salary])
+        for i, key in enumerate(unique_keys):
+            area_code, code = divmod(int(key), len(currencies))
+            area_stats.area_cur_to_stats[(str(areas[area_code]), currencies[code])] = \
+                [int(counts[i]), int(salary_counts[i]), float(salary_sums[i])]
+
+
+class Cube_Scan(Cached_Scan):
+    """Вариант Cached_Scan, который берет данные из куба заранее посчитанных сумм. При первом
+    запуске (или если файл/валюты изменились) куб строится одним проходом по csv, дальше запрос
+    по любой профессии читает только ячейки куба.
+    Attributes:
+        csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+        cache_dir (str): папка для куба.
+    """
+    def __init__(self, csv_start: CSV_Start, cache_dir: str = "cache"):
+        """Инициализация класса Cube_Scan. Загрузка (или построение) куба и формирование итоговых данных.
+        Args:
+            csv_start (CSV_Start): Начальные данные (индексы и первая строка).
+            cache_dir (str): папка для куба.
+        """
+        self.cache = Stats_Cube(cache_dir, csv_start.input_values.file_name, csv_start.values_reader.csv_path)
+        Fused_Scan.__init__(self, csv_start)
+
+
+if __name__ == '__main__':
+    timer = Timer("MAIN > Начало работы таймера", 3)
+    input_values = InputCorrect(input("Введите название файла: "), input("Введите название профессии: "), timer)
+    timer.reload_start_time()
+
+    values_reader = Currency_Values_Reader("api_data", "currency_csv.csv")
+    csv_start = CSV_Start(input_values, values_reader, False)
+    timer.write_time("MAIN > Первичная обработка завершена (первая строка + индексы)")
+
+    cube_scan = Cube_Scan(csv_start)
+    timer.write_time("MAIN > Данные по годам и городам готовы")
+
+    image_data = Image_Creator("graph_cube.png", cube_scan, cube_scan)
+    report = Report_PDF_MP("report_cube.pdf", image_data)
+    timer.write_time("MAIN > Обработка завершена. Отчет готов")
@@ -0,0 +1,39 @@
+import os, shutil, tempfile
+from unittest import TestCase
+from StatsCube import *
+from Benchmark import write_synthetic_csv, write_currency_csv
+
+
+class StatsCubeUnitTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.temp_dir, "vacancies.csv")
+        write_currency_csv(os.path.join(self.temp_dir, "currency_csv.csv"))
+        write_synthetic_csv(self.file_name, 8000)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def scan(self, scan_class, prof: str, **kwargs) -> Fused_Scan:
+        timer = Timer("TEST", 0)
+        csv_start = CSV_Start(InputCorrect(self.file_name, prof, timer),
+                              Currency_Values_Reader(self.temp_dir, "currency_csv.csv"), False)
+        return scan_class(csv_start, **kwargs)
+
+    def test_cube_gives_the_same_result_as_fused_scan(self):
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        for prof in "Программист", "Аналитик":
+            cube_scan = self.scan(Cube_Scan, prof, cache_dir=cache_dir)
+            fused_scan = self.scan(Fused_Scan, prof)
+            self.assertGreater(len(fused_scan.year_data[0]), 0)
+            self.assertEqual(cube_scan.get_year_data(), fused_scan.get_year_data())
+            self.assertEqual(cube_scan.currency_histogram.currency_to_count,
+                             fused_scan.currency_histogram.currency_to_count)
+            self.assertEqual((cube_scan.area_to_middle_salary, cube_scan.area_to_piece),
+                             (fused_scan.area_to_middle_salary, fused_scan.area_to_piece))
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_cube_cells_add_up_to_vacancies(self):
+        cube_scan = self.scan(Cube_Scan, "Программист", cache_dir=os.path.join(self.temp_dir, "cache"))
+        self.assertEqual(int(cube_scan.cache.columns["rows"].sum()), 8000)
+        self.assertLess(len(cube_scan.cache.columns["rows"]), 8000)
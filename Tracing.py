@@ -0,0 +1,151 @@
+import json, os, threading, time
+import multiprocessing as mp
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Трассировка этапов: вложенные интервалы (span) с аргументами (год, файл, кол-во строк и т.д.),
+    время - perf_counter_ns (общие монотонные часы для всех процессов машины). Дочерние процессы копят
+    свои интервалы и отправляют их в общую очередь (flush), основной процесс читает очередь в фоновом
+    потоке (чтобы дочерние процессы не зависали на заполненном канале) и сохраняет трассу в формате Chrome trace-event JSON (открывается в Perfetto / chrome://tracing).
+    Пока трассировка не включена (enable/attach), интервалы ничего не стоят и не записываются.
+    Attributes:
+        is_enabled (bool): включена ли трассировка.
+        queue (mp.Queue): очередь для интервалов из дочерних процессов.
+        events (list): записанные, но еще не отправленные события.
+    """
+    def __init__(self):
+        """Инициализация класса Tracer. Трассировка выключена."""
+        self.is_enabled = False
+        self.queue = None
+        self.owner_pid = None
+        self.events = []
+        self.reader = None
+        self.lock = threading.Lock()
+        os.register_at_fork(after_in_child=self.reset_lock)
+
+    def reset_lock(self) -> None:
+        """Новая блокировка в дочернем процессе (fork мог случиться, пока блокировку держал поток чтения)."""
+        self.lock = threading.Lock()
+        self.reader = None
+
+    def enable(self) -> None:
+        """Включить трассировку в основном процессе, создать очередь для дочерних процессов и
+        запустить поток, который ее читает."""
+        self.is_enabled = True
+        self.queue = mp.Queue()
+        self.owner_pid = os.getpid()
+        self.events = []
+        self.start_reader()
+
+    def start_reader(self) -> None:
+        """Запустить фоновый поток чтения очереди."""
+        self.reader = threading.Thread(target=self.read_queue, daemon=True)
+        self.reader.start()
+
+    def read_queue(self) -> None:
+        """Функция потока: переносить интервалы дочерних процессов из очереди, пока не придет None."""
+        for events in iter(self.queue.get, None):
+            with self.lock:
+                self.events.extend(events)
+
+    def attach(self, queue: mp.Queue) -> None:
+        """Подключить дочерний процесс к трассировке основного процесса (нужно при запуске через spawn,
+        при fork состояние наследуется само).
+        Args:
+            queue (mp.Queue): очередь основного процесса (None - трассировка выключена).
+        """
+        if queue is not None and not (self.is_enabled and self.queue is queue):
+            self.is_enabled = True
+            self.queue = queue
+            self.owner_pid = None
+            self.events = []
+
+    def get_queue(self) -> mp.Queue:
+        """Очередь для передачи дочерним процессам. В основном процессе заодно запускается поток чтения,
+        если он был остановлен в collect.
+        Returns:
+            mp.Queue: очередь или None, если трассировка выключена.
+        """
+        if self.is_enabled and self.reader is None and os.getpid() == self.owner_pid:
+            self.start_reader()
+        return self.queue if self.is_enabled else None
+
+    def add_event(self, name: str, category: str, start_ns: int, duration_ns: int, args: dict = None) -> None:
+        """Записать завершенный интервал.
+        Args:
+            name (str): название интервала.
+            category (str): категория (stage, worker, timer и т.д.).
+            start_ns (int): начало (perf_counter_ns).
+            duration_ns (int): длительность в наносекундах.
+            args (dict): дополнительные данные интервала.
+        """
+        self.append({"name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": duration_ns / 1000,
+                     "pid": os.getpid(), "tid": threading.get_native_id(), "args": args or {}})
+
+    def append(self, event: dict) -> None:
+        """Записать готовое событие трассы (счетчик, мгновенное событие и т.д.).
+        Args:
+            event (dict): событие в формате Chrome trace-event (pid - текущего процесса).
+        """
+        if not self.is_enabled:
+            return
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args):
+        """Интервал вокруг блока кода. В блок отдается словарь аргументов, в него можно дописать
+        значения, известные только в конце (например, кол-во строк).
+        Args:
+            name (str): название интервала.
+            category (str): категория.
+            **args: данные интервала.
+        >>> with Tracer().span("stage", year=2003) as span_args:
+        ...     span_args["rows"] = 10
+        """
+        if not self.is_enabled:
+            yield args
+            return
+        start_ns = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.add_event(name, category, start_ns, time.perf_counter_ns() - start_ns, args)
+
+    def flush(self) -> None:
+        """Отправить накопленные интервалы дочернего процесса в основной процесс."""
+        if not self.is_enabled or os.getpid() == self.owner_pid:
+            return
+        with self.lock:
+            events = [event for event in self.events if event["pid"] == os.getpid()]
+            self.events = []
+        events.append({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                       "args": {"name": mp.current_process().name}})
+        self.queue.put(events)
+
+    def collect(self) -> list:
+        """Дочитать интервалы, присланные дочерними процессами (вызывать после их завершения),
+        и остановить поток чтения.
+        Returns:
+            list: все события трассы.
+        """
+        if self.reader is not None:
+            self.queue.put(None)
+            self.reader.join()
+            self.reader = None
+        with self.lock:
+            return list(self.events)
+
+    def export(self, file_name: str) -> None:
+        """Сохранить трассу в формате Chrome trace-event JSON.
+        Args:
+            file_name (str): путь до json-файла.
+        """
+        events = self.collect() + [{"name": "process_name", "ph": "M", "pid": os.getpid(),
+                                    "args": {"name": "MainProcess"}}]
+        with open(file_name, "w", encoding="utf-8") as json_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, json_file, ensure_ascii=False)
+
+
+tracer = Tracer()
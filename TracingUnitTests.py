@@ -0,0 +1,55 @@
+import json, os, tempfile
+from unittest import TestCase
+from Tracing import *
+from WorkerPool import Worker_Pool
+
+
+def traced_square(value: int) -> int:
+    with tracer.span("square", "worker", value=value):
+        return value * value
+
+
+class TracingUnitTests(TestCase):
+    def tearDown(self):
+        tracer.collect()
+        tracer.is_enabled = False
+        tracer.queue = None
+        tracer.events = []
+
+    def test_disabled_tracer_records_nothing(self):
+        disabled_tracer = Tracer()
+        with disabled_tracer.span("stage", year=2003) as span_args:
+            span_args["rows"] = 1
+        disabled_tracer.add_event("timer", "timer", 0, 1)
+        self.assertEqual(disabled_tracer.events, [])
+
+    def test_nested_spans(self):
+        tracer.enable()
+        with tracer.span("outer"):
+            with tracer.span("inner", "worker", year=2003) as span_args:
+                span_args["rows"] = 10
+        inner, outer = tracer.collect()
+        self.assertEqual((inner["name"], inner["cat"], inner["args"]), ("inner", "worker", {"year": 2003, "rows": 10}))
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+
+    def test_spans_from_worker_processes(self):
+        tracer.enable()
+        worker_pool = Worker_Pool(traced_square, (), 2)
+        for value in range(5):
+            worker_pool.put(value)
+        self.assertEqual(sorted(worker_pool.get_results()), [0, 1, 4, 9, 16])
+        events = [event for event in tracer.collect() if event["ph"] == "X"]
+        self.assertEqual(sorted(event["args"]["value"] for event in events), [0, 1, 2, 3, 4])
+        self.assertNotIn(os.getpid(), {event["pid"] for event in events})
+
+    def test_export_chrome_trace(self):
+        tracer.enable()
+        with tracer.span("stage"):
+            pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "trace.json")
+            tracer.export(file_name)
+            with open(file_name, encoding="utf-8") as json_file:
+                trace = json.load(json_file)
+        self.assertEqual([event["ph"] for event in trace["traceEvents"]], ["X", "M"])
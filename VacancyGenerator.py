@@ -0,0 +1,224 @@
+import argparse, bisect, csv, itertools, random
+from array import array
+from datetime import datetime, timedelta
+
+full_header = ["name", "description", "key_skills", "experience_id", "premium", "employer_name", "salary_from",
+               "salary_to", "salary_gross", "salary_currency", "area_name", "published_at"]
+short_header = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+
+default_names = ["Программист", "Программист Python", "Программист 1С", "Ведущий программист C++",
+                 "Системный администратор", "Аналитик", "Бизнес-аналитик", "Менеджер по продажам", "Тестировщик",
+                 "Инженер-программист", "Технический писатель", "Руководитель проекта", "Бухгалтер",
+                 "Web-разработчик", "Frontend-разработчик", "Java developer", "DevOps-инженер", "Дизайнер"]
+default_areas = ["Москва", "Санкт-Петербург", "Новосибирск", "Екатеринбург", "Казань", "Нижний Новгород",
+                 "Челябинск", "Самара", "Омск", "Ростов-на-Дону", "Уфа", "Красноярск", "Воронеж", "Пермь",
+                 "Волгоград", "Краснодар", "Саратов", "Тюмень", "Тольятти", "Ижевск", "Барнаул", "Ульяновск",
+                 "Иркутск", "Хабаровск", "Ярославль", "Владивосток", "Махачкала", "Томск", "Оренбург",
+                 "Кемерово", "Минск", "Алматы", "Киев", "Баку", "Тбилиси", "Бишкек", "Ташкент"]
+default_currency_weights = {"RUR": 880, "USD": 45, "EUR": 15, "KZT": 20, "UAH": 15, "BYR": 12,
+                            "AZN": 4, "UZS": 4, "GEL": 3, "KGS": 2}
+default_skills = ["Python", "SQL", "Git", "Linux", "Docker", "1С: Предприятие 8", "Java", "C++", "JavaScript",
+                  "HTML", "CSS", "Английский язык", "MS Excel", "Деловая переписка", "Ведение переговоров"]
+default_employers = ["ООО Ромашка", "ПАО Сбербанк", "Яндекс", "Тинькофф", "Лаборатория Касперского",
+                     "ИП Иванов", "АО \"Вектор\"", "ООО \"Альфа-Софт\"", "Газпром нефть", "МТС"]
+experiences = ["noExperience", "between1And3", "between3And6", "moreThan6"]
+invalid_salaries = ["", "", "", "abc", "-"]
+doubled_skills = default_skills * 2
+
+
+class Vacancy_Generator:
+    """Детерминированный генератор синтетических вакансий. Строки выдаются потоком (без хранения в памяти),
+    даты публикации идут по возрастанию от start_year до end_year включительно (или вперемешку, если
+    is_shuffled - тогда в памяти хранится только порядок номеров строк). Города распределены
+    по закону Ципфа, валюты - по заданным весам, часть строк содержит пустые или некорректные поля
+    и многострочный текст в кавычках (description, key_skills).
+    Attributes:
+        seed (int): зерно генератора случайных чисел.
+        start_year (int): первый год.
+        end_year (int): последний год.
+        header (list): столбцы (по умолчанию - все столбцы, которые нужны ReportTable).
+        currency_weights (dict): валюта к весу.
+        invalid_share (float): доля строк с пустыми или некорректными полями.
+        multiline_share (float): доля строк с многострочным описанием.
+        zipf_power (float): показатель распределения Ципфа для городов.
+        is_shuffled (bool): перемешать ли даты публикации (тем же зерном).
+    """
+    def __init__(self, seed: int = 0, start_year: int = 2003, end_year: int = 2022, header: list = None,
+                 currency_weights: dict = None, invalid_share: float = 0.05, multiline_share: float = 0.3,
+                 zipf_power: float = 1.1, is_shuffled: bool = False):
+        """Инициализация класса Vacancy_Generator. Подготовка накопленных весов.
+        Args:
+            seed (int): зерно генератора случайных чисел.
+            start_year (int): первый год.
+            end_year (int): последний год.
+            header (list): столбцы (по умолчанию - все столбцы, которые нужны ReportTable).
+            currency_weights (dict): валюта к весу.
+            invalid_share (float): доля строк с пустыми или некорректными полями.
+            multiline_share (float): доля строк с многострочным описанием.
+            zipf_power (float): показатель распределения Ципфа для городов.
+            is_shuffled (bool): перемешать ли даты публикации (тем же зерном).
+        """
+        self.seed = seed
+        self.start_time = datetime(start_year, 1, 1)
+        self.total_seconds = (datetime(end_year + 1, 1, 1) - self.start_time).total_seconds()
+        self.header = list(header or full_header)
+        currency_weights = currency_weights or default_currency_weights
+        self.currencies = list(currency_weights)
+        self.currency_cum_weights = list(itertools.accumulate(currency_weights.values()))
+        self.area_cum_weights = list(itertools.accumulate(1 / rank ** zipf_power
+                                                          for rank in range(1, len(default_areas) + 1)))
+        self.invalid_share = invalid_share
+        self.multiline_share = multiline_share
+        self.is_shuffled = is_shuffled
+
+    @staticmethod
+    def pick(rand: random.Random, values: list):
+        """Выбрать равновероятное значение (быстрее, чем random.choice).
+        Args:
+            rand (Random): генератор случайных чисел.
+            values (list): значения.
+        Returns:
+            Выбранное значение.
+        >>> Vacancy_Generator.pick(random.Random(0), ["a"])
+        'a'
+        """
+        return values[int(rand.random() * len(values))]
+
+    @staticmethod
+    def choose(rand: random.Random, values: list, cum_weights: list):
+        """Выбрать значение по накопленным весам.
+        Args:
+            rand (Random): генератор случайных чисел.
+            values (list): значения.
+            cum_weights (list): накопленные веса.
+        Returns:
+            Выбранное значение.
+        >>> Vacancy_Generator.choose(random.Random(0), ["a", "b"], [0, 1])
+        'b'
+        """
+        return values[bisect.bisect(cum_weights, rand.random() * cum_weights[-1])]
+
+    def get_published_at(self, rand: random.Random, index: int, rows_count: int) -> str:
+        """Дата публикации строки index: равномерно по всему периоду, по возрастанию.
+        Args:
+            rand (Random): генератор случайных чисел.
+            index (int): номер строки.
+            rows_count (int): кол-во строк.
+        Returns:
+            str: дата в формате 2003-09-19T14:42:13+0400.
+        """
+        seconds = (index + rand.random()) * self.total_seconds / rows_count
+        published_at = self.start_time + timedelta(seconds=seconds)
+        return published_at.strftime("%Y-%m-%dT%H:%M:%S") + ("+0300" if rand.random() < 0.5 else "+0400")
+
+    def get_salaries(self, rand: random.Random) -> (str, str):
+        """Вилка зарплаты: обе границы, одна граница или некорректное значение.
+        Args:
+            rand (Random): генератор случайных чисел.
+        Returns:
+            (str, str): salary_from, salary_to.
+        """
+        salary_from = (5 + int(rand.random() * 295)) * 1000
+        salary_to = salary_from + int(rand.random() * 150) * 1000
+        if rand.random() < self.invalid_share:
+            if rand.random() < 0.5:
+                return Vacancy_Generator.pick(rand, invalid_salaries), str(salary_to)
+            return str(salary_from), Vacancy_Generator.pick(rand, invalid_salaries)
+        return f"{salary_from}.0", f"{salary_to}.0"
+
+    def get_text(self, rand: random.Random, name: str, skills: list) -> str:
+        """Описание вакансии: одна строка или несколько абзацев с кавычками внутри.
+        Args:
+            rand (Random): генератор случайных чисел.
+            name (str): название вакансии.
+            skills (list): навыки.
+        Returns:
+            str: описание.
+        """
+        if rand.random() >= self.multiline_share:
+            return f"Ищем специалиста на позицию {name}."
+        return f"Обязанности:\nРабота на позиции \"{name}\".\nТребования:\n" + \
+            "\n".join(f"- {skill}" for skill in skills) + "\nУсловия:\nОфис, \"белая\" зарплата."
+
+    def get_row(self, rand: random.Random, index: int, rows_count: int) -> dict:
+        """Сгенерировать одну вакансию.
+        Args:
+            rand (Random): генератор случайных чисел.
+            index (int): номер строки.
+            rows_count (int): кол-во строк.
+        Returns:
+            dict: поле к значению.
+        """
+        name = Vacancy_Generator.pick(rand, default_names)
+        skills_start = int(rand.random() * len(default_skills))
+        skills = doubled_skills[skills_start:skills_start + 1 + int(rand.random() * 5)]
+        salary_from, salary_to = self.get_salaries(rand)
+        row = {"name": name, "description": self.get_text(rand, name, skills), "key_skills": "\n".join(skills),
+               "experience_id": Vacancy_Generator.pick(rand, experiences),
+               "premium": "True" if rand.random() < 0.3 else "False",
+               "employer_name": Vacancy_Generator.pick(rand, default_employers), "salary_from": salary_from,
+               "salary_to": salary_to, "salary_gross": "True" if rand.random() < 0.5 else "False",
+               "salary_currency": Vacancy_Generator.choose(rand, self.currencies, self.currency_cum_weights),
+               "area_name": Vacancy_Generator.choose(rand, default_areas, self.area_cum_weights),
+               "published_at": self.get_published_at(rand, index, rows_count)}
+        if rand.random() < self.invalid_share:
+            row[Vacancy_Generator.pick(rand, ["salary_currency", "area_name", "name"])] = ""
+        return row
+
+    def get_order(self, rows_count: int):
+        """Порядок, в котором выдаются номера строк (от номера зависит дата публикации).
+        Args:
+            rows_count (int): кол-во строк.
+        Returns:
+            range или array: номера строк по возрастанию или перемешанные.
+        >>> list(Vacancy_Generator().get_order(3))
+        [0, 1, 2]
+        >>> sorted(Vacancy_Generator(is_shuffled=True).get_order(5))
+        [0, 1, 2, 3, 4]
+        """
+        if not self.is_shuffled:
+            return range(rows_count)
+        order = array("q", range(rows_count))
+        random.Random(self.seed).shuffle(order)
+        return order
+
+    def rows(self, rows_count: int):
+        """Поток строк (списки значений в порядке header) без заголовка.
+        Args:
+            rows_count (int): кол-во строк.
+        Returns:
+            generator: строки.
+        """
+        rand = random.Random(self.seed)
+        for index in self.get_order(rows_count):
+            row = self.get_row(rand, index, rows_count)
+            yield [row[field] for field in self.header]
+
+    def write_csv(self, file_name: str, rows_count: int) -> None:
+        """Записать csv-файл с заголовком.
+        Args:
+            file_name (str): путь до файла.
+            rows_count (int): кол-во строк.
+        """
+        with open(file_name, "w", encoding="utf-8-sig", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(self.header)
+            writer.writerows(self.rows(rows_count))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Генерация синтетического файла вакансий")
+    parser.add_argument("file_name")
+    parser.add_argument("rows_count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-year", type=int, default=2003)
+    parser.add_argument("--end-year", type=int, default=2022)
+    parser.add_argument("--short", action="store_true", help="только 6 столбцов, нужных для отчета")
+    parser.add_argument("--invalid-share", type=float, default=0.05)
+    parser.add_argument("--multiline-share", type=float, default=0.3)
+    parser.add_argument("--shuffle", action="store_true", help="даты публикации вперемешку")
+    arguments = parser.parse_args()
+
+    Vacancy_Generator(arguments.seed, arguments.start_year, arguments.end_year,
+                      short_header if arguments.short else None, None, arguments.invalid_share,
+                      arguments.multiline_share, is_shuffled=arguments.shuffle).write_csv(arguments.file_name, arguments.rows_count)
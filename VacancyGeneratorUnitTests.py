@@ -0,0 +1,53 @@
+import csv, io
+from unittest import TestCase
+from VacancyGenerator import *
+
+
+def read_written_rows(generator: Vacancy_Generator, rows_count: int) -> list:
+    text = io.StringIO(newline="")
+    csv.writer(text).writerows(generator.rows(rows_count))
+    text.seek(0)
+    return list(csv.reader(text))
+
+
+class VacancyGeneratorUnitTests(TestCase):
+    def test_rows_are_reproducible(self):
+        self.assertEqual(list(Vacancy_Generator(5).rows(50)), list(Vacancy_Generator(5).rows(50)))
+
+    def test_other_seed_gives_other_rows(self):
+        self.assertNotEqual(list(Vacancy_Generator(5).rows(50)), list(Vacancy_Generator(6).rows(50)))
+
+    def test_rows_match_header(self):
+        self.assertTrue(all(len(row) == len(full_header) for row in Vacancy_Generator().rows(50)))
+        self.assertTrue(all(len(row) == 6 for row in Vacancy_Generator(header=short_header).rows(50)))
+
+    def test_multiline_rows_survive_csv(self):
+        generator = Vacancy_Generator(multiline_share=1.0)
+        rows = read_written_rows(generator, 20)
+        self.assertEqual(rows, list(generator.rows(20)))
+        self.assertTrue(all("\n" in row[1] for row in rows))
+
+    def test_published_at_is_sorted_and_in_range(self):
+        dates = [row[-1] for row in Vacancy_Generator(start_year=2010, end_year=2012, header=short_header).rows(300)]
+        self.assertEqual(dates, sorted(dates))
+        self.assertEqual((dates[0][:4], dates[-1][:4]), ("2010", "2012"))
+
+    def test_shuffled_dates_are_mixed_and_reproducible(self):
+        generator = Vacancy_Generator(3, start_year=2010, end_year=2012, header=short_header, is_shuffled=True)
+        dates = [row[-1] for row in generator.rows(300)]
+        self.assertNotEqual(dates, sorted(dates))
+        self.assertEqual({date[:4] for date in dates}, {"2010", "2011", "2012"})
+        self.assertEqual(list(generator.rows(300)), list(generator.rows(300)))
+
+    def test_rows_without_invalid_share_are_full(self):
+        rows = Vacancy_Generator(invalid_share=0.0, header=short_header).rows(300)
+        self.assertTrue(all("" not in row and float(row[1]) <= float(row[2]) for row in rows))
+
+    def test_invalid_share_gives_empty_fields(self):
+        rows = list(Vacancy_Generator(invalid_share=0.5, header=short_header).rows(300))
+        self.assertTrue(any("" in row for row in rows))
+
+    def test_cities_follow_zipf(self):
+        areas = [row[4] for row in Vacancy_Generator(header=short_header).rows(2000)]
+        self.assertGreater(areas.count(default_areas[0]), areas.count(default_areas[1]))
+        self.assertGreater(areas.count(default_areas[1]), areas.count(default_areas[10]))
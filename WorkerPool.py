@@ -0,0 +1,118 @@
+import os, queue
+import multiprocessing as mp
+
+from Tracing import tracer
+
+
+def worker_loop(target, common_args: tuple, task_queue: mp.Queue, result_queue: mp.Queue,
+                trace_queue: mp.Queue = None) -> None:
+    """Цикл процесса-воркера: брать задачи из очереди, пока не придет стоп-сигнал (None).
+    Args:
+        target (callable): функция обработки одной задачи.
+        common_args (tuple): аргументы, общие для всех задач (передаются один раз на процесс).
+        task_queue (Queue): очередь задач.
+        result_queue (Queue): очередь результатов.
+        trace_queue (Queue): очередь трассировки основного процесса (None - без трассировки).
+    """
+    tracer.attach(trace_queue)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        try:
+            result_queue.put(target(*common_args, *task))
+        except Exception as error:
+            result_queue.put(Worker_Error(error))
+    tracer.flush()
+
+
+class Worker_Error(Exception):
+    """Ошибка, случившаяся в воркере. Передается в основной процесс вместо результата,
+    а также выбрасывается, если воркер завершился, не отдав результаты своих задач.
+    Attributes:
+        error (Exception): исходное исключение.
+    """
+    def __init__(self, error: Exception):
+        """Инициализация класса Worker_Error.
+        Args:
+            error (Exception): исходное исключение.
+        """
+        super().__init__(error)
+        self.error = error
+
+
+class Worker_Pool:
+    """Пул из фиксированного числа процессов, которые переиспользуются для всех задач.
+    Задачи раздаются через очередь, в конце каждому воркеру отправляется стоп-сигнал.
+    Attributes:
+        target (callable): функция обработки одной задачи (должна быть доступна по имени модуля).
+        common_args (tuple): аргументы, общие для всех задач.
+        workers_count (int): кол-во процессов (по умолчанию - кол-во ядер).
+        poll_timeout (float): сколько секунд ждать очередной результат перед проверкой воркеров.
+    """
+    poll_timeout = 0.5
+
+    def __init__(self, target, common_args: tuple = (), workers_count: int = None):
+        """Инициализация класса Worker_Pool. Запуск процессов.
+        Args:
+            target (callable): функция обработки одной задачи.
+            common_args (tuple): аргументы, общие для всех задач.
+            workers_count (int): кол-во процессов (по умолчанию - кол-во ядер).
+        """
+        self.workers_count = workers_count or os.cpu_count()
+        self.task_queue = mp.Queue()
+        self.result_queue = mp.Queue()
+        self.tasks_count = 0
+        self.workers = [mp.Process(target=worker_loop, args=(target, common_args, self.task_queue, self.result_queue,
+                                                             tracer.get_queue()))
+                        for _ in range(self.workers_count)]
+        for worker in self.workers:
+            worker.start()
+
+    def put(self, *task) -> None:
+        """Отдать задачу свободному воркеру.
+        Args:
+            *task: аргументы задачи.
+        """
+        self.tasks_count += 1
+        self.task_queue.put(task)
+
+    def get_results(self) -> list:
+        """Отправить стоп-сигналы, собрать результаты всех задач и дождаться конца воркеров.
+        Пока результатов нет, воркеры проверяются: если один из них упал или все завершились,
+        а результатов меньше, чем задач, то ждать дальше нечего.
+        Returns:
+            list: результаты в порядке готовности.
+        Raises:
+            Worker_Error: воркер завершился, не отдав результаты своих задач.
+        """
+        for _ in self.workers:
+            self.task_queue.put(None)
+        results = []
+        is_last_try = False
+        while len(results) < self.tasks_count:
+            try:
+                results.append(self.result_queue.get(timeout=Worker_Pool.poll_timeout))
+                continue
+            except queue.Empty:
+                pass
+            failed_worker = next((worker for worker in self.workers if worker.exitcode), None)
+            if failed_worker is not None or is_last_try:
+                self.terminate()
+                exit_code = failed_worker.exitcode if failed_worker is not None else 0
+                raise Worker_Error(RuntimeError(f"Воркер завершился с кодом {exit_code}, "
+                                                f"получено результатов: {len(results)} из {self.tasks_count}"))
+            is_last_try = not any(worker.is_alive() for worker in self.workers)
+        for worker in self.workers:
+            worker.join()
+        for result in results:
+            if isinstance(result, Worker_Error):
+                raise result.error
+        return results
+
+    def terminate(self) -> None:
+        """Остановить оставшиеся воркеры, не дожидаясь их задач."""
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
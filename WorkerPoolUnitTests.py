@@ -0,0 +1,50 @@
+import os
+from unittest import TestCase
+from WorkerPool import *
+
+
+def exit_in_worker(code: int) -> int:
+    if code:
+        os._exit(code)
+    return code
+
+
+def make_unpicklable(value: int):
+    return lambda: value
+
+
+class WorkerPoolUnitTests(TestCase):
+    def test_get_results_of_all_tasks(self):
+        worker_pool = Worker_Pool(pow, (2,), 3)
+        for power in range(10):
+            worker_pool.put(power)
+        self.assertEqual(sorted(worker_pool.get_results()), [2 ** power for power in range(10)])
+
+    def test_workers_are_stopped(self):
+        worker_pool = Worker_Pool(pow, (2,), 2)
+        worker_pool.put(3)
+        worker_pool.get_results()
+        self.assertFalse(any(worker.is_alive() for worker in worker_pool.workers))
+
+    def test_get_results_without_tasks(self):
+        self.assertEqual(Worker_Pool(pow, (2,), 2).get_results(), [])
+
+    def test_error_in_worker(self):
+        worker_pool = Worker_Pool(int, (), 2)
+        worker_pool.put("10")
+        worker_pool.put("abc")
+        self.assertRaises(ValueError, worker_pool.get_results)
+
+    def test_dead_worker_raises_worker_error(self):
+        worker_pool = Worker_Pool(exit_in_worker, (), 2)
+        worker_pool.put(0)
+        worker_pool.put(3)
+        with self.assertRaises(Worker_Error) as context:
+            worker_pool.get_results()
+        self.assertIn("кодом 3", str(context.exception))
+        self.assertFalse(any(worker.is_alive() for worker in worker_pool.workers))
+
+    def test_lost_result_raises_worker_error(self):
+        worker_pool = Worker_Pool(make_unpicklable, (), 2)
+        worker_pool.put(1)
+        self.assertRaises(Worker_Error, worker_pool.get_results)